@@ -0,0 +1,259 @@
+"""
+응시자별 마이크 PCM 을 받아 audio_noise 이벤트를 만드는 스트리밍 소음 분석기.
+
+- AudioNoiseAnalyzer : 스트림마다 고정 길이 창(window)을 채우고, tick() 한 번에 준비된 모든 스트림의 창을
+  (창 수, 창 길이) 배열 하나로 묶어 RMS, 스펙트럼 평탄도, 음성 대역 에너지 비율을 NumPy 로 한 번에 계산합니다.
+- AudioNoiseDetector : 시끄러운 창이 min_windows 번 연속되면 이벤트를 한 번 만들고, 이후 cooldown 동안은 쉽니다.
+
+입력은 mono, signed 16-bit little-endian PCM 입니다.
+"""
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Dict, List, Optional, Tuple
+import numpy as np
+
+# 음성 판정에 쓰는 주파수 대역 (Hz)
+SPEECH_BAND = (300.0, 3400.0)
+# 스펙트럼 평탄도를 계산할 대역 (Hz). 직류 성분과 고역 잡음은 뺍니다.
+FLATNESS_BAND = (100.0, 6000.0)
+
+# 창 분류 결과
+QUIET = "quiet"
+VOICE = "voice"
+NOISE = "noise"
+
+
+@dataclass
+class AudioWindowResult:
+    stream_id: str
+    timestamp: float
+    rms_dbfs: float
+    flatness: float
+    speech_ratio: float
+    label: str
+
+
+class AudioNoiseDetector:
+    """
+    창 단위 판정(label)으로 소음 구간을 판정합니다.
+
+    - QUIET 가 아닌 창이 min_windows 번 연속되면 이벤트를 한 번 만듭니다.
+    - QUIET 창이 clear_windows 번 연속되어야 구간이 끝난 것으로 보고, 이벤트를 만든 구간 뒤 cooldown 초 동안은 쉽니다.
+    """
+
+    def __init__(self, min_windows: int = 3, clear_windows: int = 2, cooldown: float = 15.0):
+        self.min_windows = min_windows
+        self.clear_windows = clear_windows
+        self.cooldown = cooldown
+        self._streak = 0
+        self._clear_streak = 0
+        self._since: Optional[float] = None
+        self._voice_windows = 0
+        self._max_dbfs = -np.inf
+        self._reported = False
+        self._cooldown_until = 0.0
+
+    def update(self, result: AudioWindowResult) -> Optional[dict]:
+        now = result.timestamp
+        if result.label == QUIET:
+            if self._since is None:
+                return None
+            self._clear_streak += 1
+            if self._clear_streak >= self.clear_windows:
+                if self._reported:
+                    self._cooldown_until = now + self.cooldown
+                self._streak = 0
+                self._since = None
+                self._voice_windows = 0
+                self._max_dbfs = -np.inf
+                self._reported = False
+            return None
+
+        self._clear_streak = 0
+        if self._since is None:
+            self._since = now
+        self._streak += 1
+        self._voice_windows += result.label == VOICE
+        self._max_dbfs = max(self._max_dbfs, result.rms_dbfs)
+        if self._reported or self._streak < self.min_windows or now < self._cooldown_until:
+            return None
+        self._reported = True
+        return {
+            "started_at": self._since,
+            "duration": now - self._since,
+            "windows": self._streak,
+            "voice_windows": self._voice_windows,
+            "max_rms_dbfs": float(self._max_dbfs),
+        }
+
+
+class AudioNoiseAnalyzer:
+    """
+    여러 스트림의 PCM 을 받아 창 단위로 한꺼번에 분석합니다.
+
+    스트림마다 미리 잡아 둔 2차원 버퍼의 한 행을 채우고, 창이 차면 스트림별 대기열에 복사해 둡니다.
+    tick() 은 대기열의 창을 모두 꺼내 배열 연산 한 번으로 처리하며, 스트림마다 들어온 순서대로 판정합니다.
+    tick() 이 밀려 스트림의 대기열이 max_ready_windows 개를 넘으면 가장 오래된 창부터 버립니다. (overwritten)
+    """
+
+    def __init__(
+        self,
+        sample_rate: int = 16000,
+        window_seconds: float = 0.5,
+        noise_dbfs: float = -35.0,
+        voice_dbfs: float = -45.0,
+        flatness_threshold: float = 0.35,
+        speech_ratio_threshold: float = 0.6,
+        initial_capacity: int = 64,
+        max_ready_windows: int = 8,
+        **detector_options,
+    ):
+        self.sample_rate = sample_rate
+        self.window_seconds = window_seconds
+        self.window = int(sample_rate * window_seconds)
+        self.noise_dbfs = noise_dbfs
+        self.voice_dbfs = voice_dbfs
+        self.flatness_threshold = flatness_threshold
+        self.speech_ratio_threshold = speech_ratio_threshold
+        self.max_ready_windows = max_ready_windows
+        self.detector_options = detector_options
+
+        self._lock = threading.Lock()
+        self._rows: Dict[str, int] = {}
+        self._free_rows: List[int] = []
+        self._row_streams: List[Optional[str]] = []
+        self._buffer = np.zeros((initial_capacity, self.window), dtype=np.int16)
+        self._fill = np.zeros(initial_capacity, dtype=np.int64)
+        # 스트림별로 다 찬 창과 그 시각
+        self._ready: Dict[str, Deque[Tuple[float, np.ndarray]]] = {}
+        self._detectors: Dict[str, AudioNoiseDetector] = {}
+        self.overwritten = 0
+
+        # 창 길이가 고정이므로 Hann 창과 대역 마스크는 한 번만 만듭니다.
+        self._hann = np.hanning(self.window).astype(np.float32)
+        freqs = np.fft.rfftfreq(self.window, d=1 / sample_rate)
+        self._speech_mask = (freqs >= SPEECH_BAND[0]) & (freqs <= SPEECH_BAND[1])
+        self._flatness_mask = (freqs >= FLATNESS_BAND[0]) & (freqs <= FLATNESS_BAND[1])
+
+    def _grow(self) -> None:
+        capacity = len(self._fill) * 2
+        buffer = np.zeros((capacity, self.window), dtype=self._buffer.dtype)
+        buffer[:len(self._buffer)] = self._buffer
+        self._buffer = buffer
+        fill = np.zeros(capacity, dtype=self._fill.dtype)
+        fill[:len(self._fill)] = self._fill
+        self._fill = fill
+
+    def _row_for(self, stream_id: str) -> int:
+        row = self._rows.get(stream_id)
+        if row is not None:
+            return row
+        if self._free_rows:
+            row = self._free_rows.pop()
+        else:
+            row = len(self._row_streams)
+            if row >= len(self._fill):
+                self._grow()
+            self._row_streams.append(None)
+        self._rows[stream_id] = row
+        self._row_streams[row] = stream_id
+        self._fill[row] = 0
+        self._ready[stream_id] = deque()
+        self._detectors[stream_id] = AudioNoiseDetector(**self.detector_options)
+        return row
+
+    def push(self, stream_id: str, pcm, timestamp: Optional[float] = None) -> None:
+        """스트림의 PCM 조각(bytes 또는 int16 배열)을 붙입니다."""
+        samples = np.frombuffer(pcm, dtype="<i2") if isinstance(pcm, (bytes, bytearray, memoryview)) else np.asarray(pcm, dtype=np.int16)
+        timestamp = timestamp or time.time()
+        with self._lock:
+            row = self._row_for(stream_id)
+            offset = 0
+            while offset < len(samples):
+                fill = int(self._fill[row])
+                n = min(self.window - fill, len(samples) - offset)
+                self._buffer[row, fill:fill + n] = samples[offset:offset + n]
+                offset += n
+                fill += n
+                if fill == self.window:
+                    ready = self._ready[stream_id]
+                    if len(ready) >= self.max_ready_windows:
+                        ready.popleft()
+                        self.overwritten += 1
+                    ready.append((timestamp, self._buffer[row].copy()))
+                    fill = 0
+                self._fill[row] = fill
+
+    def remove_stream(self, stream_id: str) -> None:
+        with self._lock:
+            row = self._rows.pop(stream_id, None)
+            self._detectors.pop(stream_id, None)
+            self._ready.pop(stream_id, None)
+            if row is not None:
+                self._row_streams[row] = None
+                self._free_rows.append(row)
+
+    def analyse(self, windows: np.ndarray) -> dict:
+        """
+        (N, window) int16 배열을 받아 창별 rms_dbfs, flatness, speech_ratio 배열을 반환합니다.
+        """
+        x = windows.astype(np.float32) / 32768.0
+        x -= x.mean(axis=1, keepdims=True)
+        rms = np.sqrt(np.mean(x * x, axis=1))
+        rms_dbfs = 20 * np.log10(np.maximum(rms, 1e-10))
+
+        power = np.abs(np.fft.rfft(x * self._hann, axis=1)) ** 2 + 1e-12
+        band = power[:, self._flatness_mask]
+        # 스펙트럼 평탄도 = 기하 평균 / 산술 평균. 백색 잡음에 가까울수록 1, 음성·음악처럼 배음이 뚜렷할수록 0 에 가깝습니다.
+        flatness = np.exp(np.mean(np.log(band), axis=1)) / np.mean(band, axis=1)
+        speech_ratio = power[:, self._speech_mask].sum(axis=1) / power.sum(axis=1)
+        return {"rms_dbfs": rms_dbfs, "flatness": flatness, "speech_ratio": speech_ratio}
+
+    def classify(self, rms_dbfs: np.ndarray, flatness: np.ndarray, speech_ratio: np.ndarray) -> np.ndarray:
+        voice = (rms_dbfs > self.voice_dbfs) & (speech_ratio > self.speech_ratio_threshold) & (flatness < self.flatness_threshold)
+        noise = (rms_dbfs > self.noise_dbfs) & ~voice
+        labels = np.full(len(rms_dbfs), QUIET, dtype=object)
+        labels[noise] = NOISE
+        labels[voice] = VOICE
+        return labels
+
+    def tick(self) -> List[tuple]:
+        """
+        준비된 창을 모두 분석하고 (stream_id, details) 이벤트 목록을 반환합니다.
+        """
+        streams: List[str] = []
+        timestamps: List[float] = []
+        chunks: List[np.ndarray] = []
+        with self._lock:
+            for stream_id, ready in self._ready.items():
+                while ready:
+                    timestamp, window = ready.popleft()
+                    streams.append(stream_id)
+                    timestamps.append(timestamp)
+                    chunks.append(window)
+        if not chunks:
+            return []
+        windows = np.stack(chunks)
+
+        features = self.analyse(windows)
+        labels = self.classify(**features)
+
+        events = []
+        with self._lock:
+            for i, stream_id in enumerate(streams):
+                detector = self._detectors.get(stream_id)
+                if detector is None:
+                    continue
+                details = detector.update(AudioWindowResult(
+                    stream_id=stream_id,
+                    timestamp=float(timestamps[i]),
+                    rms_dbfs=float(features["rms_dbfs"][i]),
+                    flatness=float(features["flatness"][i]),
+                    speech_ratio=float(features["speech_ratio"][i]),
+                    label=labels[i],
+                ))
+                if details is not None:
+                    events.append((stream_id, details))
+        return events
@@ -0,0 +1,65 @@
+"""
+AudioNoiseAnalyzer 한 개(코어 하나)로 동시에 처리할 수 있는 오디오 스트림 수를 확인하는 벤치마크.
+
+스트림마다 조용한 배경, 백색 잡음, 음성 비슷한 배음 신호를 섞어 만든 PCM 을 청크 단위로 push 하고,
+창 하나가 찰 때마다 tick() 을 호출해 걸린 시간을 잽니다. tick 하나가 창 길이보다 충분히 짧으면 실시간 처리가 가능합니다.
+
+사용법:
+    python bench_audio.py --streams 500 --seconds 10
+"""
+import argparse
+import time
+import numpy as np
+from audio import AudioNoiseAnalyzer
+
+
+def synth_pcm(rng: np.random.Generator, kind: int, samples: int, sample_rate: int) -> np.ndarray:
+    t = np.arange(samples) / sample_rate
+    if kind == 0:
+        x = rng.normal(0, 0.002, samples)
+    elif kind == 1:
+        x = rng.normal(0, 0.1, samples)
+    else:
+        f0 = 120 + 80 * rng.random()
+        x = sum(0.1 / k * np.sin(2 * np.pi * f0 * k * t) for k in range(1, 12)) * (1 + np.sin(2 * np.pi * 3 * t)) / 2
+    return (np.clip(x, -1, 1) * 32767).astype(np.int16)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=500)
+    parser.add_argument("--seconds", type=float, default=10.0, help="흉내 낼 오디오 길이")
+    parser.add_argument("--sample-rate", type=int, default=16000)
+    parser.add_argument("--chunk-ms", type=int, default=100, help="클라이언트가 한 번에 보내는 PCM 길이")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    analyzer = AudioNoiseAnalyzer(sample_rate=args.sample_rate)
+    chunk = args.sample_rate * args.chunk_ms // 1000
+    total = int(args.seconds * args.sample_rate)
+    signals = [synth_pcm(rng, i % 3, total, args.sample_rate) for i in range(args.streams)]
+
+    push_time, tick_times, events = 0.0, [], 0
+    chunks_per_window = max(analyzer.window // chunk, 1)
+    for i, start in enumerate(range(0, total - chunk + 1, chunk)):
+        now = start / args.sample_rate
+        t0 = time.perf_counter()
+        for stream, pcm in enumerate(signals):
+            analyzer.push(f"s{stream}", pcm[start:start + chunk].tobytes(), now)
+        push_time += time.perf_counter() - t0
+        if (i + 1) % chunks_per_window == 0:
+            t0 = time.perf_counter()
+            events += len(analyzer.tick())
+            tick_times.append(time.perf_counter() - t0)
+
+    ticks = np.array(tick_times) * 1e3
+    audio_seconds = args.streams * args.seconds
+    busy = push_time + ticks.sum() / 1e3
+    print(f"{args.streams} streams x {args.seconds:.0f}s, window {analyzer.window_seconds * 1e3:.0f} ms")
+    print(f"tick p50 {np.percentile(ticks, 50):.2f} ms  p99 {np.percentile(ticks, 99):.2f} ms  max {ticks.max():.2f} ms")
+    print(f"push total {push_time:.2f}s, tick total {ticks.sum() / 1e3:.2f}s  ->  {audio_seconds / busy:.0f}x realtime on one core")
+    print(f"events {events}")
+
+
+if __name__ == "__main__":
+    main()
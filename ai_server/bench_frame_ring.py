@@ -0,0 +1,110 @@
+"""
+디코딩 프로세스 -> 분석 프로세스로 프레임을 넘기는 비용 비교 벤치마크.
+
+- queue : np.ndarray 를 multiprocessing.Queue 로 그대로 보냄 (pickle + 파이프 복사)
+- ring  : FrameRing 슬롯에 복사하고 FrameSlot 디스크립터만 Queue 로 보냄
+
+소비자는 face.py 처럼 cvtColor(BGR->RGB) 만 수행하므로 측정값은 전달 비용이 중심입니다.
+source 를 주면 frame_source.iter_frames 로 디코딩한 프레임을 미리 읽어 반복 사용하고,
+없으면 width x height 크기의 무작위 프레임을 사용합니다.
+
+사용법:
+    python bench_frame_ring.py --frames 2000
+    python bench_frame_ring.py recordings/sample.mp4 --frames 2000 --slots 8
+"""
+import argparse
+import multiprocessing as mp
+import time
+from typing import List, Optional
+import numpy as np
+from frame_ring import FrameRing
+
+
+def _load_frames(source: Optional[str], width: int, height: int, count: int = 32) -> List[np.ndarray]:
+    if source:
+        from frame_source import iter_frames
+        frames = list(iter_frames(source, limit=count))
+        if frames:
+            return frames
+    rng = np.random.default_rng(0)
+    return [rng.integers(0, 256, (height, width, 3), dtype=np.uint8) for _ in range(count)]
+
+
+def _consume_queue(task_queue: mp.Queue, done_queue: mp.Queue) -> None:
+    import cv2
+    received = 0
+    while True:
+        frame = task_queue.get()
+        if frame is None:
+            break
+        cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        received += 1
+    done_queue.put((received, 0))
+
+
+def _consume_ring(task_queue: mp.Queue, done_queue: mp.Queue, ring_spec) -> None:
+    import cv2
+    ring = FrameRing.attach(*ring_spec)
+    received, stale = 0, 0
+    while True:
+        desc = task_queue.get()
+        if desc is None:
+            break
+        frame = ring.view(desc)
+        if frame is not None:
+            cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        if frame is None or not ring.is_current(desc):
+            stale += 1
+        else:
+            received += 1
+    ring.close()
+    done_queue.put((received, stale))
+
+
+def run(mode: str, frames: List[np.ndarray], total: int, slots: int) -> dict:
+    ctx = mp.get_context("spawn")
+    # 소비자가 처리 중인 슬롯까지 고려해 대기 디스크립터는 slots - 1 개로 제한합니다.
+    task_queue, done_queue = ctx.Queue(maxsize=max(slots - 1, 1)), ctx.Queue()
+    ring = None
+    if mode == "ring":
+        ring = FrameRing.create(slots, frames[0].shape)
+        consumer = ctx.Process(target=_consume_ring, args=(task_queue, done_queue, (ring.name, ring.slots, ring.slot_bytes)))
+    else:
+        consumer = ctx.Process(target=_consume_queue, args=(task_queue, done_queue))
+    consumer.start()
+
+    # 소비자 프로세스가 뜨는 시간은 측정에서 빼기 위해 첫 프레임을 보낸 뒤부터 잽니다.
+    started = None
+    for i in range(total):
+        frame = frames[i % len(frames)]
+        task_queue.put(ring.write(frame) if ring is not None else frame)
+        if started is None:
+            started = time.perf_counter()
+    task_queue.put(None)
+    received, stale = done_queue.get()
+    elapsed = time.perf_counter() - started
+    consumer.join()
+    if ring is not None:
+        ring.close()
+    return {"mode": mode, "received": received, "stale": stale, "seconds": elapsed, "fps": (total - 1) / elapsed}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", nargs="?", default=None, help="영상 파일 또는 프레임 이미지 폴더 (선택)")
+    parser.add_argument("--frames", type=int, default=2000)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--slots", type=int, default=8, help="링 슬롯 수 (큐 최대 길이는 slots - 1)")
+    args = parser.parse_args()
+
+    frames = _load_frames(args.source, args.width, args.height)
+    print(f"frame shape {frames[0].shape}, {frames[0].nbytes / 1024:.0f} KB, {args.frames} frames")
+    for mode in ("queue", "ring"):
+        r = run(mode, frames, args.frames, args.slots)
+        print(f"{r['mode']:<6} {r['fps']:9.1f} fps  {r['seconds'] * 1e3 / args.frames:7.3f} ms/frame  "
+              f"received {r['received']}  stale {r['stale']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+face.py 의 랜드마크 처리 비용을 기존 루프와 GazeEstimator 로 비교하는 벤치마크.
+
+웹캠이나 MediaPipe 없이 합성 랜드마크로 측정합니다. solvePnP/Rodrigues 는 두 방식에서 동일하므로
+기본적으로 제외하고, --pnp 를 주면 정규 얼굴 모델을 로드해 함께 측정합니다.
+
+사용법:
+    python bench_gaze.py --frames 2000
+    python bench_gaze.py --frames 2000 --with-print --pnp
+"""
+import argparse
+import contextlib
+import io
+import time
+from types import SimpleNamespace
+import numpy as np
+from gaze import GazeEstimator, landmarks_to_array, NUM_LANDMARKS
+
+LEFT_EYE = [159, 158, 157, 173, 160, 161, 246, 33, 7, 163, 144, 145, 153, 154, 155, 133]
+RIGHT_EYE = [380, 372, 373, 390, 249, 263, 381, 382, 362, 398, 384, 385, 386, 387, 388, 466]
+LEFT_IRIS = [470, 471, 468, 469, 472]
+RIGHT_IRIS = [475, 473, 476, 474, 477]
+
+
+def make_landmarks(rng: np.random.Generator):
+    coords = rng.random((NUM_LANDMARKS, 3))
+    return SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y), z=float(z)) for x, y, z in coords])
+
+
+def legacy_frame(face_landmarks, image_width: int, image_height: int, with_print: bool):
+    """기존 face.py 루프를 그대로 옮긴 것 (solvePnP 이전까지)."""
+    o_left = {"x": 0, "y": 0, "z": 0}
+    o_right = {"x": 0, "y": 0, "z": 0}
+    iris_right = {"x": 0, "y": 0, "z": 0}
+    iris_left = {"x": 0, "y": 0, "z": 0}
+    for i, landmark in enumerate(face_landmarks.landmark):
+        if i in LEFT_EYE:
+            target = o_left
+        elif i in RIGHT_EYE:
+            target = o_right
+        elif i in LEFT_IRIS:
+            target = iris_left
+        elif i in RIGHT_IRIS:
+            target = iris_right
+        else:
+            continue
+        target["x"] += landmark.x
+        target["y"] += landmark.y
+        target["z"] += landmark.z
+        if with_print:
+            print(f"{i} 번째 값 : {landmark.x}, {landmark.y}, {landmark.y}")
+    eye_direction_local = np.array([
+        [iris_left["x"] - o_left["x"], iris_left["y"] - o_left["y"], iris_left["z"] - o_left["z"]],
+        [iris_right["x"] - o_right["x"], iris_right["y"] - o_right["y"], iris_right["z"] - o_right["z"]]
+    ])
+    img_points_2d = []
+    for i in range(NUM_LANDMARKS):
+        lm = face_landmarks.landmark[i]
+        img_points_2d.append([lm.x * image_width, lm.y * image_height])
+    return eye_direction_local, np.array(img_points_2d)
+
+
+def vectorized_frame(estimator: GazeEstimator, face_landmarks, image_width: int, image_height: int):
+    points = landmarks_to_array(face_landmarks)
+    centroids = estimator.centroids(points)
+    return centroids[2:] - centroids[:2], estimator.image_points(points, image_width, image_height)
+
+
+def _time_per_frame(fn, frames) -> float:
+    start = time.perf_counter()
+    for f in frames:
+        fn(f)
+    return (time.perf_counter() - start) / len(frames)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--frames", type=int, default=1000)
+    parser.add_argument("--width", type=int, default=640)
+    parser.add_argument("--height", type=int, default=480)
+    parser.add_argument("--with-print", action="store_true", help="기존 루프의 print 비용까지 포함 (출력은 버림)")
+    parser.add_argument("--pnp", action="store_true", help="solvePnP/Rodrigues 까지 포함해 전체 프레임 비용을 측정")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [make_landmarks(rng) for _ in range(args.frames)]
+    w, h = args.width, args.height
+
+    camera_matrix = np.array([[w, 0, w / 2], [0, w, h / 2], [0, 0, 1]], dtype=np.float64)
+    if args.pnp:
+        from util import get_canonical_face_model_obj
+        obj_points = get_canonical_face_model_obj()
+        if obj_points is None:
+            raise SystemExit("정규 얼굴 모델을 로드할 수 없습니다.")
+    else:
+        obj_points = np.zeros((NUM_LANDMARKS, 3), dtype=np.float32)
+    estimator = GazeEstimator(obj_points, camera_matrix)
+
+    def legacy(f):
+        eye_dir, img_points = legacy_frame(f, w, h, args.with_print)
+        if args.pnp:
+            estimator.head_pose(img_points.astype(np.float32))
+        return eye_dir
+
+    def vectorized(f):
+        if args.pnp:
+            return estimator.estimate(f, w, h)
+        return vectorized_frame(estimator, f, w, h)
+
+    # 기존 루프의 print 출력은 버립니다.
+    sink = io.StringIO()
+    with contextlib.redirect_stdout(sink):
+        legacy_t = _time_per_frame(legacy, frames)
+    sink.close()
+    vector_t = _time_per_frame(vectorized, frames)
+
+    print(f"frames           : {args.frames} ({w}x{h}, print={'on' if args.with_print else 'off'}, pnp={'on' if args.pnp else 'off'})")
+    print(f"legacy loop      : {legacy_t * 1e6:9.1f} us/frame  ({1 / legacy_t:10.1f} frames/s)")
+    print(f"GazeEstimator    : {vector_t * 1e6:9.1f} us/frame  ({1 / vector_t:10.1f} frames/s)")
+    print(f"speed-up         : {legacy_t / vector_t:9.2f}x")
+
+
+if __name__ == "__main__":
+    main()
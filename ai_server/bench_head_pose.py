@@ -0,0 +1,130 @@
+"""
+녹화된 영상에서 머리 자세 추적 모드와 기존 전체 solvePnP 의 정확도/지연 시간을 비교하는 벤치마크.
+
+FaceMesh 는 영상마다 한 번만 돌려 랜드마크를 모아 두고, 같은 랜드마크로 두 방식을 각각 실행합니다.
+정확도는 전체 solvePnP 결과를 기준으로 한 회전 각도 차이(도)와 이동 벡터 차이로 나타냅니다.
+
+사용법:
+    python bench_head_pose.py recordings/examinee1.mp4 recordings/frames_dir --threshold 3.0
+"""
+import argparse
+import json
+import time
+from typing import List, Optional
+import cv2
+import mediapipe as mp
+import numpy as np
+from frame_source import iter_frames
+from gaze import NUM_LANDMARKS, landmarks_to_array
+from head_pose import HeadPoseTracker
+from util import get_canonical_face_model_obj
+
+
+def collect_image_points(source: str, limit: Optional[int]) -> tuple[List[Optional[np.ndarray]], tuple[int, int]]:
+    """영상의 각 프레임에서 랜드마크 픽셀 좌표를 모읍니다. 얼굴이 없는 프레임은 None 입니다."""
+    points: List[Optional[np.ndarray]] = []
+    size = (0, 0)
+    with mp.solutions.face_mesh.FaceMesh(
+        max_num_faces=1, refine_landmarks=True,
+        min_detection_confidence=0.5, min_tracking_confidence=0.5,
+    ) as face_mesh:
+        for frame in iter_frames(source, limit=limit):
+            height, width, _ = frame.shape
+            size = (width, height)
+            results = face_mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            if not results.multi_face_landmarks:
+                points.append(None)
+                continue
+            lm = landmarks_to_array(results.multi_face_landmarks[0])
+            points.append(np.ascontiguousarray(lm[:NUM_LANDMARKS, :2] * (width, height), dtype=np.float32))
+    return points, size
+
+
+def run_tracker(tracker: HeadPoseTracker, points: List[Optional[np.ndarray]]):
+    poses, latencies = [], []
+    for img_points in points:
+        if img_points is None:
+            tracker.reset()
+            poses.append(None)
+            continue
+        started = time.perf_counter()
+        pose = tracker.solve(img_points)
+        latencies.append(time.perf_counter() - started)
+        poses.append(pose if pose.ok else None)
+    return poses, np.array(latencies)
+
+
+def rotation_difference_deg(rvec_a: np.ndarray, rvec_b: np.ndarray) -> float:
+    r_a, _ = cv2.Rodrigues(rvec_a)
+    r_b, _ = cv2.Rodrigues(rvec_b)
+    cos = (np.trace(r_a.T @ r_b) - 1) / 2
+    return float(np.degrees(np.arccos(np.clip(cos, -1.0, 1.0))))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="+", help="영상 파일 또는 프레임 이미지 폴더")
+    parser.add_argument("--limit", type=int, default=None, help="영상당 최대 프레임 수")
+    parser.add_argument("--threshold", type=float, default=3.0, help="전체 solvePnP 로 되돌아가는 재투영 오차 (px)")
+    parser.add_argument("--json", action="store_true", help="결과를 JSON 으로 출력")
+    args = parser.parse_args()
+
+    obj_points = get_canonical_face_model_obj()
+    if obj_points is None:
+        raise SystemExit("정규 얼굴 모델을 로드할 수 없습니다.")
+    obj_points = obj_points[:NUM_LANDMARKS]
+
+    report = []
+    for source in args.sources:
+        points, (width, height) = collect_image_points(source, args.limit)
+        camera_matrix = np.array([[width, 0, width / 2], [0, width, height / 2], [0, 0, 1]], dtype=np.float64)
+
+        full_poses, full_lat = run_tracker(HeadPoseTracker(obj_points, camera_matrix, tracking=False), points)
+        track_poses, track_lat = run_tracker(
+            HeadPoseTracker(obj_points, camera_matrix, max_reprojection_error=args.threshold, tracking=True), points
+        )
+
+        rot_err, trans_err, fallbacks, tracked = [], [], 0, 0
+        for full, track in zip(full_poses, track_poses):
+            if full is None or track is None:
+                continue
+            tracked += 1
+            fallbacks += int(track.full_solve)
+            rot_err.append(rotation_difference_deg(full.rvec, track.rvec))
+            trans_err.append(float(np.linalg.norm(full.tvec - track.tvec)))
+        rot_err, trans_err = np.array(rot_err), np.array(trans_err)
+
+        def lat(a: np.ndarray) -> dict:
+            return {"mean_us": float(a.mean() * 1e6), "p95_us": float(np.percentile(a, 95) * 1e6)} if len(a) else {}
+
+        report.append({
+            "source": source,
+            "frames": len(points),
+            "frames_with_face": tracked,
+            "full_solve": lat(full_lat),
+            "tracking": lat(track_lat),
+            "speed_up": float(full_lat.mean() / track_lat.mean()) if len(track_lat) else None,
+            "fallback_ratio": fallbacks / tracked if tracked else None,
+            "rotation_error_deg": {"mean": float(rot_err.mean()), "p95": float(np.percentile(rot_err, 95)),
+                                   "max": float(rot_err.max())} if len(rot_err) else {},
+            "translation_error": {"mean": float(trans_err.mean()), "p95": float(np.percentile(trans_err, 95))}
+            if len(trans_err) else {},
+        })
+
+    if args.json:
+        print(json.dumps(report, indent=2, ensure_ascii=False))
+        return
+    for r in report:
+        print(f"== {r['source']} ({r['frames_with_face']}/{r['frames']} frames with a face)")
+        if not r["frames_with_face"]:
+            continue
+        print(f"  full solve  : {r['full_solve']['mean_us']:8.1f} us mean, {r['full_solve']['p95_us']:8.1f} us p95")
+        print(f"  tracking    : {r['tracking']['mean_us']:8.1f} us mean, {r['tracking']['p95_us']:8.1f} us p95"
+              f"  ({r['speed_up']:.2f}x, fallback {r['fallback_ratio'] * 100:.1f}%)")
+        print(f"  rotation Δ  : {r['rotation_error_deg']['mean']:.3f} deg mean, "
+              f"{r['rotation_error_deg']['p95']:.3f} p95, {r['rotation_error_deg']['max']:.3f} max")
+        print(f"  translation Δ: {r['translation_error']['mean']:.3f} mean, {r['translation_error']['p95']:.3f} p95")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+BatchInferenceScheduler 의 배치 크기, 백프레셔, 처리량, 지연 시간을 StubDetector 로 확인하는 벤치마크.
+
+streams 개의 스트림이 각각 fps 로 프레임을 보내고(스트림당 sample_interval 마다 한 장만 검출기로 들어감),
+duration 초 동안의 처리량, 평균 배치 크기, 버린 프레임 수, p50/p99 지연 시간을 출력합니다.
+
+사용법:
+    python bench_prohibited_items.py --streams 200 --batch-size 8 --workers 2
+    python bench_prohibited_items.py --streams 200 --batch-size 1 2 4 8 16
+"""
+import argparse
+import threading
+import time
+import numpy as np
+from prohibited_items import BatchInferenceScheduler, StubDetector
+
+
+def run(streams: int, batch_size: int, workers: int, fps: float, sample_interval: float, duration: float) -> dict:
+    hits = [0]
+    lock = threading.Lock()
+
+    def on_result(stream_id, timestamp, detections):
+        if detections:
+            with lock:
+                hits[0] += 1
+
+    scheduler = BatchInferenceScheduler(
+        StubDetector(), on_result, batch_size=batch_size, num_workers=workers, sample_interval=sample_interval,
+    )
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (480, 640, 3), dtype=np.uint8) for _ in range(4)]
+    # 절반의 프레임은 StubDetector 가 검출하도록 왼쪽 위를 빨갛게 칠합니다. (BGR)
+    for frame in frames[:2]:
+        frame[:40, :40] = (0, 0, 255)
+
+    started = time.monotonic()
+    tick = 0
+    while time.monotonic() - started < duration:
+        now = time.time()
+        for s in range(streams):
+            scheduler.submit(f"s{s}", frames[(s + tick) % len(frames)], now)
+        tick += 1
+        time.sleep(max(1 / fps - (time.monotonic() - started - tick / fps), 0))
+    time.sleep(scheduler.max_wait + 0.5)
+    stats = scheduler.stats()
+    scheduler.shutdown()
+    stats["throughput"] = stats["processed"] / duration
+    stats["hits"] = hits[0]
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--streams", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, nargs="+", default=[8])
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--fps", type=float, default=5.0, help="스트림당 제출 프레임 수")
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--duration", type=float, default=10.0)
+    args = parser.parse_args()
+
+    print(f"{'batch':>5} {'items/s':>8} {'mean bs':>8} {'dropped':>8} {'expired':>8} {'p50 ms':>8} {'p99 ms':>8}")
+    for batch_size in args.batch_size:
+        r = run(args.streams, batch_size, args.workers, args.fps, args.sample_interval, args.duration)
+        print(f"{batch_size:5d} {r['throughput']:8.1f} {r['mean_batch_size']:8.2f} {r['dropped']:8d} {r['expired']:8d} "
+              f"{r['latency_p50'] * 1e3:8.1f} {r['latency_p99'] * 1e3:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
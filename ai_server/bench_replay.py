@@ -0,0 +1,183 @@
+"""
+녹화된 영상/프레임 폴더를 face.py 와 같은 단계로 재생하며 단계별 비용을 재는 벤치마크.
+
+단계: decode -> cvtColor -> FaceMesh.process -> landmarks(배열 변환 + 눈/홍채 중심)
+      -> solvePnP/Rodrigues -> gaze 정규화
+
+단계별 p50/p95/p99 지연 시간, 코어당 초당 프레임 수(CPU 시간 기준), 최대 RSS 를 출력하고,
+--output 으로 JSON 을 저장하면 --compare 로 다른 커밋의 결과와 비교할 수 있습니다.
+
+사용법:
+    python bench_replay.py recordings/*.mp4 --output bench_head.json
+    python bench_replay.py recordings/*.mp4 --tracking --compare bench_head.json
+"""
+import argparse
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import cv2
+import mediapipe as mp
+import numpy as np
+from frame_source import iter_frames
+from gaze import GazeEstimator, landmarks_to_array, normalize_rows
+from intrinsics import IntrinsicsCache
+from util import get_canonical_face_model_obj
+
+STAGES = ("decode", "cvt_color", "face_mesh", "landmarks", "pnp", "gaze")
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=Path(__file__).parent, text=True, stderr=subprocess.DEVNULL,
+        ).strip()
+    except Exception:
+        return None
+
+
+def _peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux 는 KB, macOS 는 byte 단위입니다.
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def replay(source: str, obj_points_3d: np.ndarray, tracking: bool, intrinsics_key: Optional[str],
+           limit: Optional[int], timings: Dict[str, List[float]]) -> dict:
+    frames = 0
+    faces = 0
+    estimator: Optional[GazeEstimator] = None
+    cache = IntrinsicsCache()
+    clock = time.perf_counter
+    with mp.solutions.face_mesh.FaceMesh(
+        max_num_faces=1, refine_landmarks=True,
+        min_detection_confidence=0.5, min_tracking_confidence=0.5,
+    ) as face_mesh:
+        source_iter = iter_frames(source, limit=limit)
+        while True:
+            t0 = clock()
+            frame = next(source_iter, None)
+            t1 = clock()
+            if frame is None:
+                break
+            frames += 1
+            timings["decode"].append(t1 - t0)
+
+            image_height, image_width, _ = frame.shape
+            if estimator is None:
+                intrinsics = cache.load(intrinsics_key, (image_width, image_height))
+                estimator = GazeEstimator(obj_points_3d, intrinsics.camera_matrix, intrinsics.dist_coeffs,
+                                          tracking=tracking)
+
+            t0 = clock()
+            image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            t1 = clock()
+            results = face_mesh.process(image_rgb)
+            t2 = clock()
+            timings["cvt_color"].append(t1 - t0)
+            timings["face_mesh"].append(t2 - t1)
+            if not results.multi_face_landmarks:
+                estimator.reset()
+                continue
+            faces += 1
+
+            t0 = clock()
+            points = landmarks_to_array(results.multi_face_landmarks[0])
+            centroids = estimator.centroids(points)
+            eye_direction_local = centroids[2:] - centroids[:2]
+            img_points = estimator.image_points(points, image_width, image_height)
+            t1 = clock()
+            pose = estimator.head_pose(img_points)
+            rotation, _ = cv2.Rodrigues(pose.rvec)
+            t2 = clock()
+            normalize_rows(eye_direction_local @ rotation)
+            t3 = clock()
+            timings["landmarks"].append(t1 - t0)
+            timings["pnp"].append(t2 - t1)
+            timings["gaze"].append(t3 - t2)
+    return {"source": source, "frames": frames, "frames_with_face": faces}
+
+
+def summarize(samples: List[float]) -> dict:
+    if not samples:
+        return {"count": 0}
+    a = np.array(samples) * 1e3
+    return {
+        "count": len(samples),
+        "mean_ms": float(a.mean()),
+        "p50_ms": float(np.percentile(a, 50)),
+        "p95_ms": float(np.percentile(a, 95)),
+        "p99_ms": float(np.percentile(a, 99)),
+    }
+
+
+def print_report(report: dict, baseline: Optional[dict]) -> None:
+    print(f"commit {report['commit']}  tracking={report['tracking']}  frames={report['frames']}")
+    header = f"{'stage':<10} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}"
+    if baseline:
+        header += f" {'Δp50':>8} {'Δp95':>8}"
+    print(header)
+    for stage in STAGES:
+        s = report["stages"][stage]
+        if not s["count"]:
+            continue
+        line = f"{stage:<10} {s['p50_ms']:9.3f} {s['p95_ms']:9.3f} {s['p99_ms']:9.3f}"
+        b = (baseline or {}).get("stages", {}).get(stage)
+        if b and b.get("count"):
+            line += f" {(s['p50_ms'] / b['p50_ms'] - 1) * 100:+7.1f}% {(s['p95_ms'] / b['p95_ms'] - 1) * 100:+7.1f}%"
+        print(line)
+    line = f"fps/core {report['fps_per_core']:.1f}  wall fps {report['wall_fps']:.1f}  peak RSS {report['peak_rss_mb']:.1f} MB"
+    if baseline:
+        line += f"  (baseline fps/core {baseline['fps_per_core']:.1f}, peak RSS {baseline['peak_rss_mb']:.1f} MB)"
+    print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("sources", nargs="+", help="영상 파일 또는 프레임 이미지 폴더")
+    parser.add_argument("--limit", type=int, default=None, help="영상당 최대 프레임 수")
+    parser.add_argument("--tracking", action="store_true", help="머리 자세 추적 모드 사용")
+    parser.add_argument("--intrinsics-key", default=None, help="IntrinsicsCache key (없으면 해석적 기본값)")
+    parser.add_argument("--output", type=Path, default=None, help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", type=Path, default=None, help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    obj_points_3d = get_canonical_face_model_obj()
+    if obj_points_3d is None:
+        raise SystemExit("정규 얼굴 모델을 로드할 수 없습니다.")
+
+    timings: Dict[str, List[float]] = {stage: [] for stage in STAGES}
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    sources = [replay(s, obj_points_3d, args.tracking, args.intrinsics_key, args.limit, timings) for s in args.sources]
+    wall, cpu = time.perf_counter() - wall_start, time.process_time() - cpu_start
+    frames = sum(s["frames"] for s in sources)
+
+    report = {
+        "commit": _git_commit(),
+        "created_at": datetime.now().isoformat(),
+        "machine": {"platform": platform.platform(), "processor": platform.processor(), "python": platform.python_version(),
+                    "opencv": cv2.__version__, "mediapipe": getattr(mp, "__version__", None)},
+        "tracking": args.tracking,
+        "sources": sources,
+        "frames": frames,
+        "stages": {stage: summarize(samples) for stage, samples in timings.items()},
+        # FaceMesh 가 내부적으로 여러 스레드를 쓸 수 있으므로 CPU 시간 기준으로 코어당 처리량을 계산합니다.
+        "fps_per_core": frames / cpu if cpu > 0 else 0.0,
+        "wall_fps": frames / wall if wall > 0 else 0.0,
+        "peak_rss_mb": _peak_rss_mb(),
+    }
+
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    print_report(report, baseline)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        print(f"saved {args.output}")
+
+
+if __name__ == "__main__":
+    main()
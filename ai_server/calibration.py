@@ -1,8 +1,9 @@
-import requests
+import os
 import cv2
 import mediapipe as mp
 import numpy as np
 from util import get_canonical_face_model_obj
+from intrinsics import CameraIntrinsics, IntrinsicsCache
 
 
 # # objpoints로 사용할 3D 모델 좌표를 로드합니다.
@@ -120,6 +121,13 @@ if len(objpoints_list) > 10:  # 최소 10개 이상의 데이터가 있을 때 
         print(rvecs)
         print("\n[tvecs]")
         print(tvecs)
+
+        # face.py 가 사용할 수 있도록 내부 파라미터 캐시에 저장합니다.
+        camera_key = os.getenv("CAMERA_KEY", "local-webcam")
+        saved_path = IntrinsicsCache().save(
+            camera_key, CameraIntrinsics(camera_matrix, dist_coeffs, image_size, "calibrated", float(ret))
+        )
+        print(f"\n내부 파라미터 저장 완료: {saved_path}")
     else:
         print("\n캘리브레이션 실패.")
 else:
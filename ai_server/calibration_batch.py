@@ -0,0 +1,144 @@
+"""
+웹캠/화면/키 입력 없이 동작하는 카메라 캘리브레이션 작업.
+
+이미지 폴더나 짧게 녹화한 영상을 읽어 여러 코어에서 병렬로 FaceMesh 를 돌리고, 모은 랜드마크로
+cv2.calibrateCamera 를 실행한 뒤 결과를 IntrinsicsCache 에 key(기기 id 또는 응시자 id)로 저장합니다.
+
+사용법:
+    python calibration_batch.py recordings/device42.mp4 --key device42
+    python calibration_batch.py frames/examinee7/ --key 68b65d3e0f3af74afd0502da --step 3 --workers 4
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import List, Optional, Tuple
+import cv2
+import numpy as np
+from frame_source import IMAGE_SUFFIXES
+from gaze import NUM_LANDMARKS, landmarks_to_array
+from intrinsics import CameraIntrinsics, IntrinsicsCache, analytic_intrinsics
+from util import get_canonical_face_model_obj
+
+
+def _sample_refs(source: Path, step: int) -> List:
+    """영상이면 프레임 번호, 폴더면 이미지 경로를 step 간격으로 고릅니다."""
+    if source.is_dir():
+        return [str(p) for p in sorted(source.iterdir()) if p.suffix.lower() in IMAGE_SUFFIXES][::step]
+    cap = cv2.VideoCapture(str(source))
+    if not cap.isOpened():
+        raise FileNotFoundError(f"영상을 열 수 없습니다: {source}")
+    count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    return list(range(0, count, step))
+
+
+def _read_chunk(source: str, refs: List) -> List[np.ndarray]:
+    if Path(source).is_dir():
+        frames = [cv2.imread(p, cv2.IMREAD_COLOR) for p in refs]
+        return [f for f in frames if f is not None]
+    frames = []
+    cap = cv2.VideoCapture(source)
+    cap.set(cv2.CAP_PROP_POS_FRAMES, refs[0])
+    wanted = set(refs)
+    for index in range(refs[0], refs[-1] + 1):
+        if index in wanted:
+            success, frame = cap.read()
+            if not success:
+                break
+            frames.append(frame)
+        elif not cap.grab():
+            break
+    cap.release()
+    return frames
+
+
+def _landmarks_for_chunk(source: str, refs: List) -> Tuple[List[np.ndarray], Optional[Tuple[int, int]]]:
+    """워커 프로세스에서 실행됩니다. 프레임 묶음의 2D 랜드마크 좌표와 이미지 크기를 반환합니다."""
+    import mediapipe as mp
+
+    points: List[np.ndarray] = []
+    image_size: Optional[Tuple[int, int]] = None
+    # 프레임이 띄엄띄엄 샘플링되므로 tracking 없이 매 프레임 검출합니다.
+    with mp.solutions.face_mesh.FaceMesh(
+        static_image_mode=True, max_num_faces=1, refine_landmarks=True, min_detection_confidence=0.5,
+    ) as face_mesh:
+        for frame in _read_chunk(source, refs):
+            height, width, _ = frame.shape
+            if image_size is None:
+                image_size = (width, height)
+            elif image_size != (width, height):
+                continue
+            results = face_mesh.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+            if not results.multi_face_landmarks:
+                continue
+            lm = landmarks_to_array(results.multi_face_landmarks[0])
+            points.append(np.ascontiguousarray(lm[:NUM_LANDMARKS, :2] * (width, height), dtype=np.float32))
+    return points, image_size
+
+
+def collect_image_points(source: Path, step: int, workers: int) -> Tuple[List[np.ndarray], Tuple[int, int]]:
+    refs = _sample_refs(source, step)
+    if not refs:
+        raise ValueError(f"읽을 프레임이 없습니다: {source}")
+    chunk_size = max(len(refs) // (workers * 4), 1)
+    chunks = [refs[i:i + chunk_size] for i in range(0, len(refs), chunk_size)]
+    points: List[np.ndarray] = []
+    image_size: Optional[Tuple[int, int]] = None
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for chunk_points, chunk_size_wh in pool.map(_landmarks_for_chunk, [str(source)] * len(chunks), chunks):
+            if chunk_size_wh is None:
+                continue
+            if image_size is None:
+                image_size = chunk_size_wh
+            if chunk_size_wh == image_size:
+                points.extend(chunk_points)
+    if image_size is None:
+        raise ValueError("얼굴을 찾은 프레임이 없습니다.")
+    return points, image_size
+
+
+def calibrate(
+    image_points: List[np.ndarray], image_size: Tuple[int, int], obj_points_3d: np.ndarray, max_views: int
+) -> CameraIntrinsics:
+    # calibrateCamera 는 뷰 수에 비례해 느려지므로 고르게 max_views 개만 사용합니다.
+    if len(image_points) > max_views:
+        keep = np.linspace(0, len(image_points) - 1, max_views).round().astype(int)
+        image_points = [image_points[i] for i in keep]
+    obj_points = np.ascontiguousarray(obj_points_3d[:NUM_LANDMARKS], dtype=np.float32)
+    initial = analytic_intrinsics(image_size)
+    rms, camera_matrix, dist_coeffs, _, _ = cv2.calibrateCamera(
+        [obj_points] * len(image_points), image_points, image_size,
+        initial.camera_matrix.copy(), None, flags=cv2.CALIB_USE_INTRINSIC_GUESS,
+    )
+    return CameraIntrinsics(camera_matrix, dist_coeffs, image_size, "calibrated", float(rms))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("source", help="이미지 폴더 또는 영상 파일")
+    parser.add_argument("--key", required=True, help="저장할 key (기기 id 또는 응시자 id)")
+    parser.add_argument("--step", type=int, default=5, help="step 프레임마다 한 장씩 사용")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--min-views", type=int, default=10)
+    parser.add_argument("--max-views", type=int, default=60)
+    args = parser.parse_args()
+
+    obj_points_3d = get_canonical_face_model_obj()
+    if obj_points_3d is None:
+        raise SystemExit("정규 얼굴 모델을 로드할 수 없습니다.")
+
+    image_points, image_size = collect_image_points(Path(args.source), args.step, args.workers)
+    print(f"얼굴을 찾은 프레임: {len(image_points)}개, 이미지 크기: {image_size}")
+    if len(image_points) < args.min_views:
+        raise SystemExit("수집된 데이터가 부족하여 캘리브레이션을 진행할 수 없습니다.")
+
+    intrinsics = calibrate(image_points, image_size, obj_points_3d, args.max_views)
+    path = IntrinsicsCache().save(args.key, intrinsics)
+    print(f"캘리브레이션 완료 (rms={intrinsics.rms:.4f}): {path}")
+    print(intrinsics.camera_matrix)
+    print(intrinsics.dist_coeffs)
+
+
+if __name__ == "__main__":
+    main()
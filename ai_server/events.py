@@ -0,0 +1,334 @@
+"""
+프레임 단위 분석 결과를 EventLog(backend/db/models.py) 문서로 바꿔 event_logs 컬렉션에 모아서 쓰는 모듈.
+
+- GazeOffScreenDetector : 응시자 한 명의 시선 이탈을 히스테리시스/최소 지속 시간/쿨다운으로 판정해
+  이탈 구간 하나당 이벤트 하나만 만듭니다.
+- EventLogWriter : 이벤트를 버퍼에 모았다가 max_batch 개가 차거나 flush_interval 이 지나면 insert_many 로 한 번에 씁니다.
+- GazeEventMonitor : GazeWorkerPool 의 on_result 콜백으로 연결해 스트림별 detector 와 writer 를 관리합니다.
+  결과에 face_count 샘플이 있으면 MultipleFacesDetector(face_count.py)로 multiple_faces 이벤트도 만듭니다.
+"""
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, List, Literal, Optional
+from bson import ObjectId
+from bson.errors import InvalidId
+from dotenv import load_dotenv
+from face_count import MultipleFacesDetector
+from metrics import EVENTS_EMITTED, STAGE_LATENCY
+
+load_dotenv()
+
+EVENT_LOG_COLLECTION = "event_logs"
+EXAMINEE_COLLECTION = "examinee"
+
+Severity = Literal['low', 'medium', 'high', 'critical']
+
+
+@dataclass
+class StreamInfo:
+    """스트림이 어느 시험 세션의 어느 응시자 것인지 나타냅니다."""
+    exam_id: str
+    session_id: str
+    user_id: str
+
+
+@dataclass
+class DetectedEvent:
+    stream_id: str
+    event_type: str
+    severity: Severity
+    message: str
+    occurred_at: float  # epoch seconds
+    details: Optional[dict] = None
+
+
+class GazeOffScreenDetector:
+    """
+    시선 이탈 상태 머신.
+
+    - off_axis 각도가 enter_deg 를 넘으면 이탈 후보가 되고, exit_deg 아래로 내려와야 화면 복귀로 봅니다. (히스테리시스)
+    - 후보 상태가 min_duration 초 이상 이어지면 이벤트를 한 번 만듭니다. 같은 구간에서는 다시 만들지 않습니다.
+    - 이벤트를 만든 구간이 끝난 뒤 cooldown 초 동안은 새 이벤트를 만들지 않습니다.
+    - 얼굴을 찾지 못한 프레임(angle 이 None)은 화면을 보지 않는 것으로 취급합니다.
+    """
+
+    def __init__(
+        self,
+        enter_deg: float = 35.0,
+        exit_deg: float = 25.0,
+        min_duration: float = 2.0,
+        cooldown: float = 10.0,
+    ):
+        self.enter_deg = enter_deg
+        self.exit_deg = exit_deg
+        self.min_duration = min_duration
+        self.cooldown = cooldown
+        self._off_since: Optional[float] = None
+        self._reported = False
+        self._cooldown_until = 0.0
+        self._max_angle = 0.0
+
+    def update(self, angle: Optional[float], now: float) -> Optional[dict]:
+        """
+        프레임 하나의 결과를 반영합니다. 이벤트를 만들어야 하면 details dict 를, 아니면 None 을 반환합니다.
+        """
+        off = angle is None or angle > (self.exit_deg if self._off_since is not None else self.enter_deg)
+        if not off:
+            if self._reported:
+                self._cooldown_until = now + self.cooldown
+            self._off_since = None
+            self._reported = False
+            self._max_angle = 0.0
+            return None
+
+        if self._off_since is None:
+            self._off_since = now
+        if angle is not None:
+            self._max_angle = max(self._max_angle, angle)
+        if self._reported or now - self._off_since < self.min_duration or now < self._cooldown_until:
+            return None
+        self._reported = True
+        return {
+            "started_at": self._off_since,
+            "duration": now - self._off_since,
+            "max_angle_deg": self._max_angle,
+            "face_missing": angle is None,
+        }
+
+
+def build_event_log(examinee: dict, exam_id: str, event: DetectedEvent) -> dict:
+    """EventLog 스키마에 맞는 문서를 만듭니다."""
+    return {
+        "examinee": examinee,
+        "exam_id": exam_id,
+        "generated_at": datetime.fromtimestamp(event.occurred_at),
+        "event_type": event.event_type,
+        "severity": event.severity,
+        "content": {"message": event.message, "details": event.details},
+        "is_dismissed": False,
+        "screenshot_url": "",
+    }
+
+
+class EventLogWriter:
+    """
+    이벤트를 모아서 event_logs 컬렉션에 쓰는 백그라운드 스레드.
+
+    응시자 문서(Examinee)는 스트림마다 한 번만 조회해 캐시합니다.
+    flush_interval 초마다, 또는 max_batch 개가 쌓이면 insert_many 한 번으로 씁니다.
+
+    - user_id 가 잘못됐거나 응시자를 찾지 못한 이벤트는 그 이벤트만 버립니다.
+    - 응시자 조회가 Mongo 오류로 실패한 이벤트는 다음 flush 에서 다시 조회합니다.
+    - insert_many 가 실패하면 만든 문서를 그대로(같은 _id 로) 들고 있다가 다음 flush 에서 다시 씁니다.
+      일부만 들어간 경우 다시 쓸 때 생기는 중복 키 오류는 이미 쓴 것으로 봅니다.
+      쓰지 못한 문서가 max_retained 개를 넘으면 오래된 것부터 버립니다.
+    """
+
+    def __init__(
+        self,
+        mongo_url: Optional[str] = None,
+        db_name: Optional[str] = None,
+        max_batch: int = 200,
+        flush_interval: float = 5.0,
+        max_retained: int = 10000,
+    ):
+        from pymongo import MongoClient
+
+        self._client = MongoClient(mongo_url or os.getenv("MONGO_DB_URL"))
+        db = self._client.get_database(db_name or os.getenv("MONGO_DB_NAME"))
+        self._events = db.get_collection(EVENT_LOG_COLLECTION)
+        self._examinees = db.get_collection(EXAMINEE_COLLECTION)
+        self.max_batch = max_batch
+        self.flush_interval = flush_interval
+        self.max_retained = max_retained
+        # 만들었지만 아직 쓰지 못한 EventLog 문서 (writer 스레드에서만 사용)
+        self._documents: List[dict] = []
+        self._queue: "queue.Queue[tuple[StreamInfo, DetectedEvent] | None]" = queue.Queue()
+        self._examinee_cache: Dict[tuple[str, str], dict] = {}
+        self.written = 0
+        self.flushes = 0
+        self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+        self._thread.start()
+
+    def put(self, info: StreamInfo, event: DetectedEvent) -> None:
+        EVENTS_EMITTED.labels(event.event_type).inc()
+        self._queue.put((info, event))
+
+    def _examinee_for(self, info: StreamInfo) -> Optional[dict]:
+        key = (info.session_id, info.user_id)
+        examinee = self._examinee_cache.get(key)
+        if examinee is None:
+            examinee = self._examinees.find_one({
+                "session_id": info.session_id,
+                "exam_id": info.exam_id,
+                "examinee._id": ObjectId(info.user_id),
+            })
+            if examinee is not None:
+                self._examinee_cache[key] = examinee
+        return examinee
+
+    def _insert(self, documents: List[dict]) -> None:
+        from pymongo.errors import BulkWriteError
+
+        try:
+            self._events.insert_many(documents, ordered=False)
+        except BulkWriteError as e:
+            # 다시 쓰는 문서 중 지난번에 이미 들어간 것(중복 키, 11000)만 실패했다면 성공으로 봅니다.
+            details = e.details or {}
+            if details.get("writeConcernErrors") or any(err.get("code") != 11000 for err in details.get("writeErrors", [])):
+                raise
+
+    def _flush(self, pending: List[tuple[StreamInfo, DetectedEvent]]) -> List[tuple[StreamInfo, DetectedEvent]]:
+        """
+        pending 을 문서로 바꿔 쓰고, 응시자 조회가 일시적으로 실패해 다음에 다시 시도할 항목을 돌려줍니다.
+        """
+        from pymongo.errors import PyMongoError
+
+        retry: List[tuple[StreamInfo, DetectedEvent]] = []
+        for info, event in pending:
+            try:
+                examinee = self._examinee_for(info)
+                if examinee is None:
+                    print(f"응시자 정보를 찾을 수 없어 이벤트를 버립니다: {info} {event.event_type}")
+                    continue
+                self._documents.append(build_event_log(examinee, info.exam_id, event))
+            except InvalidId:
+                print(f"잘못된 user_id 라 이벤트를 버립니다: {info} {event.event_type}")
+            except PyMongoError as e:
+                print(f"응시자 조회 실패, 다음 flush 에서 다시 시도합니다: {info} {e}")
+                retry.append((info, event))
+            except Exception as e:
+                print(f"이벤트를 문서로 만들지 못해 버립니다: {info} {event.event_type} {e}")
+
+        if len(self._documents) > self.max_retained:
+            dropped = len(self._documents) - self.max_retained
+            print(f"쓰지 못한 이벤트가 너무 많아 오래된 {dropped}개를 버립니다.")
+            del self._documents[:dropped]
+        if self._documents:
+            try:
+                self._insert(self._documents)
+            except PyMongoError as e:
+                print(f"이벤트 기록 실패, 다음 flush 에서 다시 시도합니다: {e}")
+            except Exception as e:
+                # 문서 자체가 잘못된 경우(InvalidDocument 등)는 다시 써도 실패하므로 버립니다.
+                print(f"이벤트 기록 실패, {len(self._documents)}개를 버립니다: {e}")
+                self._documents = []
+            else:
+                self.written += len(self._documents)
+                self.flushes += 1
+                self._documents = []
+        # Mongo 가 오래 내려가 있어도 다시 시도할 항목이 끝없이 늘지 않게 합니다.
+        return retry[-self.max_retained:]
+
+    def _run(self) -> None:
+        pending: List[tuple[StreamInfo, DetectedEvent]] = []
+        # 응시자 조회가 실패해 다시 시도할 항목. max_batch 계산에 넣지 않아 실패가 이어져도 바로 다시 돌지 않습니다.
+        retrying: List[tuple[StreamInfo, DetectedEvent]] = []
+        deadline = time.monotonic() + self.flush_interval
+        stopping = False
+        while not stopping:
+            try:
+                item = self._queue.get(timeout=max(deadline - time.monotonic(), 0.0))
+                if item is None:
+                    stopping = True
+                else:
+                    pending.append(item)
+            except queue.Empty:
+                pass
+            if (pending or retrying or self._documents) and (stopping or len(pending) >= self.max_batch or time.monotonic() >= deadline):
+                try:
+                    retrying = self._flush(retrying + pending)
+                    pending = []
+                except Exception as e:
+                    # 예상하지 못한 오류: 이번 항목은 그대로 두고 다음 flush 에서 다시 시도합니다.
+                    print(f"이벤트 기록 실패: {e}")
+            if time.monotonic() >= deadline:
+                deadline = time.monotonic() + self.flush_interval
+
+    def close(self, timeout: float = 10.0) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=timeout)
+        self._client.close()
+
+
+class GazeEventMonitor:
+    """
+    GazeWorkerPool 결과를 받아 스트림별 GazeOffScreenDetector 를 돌리고, 이벤트를 writer 로 넘깁니다.
+    등록되지 않은 스트림(register 를 호출하지 않은 스트림)의 결과는 무시합니다.
+    """
+
+    def __init__(self, writer: EventLogWriter, multiple_faces_options: Optional[dict] = None, **detector_options):
+        self.writer = writer
+        self.detector_options = detector_options
+        self.multiple_faces_options = multiple_faces_options or {}
+        self._streams: Dict[str, StreamInfo] = {}
+        self._detectors: Dict[str, GazeOffScreenDetector] = {}
+        self._face_detectors: Dict[str, MultipleFacesDetector] = {}
+        self._lock = threading.Lock()
+
+    def register(self, stream_id: str, info: StreamInfo) -> None:
+        with self._lock:
+            self._streams[stream_id] = info
+            self._detectors[stream_id] = GazeOffScreenDetector(**self.detector_options)
+            self._face_detectors[stream_id] = MultipleFacesDetector(**self.multiple_faces_options)
+
+    def unregister(self, stream_id: str) -> None:
+        with self._lock:
+            self._streams.pop(stream_id, None)
+            self._detectors.pop(stream_id, None)
+            self._face_detectors.pop(stream_id, None)
+
+    def stream_info(self, stream_id: str) -> Optional[StreamInfo]:
+        with self._lock:
+            return self._streams.get(stream_id)
+
+    def emit(self, event: DetectedEvent) -> None:
+        """다른 분석기(다중 얼굴, 소음 등)가 만든 이벤트도 같은 writer 로 보냅니다."""
+        info = self.stream_info(event.stream_id)
+        if info is not None:
+            self.writer.put(info, event)
+
+    def on_result(self, result: dict) -> None:
+        started = time.perf_counter()
+        try:
+            self._on_result(result)
+        finally:
+            STAGE_LATENCY.labels("event").observe(time.perf_counter() - started)
+
+    def _on_result(self, result: dict) -> None:
+        stream_id = result["stream_id"]
+        with self._lock:
+            info = self._streams.get(stream_id)
+            detector = self._detectors.get(stream_id)
+            if info is None or detector is None:
+                return
+            faces_details = None
+            if result.get("face_count") is not None:
+                faces_details = self._face_detectors[stream_id].update(result["face_count"], result["timestamp"])
+            details = None
+            angle = result.get("off_axis_deg")
+            # 얼굴은 찾았지만 머리 자세를 풀지 못한 프레임은 시선 판단에 쓰지 않습니다.
+            if not (result.get("face_detected") and angle is None):
+                details = detector.update(angle, result["timestamp"])
+        if faces_details is not None:
+            self.writer.put(info, DetectedEvent(
+                stream_id=stream_id,
+                event_type="multiple_faces",
+                severity="high",
+                message="화면에 응시자 외의 사람이 일정 시간 이상 감지되었습니다.",
+                occurred_at=faces_details["started_at"],
+                details=faces_details,
+            ))
+        if details is not None:
+            self.writer.put(info, DetectedEvent(
+                stream_id=stream_id,
+                event_type="gaze_off_screen",
+                severity="medium",
+                message="응시자의 시선이 일정 시간 이상 화면을 벗어났습니다.",
+                occurred_at=details["started_at"],
+                details=details,
+            ))
@@ -1,7 +1,13 @@
+import os
+import time
 import cv2
 import mediapipe as mp
-import numpy as np
-from util import get_canonical_face_model_obj, normalize_vector
+from util import get_canonical_face_model_obj
+from gaze import GazeEstimator
+from frame_gate import StreamFrameGate, ANALYSE
+from intrinsics import IntrinsicsCache
+from face_count import FaceCounter
+from metrics import debug_log
 
 # MediaPipe Face Mesh 초기화
 mp_face_mesh = mp.solutions.face_mesh
@@ -28,8 +34,13 @@ right iris index :
 # 웹캠 열기
 cap = cv2.VideoCapture(0)
 OBJ_POINTS_3D = get_canonical_face_model_obj()
-dist = np.array([[-4.01273947e+00,1.91643263e+01,1.91395148e-02, 3.38945683e-01, -4.49048269e+01]])
-camera_matrix = np.array([[741.28103157,0.,258.16642618], [0.,794.16696808,268.50021802], [0.,0.,1.]])
+# calibration.py / calibration_batch.py 가 저장한 이 카메라의 내부 파라미터. 없으면 이미지 크기로부터 만든 기본값을 씁니다.
+camera_image_size = (int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)), int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+intrinsics = IntrinsicsCache().load(os.getenv("CAMERA_KEY", "local-webcam"), camera_image_size)
+gaze_estimator = GazeEstimator(OBJ_POINTS_3D, intrinsics.camera_matrix, intrinsics.dist_coeffs, tracking=True)
+frame_gate = StreamFrameGate()
+# FaceMesh 는 주 응시자 한 명만 추적하고, 다른 사람이 있는지는 작은 프레임으로 0.5초마다 셉니다.
+face_counter = FaceCounter(interval=0.5)
 
 while cap.isOpened():
     success, image = cap.read()
@@ -37,77 +48,40 @@ while cap.isOpened():
         print("웹캠을 찾을 수 없습니다.")
         continue
 
+    # 어둡거나 흐린 프레임, 결과가 안정적인 동안의 잉여 프레임은 FaceMesh 전에 건너뜁니다.
+    if frame_gate.admit(image) != ANALYSE:
+        continue
+
     # BGR 이미지를 RGB로 변환
     image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
     image_height, image_width, _ = image.shape
     # Face Mesh 처리
     results = face_mesh.process(image)
+    face_count = face_counter.sample(image, time.time())
+    if face_count is not None and face_count > 1:
+        print(f"얼굴 {face_count}개 감지")
     # 랜드마크 기본 반환 값(좌표) 접근
     if results.multi_face_landmarks:
         for face_landmarks in results.multi_face_landmarks:
             # face_landmarks.landmark는 478개의 랜드마크 리스트 (refine_landmarks=True일 경우)
-            # 각 랜드마크는 x, y, z 좌표를 가짐
-            o_left : dict[str ,float] = {"x": 0, "y" : 0, "z" : 0}
-            o_right : dict[str ,float] = {"x": 0, "y" : 0, "z" : 0}
-            iris_right : dict[str ,float] = {"x": 0, "y" : 0, "z" : 0}
-            iris_left : dict[str ,float] = {"x": 0, "y" : 0, "z" : 0}
-
-            # # 예시: 첫 번째 랜드마크의 좌표 출력
-            # first_landmark = face_landmarks.landmark[0]
-            # print(f'첫 번째 랜드마크 좌표: (x: {first_landmark.x}, y: {first_landmark.y}, z: {first_landmark.z})')
-
-            # 모든 랜드마크를 순회하며 좌표를 사용할 수 있습니다.
-            for i, landmark in enumerate(face_landmarks.landmark):
-                if i in [159, 158, 157, 173, 160, 161, 246, 33, 7, 163, 144, 145, 153, 154, 155, 133]:
-                    o_left["x"] += landmark.x
-                    o_left["y"] += landmark.y
-                    o_left["z"] += landmark.z
-                    print(f"{i} 번째 o_left 값 : {landmark.x}, {landmark.y}, {landmark.y}")
-                elif i in [380, 372, 373, 390, 249, 263, 381, 382, 362, 398, 384, 385, 386, 387, 388, 466 ]:
-                    o_right["x"] += landmark.x
-                    o_right["y"] += landmark.y
-                    o_right["z"] += landmark.z
-                    print(f"{i} 번째 o_right 값 : {landmark.x}, {landmark.y}, {landmark.y}")
-                elif i in [470, 471, 468, 469, 472]:
-                    iris_left["x"] += landmark.x
-                    iris_left["y"] += landmark.y
-                    iris_left["z"] += landmark.z
-                    print(f"{i} 번째 iris_left 값 : {landmark.x}, {landmark.y}, {landmark.y}")
-                elif i in [475, 473, 476, 474, 477]:
-                    iris_right["x"] += landmark.x
-                    iris_right["y"] += landmark.y
-                    iris_right["z"] += landmark.z
-                    print(f"{i} 번째 iris_right 값 : {landmark.x}, {landmark.y}, {landmark.y}")
-                else:
-                    pass
-            eye_direction_local = np.array([
-                [iris_left["x"] - o_left["x"],iris_left["y"] - o_left["y"],iris_left["z"] - o_left["z"]],
-                [iris_right["x"] - o_right["x"], iris_right["y"] - o_right["y"], iris_right["z"] - o_right["z"]]
-            ])
-            img_points_2d = []
-            for i in range(478):
-                lm = face_landmarks.landmark[i]
-                x, y = lm.x * image_width, lm.y * image_height
-                img_points_2d.append([x, y])
-            ok, rvec, tvec = cv2.solvePnP(objectPoints=OBJ_POINTS_3D, imagePoints=np.array(img_points_2d), cameraMatrix=camera_matrix, distCoeffs=dist, flags=cv2.SOLVEPNP_ITERATIVE)
-            R, _ = cv2.Rodrigues(rvec)
-            g = eye_direction_local @ R
-            norm_g = normalize_vector(g)
-            print(f"R : {R}")
-            print(f"norm_g : {norm_g}")
-
-            print("@@@@" * 7)
-            print(f"avg left eye : x = {o_left['x']/16}, y = {o_left['y']/16}, z = {o_left['z']/16}, ")
-            print(f"avg right eye : x = {o_right['x']/16}, y = {o_right['y']/16}, z = {o_right['z']/16}, ")
-            print(f"avg left iris : x = {iris_left['x']/5}, y = {iris_left['y']/5}, z = {iris_left['z']/5}, ")
-            print(f"avg right iris : x = {iris_right['x']/5}, y = {iris_right['y']/5}, z = {iris_right['z']/5}, ")
-            print("***" * 7)
+            # 랜드마크를 한 번만 배열로 바꾸고 눈/홍채 중심과 시선 벡터는 GazeEstimator 가 계산합니다.
+            gaze_result = gaze_estimator.estimate(face_landmarks, image_width, image_height)
+            frame_gate.observe(None if gaze_result is None else gaze_result.gaze)
+            if gaze_result is None:
+                continue
+            # 매 프레임 print 하면 그 자체로 비용이 크므로 AI_SERVER_DEBUG_SAMPLE_RATE 비율만 기록합니다.
+            debug_log.log("gaze", gaze=gaze_result.gaze.tolist(), off_axis_deg=gaze_result.off_axis_deg)
+    else:
+        # 얼굴을 놓치면 다음 프레임의 머리 자세는 처음부터 다시 풉니다.
+        gaze_estimator.reset()
+        frame_gate.observe(None)
 
     if cv2.waitKey(5) & 0xFF == 27:
         break
 
 cap.release()
 face_mesh.close()
+face_counter.close()
 
 """
 camera_matrix = [[741.28103157   0.         258.16642618]
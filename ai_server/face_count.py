@@ -0,0 +1,106 @@
+"""
+FaceMesh(max_num_faces=1) 옆에서 낮은 주기로 얼굴 수만 세는 보조 검출기.
+
+FaceMesh 의 max_num_faces 를 늘리면 모든 프레임의 비용이 커지므로, 두 번째 사람 검출은
+다운스케일한 프레임에 MediaPipe Face Detection(BlazeFace)을 몇 Hz 로만 돌려서 처리합니다.
+
+- FaceCounter : 스트림 하나의 얼굴 수 샘플링. interval 초가 지나지 않았으면 검출을 건너뜁니다.
+- MultipleFacesDetector : 얼굴이 두 개 이상인 샘플이 min_samples 번 연속되면 multiple_faces 이벤트를 한 번 만듭니다.
+"""
+from typing import Optional
+import cv2
+import numpy as np
+
+
+class FaceCounter:
+    """
+    RGB 프레임을 target_width 로 줄여 얼굴 수를 셉니다. FaceDetection 인스턴스는 처음 필요할 때 만듭니다.
+    """
+
+    def __init__(self, interval: float = 0.5, target_width: int = 320, min_confidence: float = 0.6):
+        self.interval = interval
+        self.target_width = target_width
+        self.min_confidence = min_confidence
+        self._detector = None
+        self._last_sampled: Optional[float] = None
+
+    def due(self, now: float) -> bool:
+        return self._last_sampled is None or now - self._last_sampled >= self.interval
+
+    def count(self, image_rgb: np.ndarray) -> int:
+        if self._detector is None:
+            import mediapipe as mp
+            # model_selection=0 은 카메라에서 2m 이내의 얼굴용 짧은 거리 모델로, 웹캠 감독 환경에 맞습니다.
+            self._detector = mp.solutions.face_detection.FaceDetection(
+                model_selection=0, min_detection_confidence=self.min_confidence,
+            )
+        height, width = image_rgb.shape[:2]
+        if width > self.target_width:
+            scale = self.target_width / width
+            image_rgb = cv2.resize(image_rgb, (self.target_width, max(int(height * scale), 1)),
+                                   interpolation=cv2.INTER_AREA)
+        results = self._detector.process(image_rgb)
+        return len(results.detections) if results.detections else 0
+
+    def sample(self, image_rgb: np.ndarray, now: float) -> Optional[int]:
+        """샘플링할 때가 되었으면 얼굴 수를, 아니면 None 을 반환합니다."""
+        if not self.due(now):
+            return None
+        self._last_sampled = now
+        return self.count(image_rgb)
+
+    def close(self) -> None:
+        if self._detector is not None:
+            self._detector.close()
+            self._detector = None
+
+
+class MultipleFacesDetector:
+    """
+    얼굴 수 샘플로 multiple_faces 구간을 판정합니다.
+
+    - 두 명 이상인 샘플이 min_samples 번 연속되면 이벤트를 한 번 만듭니다. 한 번 놓친 검출로 끊기지 않도록
+      한 명 이하인 샘플도 clear_samples 번 연속되어야 구간이 끝난 것으로 봅니다.
+    - 이벤트를 만든 구간이 끝난 뒤 cooldown 초 동안은 새 이벤트를 만들지 않습니다.
+    """
+
+    def __init__(self, min_samples: int = 3, clear_samples: int = 2, cooldown: float = 30.0):
+        self.min_samples = min_samples
+        self.clear_samples = clear_samples
+        self.cooldown = cooldown
+        self._streak = 0
+        self._clear_streak = 0
+        self._since: Optional[float] = None
+        self._max_faces = 0
+        self._reported = False
+        self._cooldown_until = 0.0
+
+    def update(self, face_count: int, now: float) -> Optional[dict]:
+        """샘플 하나를 반영합니다. 이벤트를 만들어야 하면 details dict 를, 아니면 None 을 반환합니다."""
+        if face_count < 2:
+            if self._since is None:
+                return None
+            self._clear_streak += 1
+            if self._clear_streak >= self.clear_samples:
+                if self._reported:
+                    self._cooldown_until = now + self.cooldown
+                self._streak = 0
+                self._since = None
+                self._max_faces = 0
+                self._reported = False
+            return None
+
+        self._clear_streak = 0
+        if self._since is None:
+            self._since = now
+        self._streak += 1
+        self._max_faces = max(self._max_faces, face_count)
+        if self._reported or self._streak < self.min_samples or now < self._cooldown_until:
+            return None
+        self._reported = True
+        return {
+            "started_at": self._since,
+            "duration": now - self._since,
+            "samples": self._streak,
+            "max_faces": self._max_faces,
+        }
@@ -0,0 +1,174 @@
+"""
+FaceMesh 앞단에서 분석할 가치가 없는 프레임을 걸러 내는 스트림별 게이트.
+
+- FrameQualityCheck : 다운스케일한 흑백 이미지로 밝기, 선명도(라플라시안 분산), 직전 프레임과의 차이를 NumPy 로 계산합니다.
+- AdaptiveRateScheduler : 최근 시선/자세 결과가 안정적이면 분석 간격을 늘리고, 움직임이나 경계값 결과가 나오면 바로 줄입니다.
+- StreamFrameGate : 위 둘을 묶어 스트림 하나의 프레임마다 분석 여부를 결정합니다.
+  품질 검사에서 걸러지는 상태가 max_quality_gap 초 이상 이어지면(카메라를 가리거나 끈 경우)
+  그 간격마다 한 프레임씩 그대로 분석으로 보내, 얼굴 없음 결과가 이벤트 판정까지 이어지게 합니다.
+"""
+import threading
+import time
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+
+# BGR -> 흑백 변환 가중치 (ITU-R BT.601)
+_GRAY_WEIGHTS = np.array([0.114, 0.587, 0.299], dtype=np.float32)
+
+# admit() 결과
+ANALYSE = "analyse"
+SKIP_DARK = "skip_dark"
+SKIP_BRIGHT = "skip_bright"
+SKIP_BLUR = "skip_blur"
+SKIP_RATE = "skip_rate"
+
+
+@dataclass
+class FrameQuality:
+    brightness: float
+    sharpness: float
+    motion: float  # 직전 검사 프레임과의 평균 절대 차이 (0~255). 첫 프레임은 inf
+
+
+def downscale_gray(frame: np.ndarray, target_width: int = 80) -> np.ndarray:
+    """픽셀을 건너뛰며 샘플링해 작은 흑백 이미지를 만듭니다. cv2.resize 보다 싸고 검사용으로는 충분합니다."""
+    step = max(frame.shape[1] // target_width, 1)
+    small = frame[::step, ::step]
+    if small.ndim == 2:
+        return small.astype(np.float32)
+    return small.astype(np.float32) @ _GRAY_WEIGHTS
+
+
+class FrameQualityCheck:
+    def __init__(self, target_width: int = 80):
+        self.target_width = target_width
+        self._previous: Optional[np.ndarray] = None
+
+    def measure(self, frame: np.ndarray) -> FrameQuality:
+        gray = downscale_gray(frame, self.target_width)
+        brightness = float(gray.mean())
+        # 4-이웃 라플라시안의 분산. 흐린 영상일수록 작습니다.
+        laplacian = 4 * gray[1:-1, 1:-1] - gray[:-2, 1:-1] - gray[2:, 1:-1] - gray[1:-1, :-2] - gray[1:-1, 2:]
+        sharpness = float(laplacian.var())
+        if self._previous is None or self._previous.shape != gray.shape:
+            motion = float("inf")
+        else:
+            motion = float(np.abs(gray - self._previous).mean())
+        self._previous = gray
+        return FrameQuality(brightness=brightness, sharpness=sharpness, motion=motion)
+
+
+class AdaptiveRateScheduler:
+    """
+    스트림의 분석 간격을 min_interval ~ max_interval 사이에서 조절합니다.
+
+    결과가 안정적이면 간격을 growth 배씩 늘리고, 움직임(motion_threshold 초과)이나
+    경계값 결과가 나오면 곧바로 min_interval 로 되돌립니다.
+    """
+
+    def __init__(
+        self,
+        min_interval: float = 1 / 15,
+        max_interval: float = 0.5,
+        growth: float = 1.5,
+        motion_threshold: float = 6.0,
+    ):
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.growth = growth
+        self.motion_threshold = motion_threshold
+        self.interval = min_interval
+        self._last_analysed: Optional[float] = None
+
+    def should_analyse(self, now: float, motion: float) -> bool:
+        if motion > self.motion_threshold:
+            self.interval = self.min_interval
+        if self._last_analysed is None or now - self._last_analysed >= self.interval:
+            self._last_analysed = now
+            return True
+        return False
+
+    def observe(self, stable: bool) -> None:
+        if stable:
+            self.interval = min(self.interval * self.growth, self.max_interval)
+        else:
+            self.interval = self.min_interval
+
+
+class StreamFrameGate:
+    """
+    스트림 하나의 품질 검사와 분석 주기 조절을 담당합니다.
+    admit() 은 프레임을 받는 스레드에서, observe() 는 결과를 받는 스레드에서 호출해도 됩니다.
+    """
+
+    def __init__(
+        self,
+        min_brightness: float = 40.0,
+        max_brightness: float = 230.0,
+        min_sharpness: float = 20.0,
+        stable_angle_deg: float = 3.0,
+        borderline_angle_deg: Optional[float] = None,
+        borderline_margin_deg: float = 5.0,
+        scheduler: Optional[AdaptiveRateScheduler] = None,
+        max_quality_gap: float = 1.0,
+    ):
+        self.min_brightness = min_brightness
+        self.max_brightness = max_brightness
+        self.min_sharpness = min_sharpness
+        self.stable_cos = float(np.cos(np.radians(stable_angle_deg)))
+        # borderline_angle_deg 는 화면 이탈로 판정하는 시선 각도. 이 근처의 결과는 불안정한 것으로 취급합니다.
+        self.borderline_angle_deg = borderline_angle_deg
+        self.borderline_margin_deg = borderline_margin_deg
+        self.quality = FrameQualityCheck()
+        self.scheduler = scheduler or AdaptiveRateScheduler()
+        self.max_quality_gap = max_quality_gap
+        # 품질 검사를 통과하지 못한 프레임이 이어지기 시작한(또는 마지막으로 강제로 보낸) 시각
+        self._quality_skip_since: Optional[float] = None
+        self._previous_gaze: Optional[np.ndarray] = None
+        self._lock = threading.Lock()
+
+    def admit(self, frame: np.ndarray, now: Optional[float] = None) -> str:
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            q = self.quality.measure(frame)
+            if q.brightness < self.min_brightness:
+                verdict = SKIP_DARK
+            elif q.brightness > self.max_brightness:
+                verdict = SKIP_BRIGHT
+            elif q.sharpness < self.min_sharpness:
+                verdict = SKIP_BLUR
+            else:
+                self._quality_skip_since = None
+                return ANALYSE if self.scheduler.should_analyse(now, q.motion) else SKIP_RATE
+            if self._quality_skip_since is None:
+                self._quality_skip_since = now
+            elif now - self._quality_skip_since >= self.max_quality_gap:
+                # 가려진 카메라를 계속 건너뛰면 face_missing 같은 이벤트가 나오지 않으므로 주기적으로 분석합니다.
+                self._quality_skip_since = now
+                return ANALYSE
+            return verdict
+
+    def observe(self, gaze: Optional[np.ndarray], off_axis_angle_deg: Optional[float] = None) -> None:
+        """
+        분석 결과를 반영합니다.
+        gaze 는 (2, 3) 단위 시선 벡터(얼굴을 못 찾았으면 None), off_axis_angle_deg 는 화면 정면 대비 시선 각도입니다.
+        """
+        with self._lock:
+            if gaze is None:
+                self._previous_gaze = None
+                self.scheduler.observe(stable=False)
+                return
+            gaze = np.asarray(gaze, dtype=np.float64)
+            stable = self._previous_gaze is not None and bool(
+                (np.einsum("ij,ij->i", gaze, self._previous_gaze) >= self.stable_cos).all()
+            )
+            if (
+                stable
+                and self.borderline_angle_deg is not None
+                and off_axis_angle_deg is not None
+                and abs(off_axis_angle_deg - self.borderline_angle_deg) <= self.borderline_margin_deg
+            ):
+                stable = False
+            self._previous_gaze = gaze
+            self.scheduler.observe(stable)
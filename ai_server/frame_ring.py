@@ -0,0 +1,111 @@
+"""
+디코딩 프로세스와 FaceMesh 워커 사이에서 프레임을 복사/pickle 없이 넘기기 위한 공유 메모리 링 버퍼.
+
+- 고정 크기 슬롯 slots 개를 multiprocessing.shared_memory 하나에 잡고, 슬롯마다 헤더(seq, height, width, channels)를 둡니다.
+- 쓰는 쪽은 write() 로 다음 슬롯에 프레임을 복사하고 작은 FrameSlot 디스크립터만 큐로 보냅니다.
+- 읽는 쪽은 view() 로 같은 메모리를 np.ndarray 뷰로 받습니다. (복사 없음)
+- 추론이 밀리면 쓰는 쪽은 기다리지 않고 가장 오래된 슬롯을 덮어씁니다. (drop-oldest)
+  읽는 쪽은 seq 를 다시 확인(is_current)해 덮어써진 프레임의 결과를 버립니다.
+"""
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+import numpy as np
+
+_HEADER_FIELDS = 4  # seq, height, width, channels
+_WRITING = -1
+
+
+@dataclass(frozen=True)
+class FrameSlot:
+    """큐로 주고받는 슬롯 디스크립터. 프레임 데이터 대신 이것만 pickle 됩니다."""
+    slot: int
+    seq: int
+    shape: Tuple[int, int, int]
+
+
+class FrameRing:
+    """
+    공유 메모리 프레임 링 버퍼. 쓰는 쪽은 FrameRing.create(), 읽는 쪽은 FrameRing.attach(name) 으로 엽니다.
+    쓰는 쪽은 한 스레드(프로세스)만 사용해야 합니다.
+    """
+
+    def __init__(self, shm: shared_memory.SharedMemory, slots: int, slot_bytes: int, owner: bool):
+        self._shm = shm
+        self.slots = slots
+        self.slot_bytes = slot_bytes
+        self.owner = owner
+        header_bytes = slots * _HEADER_FIELDS * 8
+        self._header = np.ndarray((slots, _HEADER_FIELDS), dtype=np.int64, buffer=shm.buf[:header_bytes])
+        self._data = np.ndarray((slots, slot_bytes), dtype=np.uint8, buffer=shm.buf[header_bytes:])
+        self._next_seq = 0
+
+    @classmethod
+    def create(cls, slots: int, max_frame_shape: Tuple[int, int, int] = (720, 1280, 3),
+               name: Optional[str] = None) -> "FrameRing":
+        slot_bytes = int(np.prod(max_frame_shape))
+        size = slots * _HEADER_FIELDS * 8 + slots * slot_bytes
+        shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        ring = cls(shm, slots, slot_bytes, owner=True)
+        ring._header[:] = 0
+        ring._header[:, 0] = _WRITING
+        return ring
+
+    @classmethod
+    def attach(cls, name: str, slots: int, slot_bytes: int) -> "FrameRing":
+        try:
+            # 만든 쪽이 unlink 하므로 붙는 쪽은 resource tracker 에 등록하지 않습니다. (Python 3.13+)
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        except TypeError:
+            shm = shared_memory.SharedMemory(name=name)
+        return cls(shm, slots, slot_bytes, owner=False)
+
+    @property
+    def name(self) -> str:
+        return self._shm.name
+
+    def fits(self, frame: np.ndarray) -> bool:
+        return frame.dtype == np.uint8 and frame.nbytes <= self.slot_bytes
+
+    def write(self, frame: np.ndarray) -> FrameSlot:
+        """
+        다음 슬롯에 프레임을 복사합니다. 읽는 쪽이 아직 쓰고 있는 슬롯이어도 덮어씁니다. (drop-oldest)
+        """
+        seq = self._next_seq
+        self._next_seq += 1
+        slot = seq % self.slots
+        header = self._header[slot]
+        # 쓰는 동안에는 seq 를 무효값으로 두어 읽는 쪽이 반쯤 쓰인 프레임을 유효하다고 보지 않게 합니다.
+        header[0] = _WRITING
+        height, width = frame.shape[:2]
+        channels = frame.shape[2] if frame.ndim == 3 else 1
+        np.copyto(self._data[slot, :frame.nbytes].reshape(frame.shape), frame)
+        header[1:] = (height, width, channels)
+        header[0] = seq
+        return FrameSlot(slot, seq, (height, width, channels))
+
+    def view(self, desc: FrameSlot) -> Optional[np.ndarray]:
+        """슬롯의 프레임을 읽기 전용 np.ndarray 뷰로 반환합니다. 이미 덮어써졌다면 None."""
+        if not self.is_current(desc):
+            return None
+        height, width, channels = desc.shape
+        frame = self._data[desc.slot, :height * width * channels].reshape(
+            (height, width, channels) if channels > 1 else (height, width)
+        )
+        frame.flags.writeable = False
+        return frame
+
+    def is_current(self, desc: FrameSlot) -> bool:
+        """처리하는 동안 쓰는 쪽이 슬롯을 덮어쓰지 않았는지 확인합니다."""
+        return int(self._header[desc.slot, 0]) == desc.seq
+
+    def close(self) -> None:
+        # 공유 메모리를 닫기 전에 버퍼를 참조하는 뷰를 먼저 놓아야 합니다.
+        self._header = None
+        self._data = None
+        self._shm.close()
+        if self.owner:
+            try:
+                self._shm.unlink()
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,50 @@
+from pathlib import Path
+from typing import Iterator, Optional, Union
+import cv2
+import numpy as np
+
+IMAGE_SUFFIXES = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+def iter_frames(source: Union[str, Path], step: int = 1, limit: Optional[int] = None) -> Iterator[np.ndarray]:
+    """
+    녹화된 영상 파일 또는 이미지 폴더에서 BGR 프레임을 순서대로 꺼냅니다.
+
+    :param source: 영상 파일 경로 또는 이미지가 들어 있는 폴더 경로 (폴더는 파일 이름 순서로 읽습니다.)
+    :param step: step 프레임마다 한 장씩 반환합니다.
+    :param limit: 반환할 최대 프레임 수
+    """
+    source = Path(source)
+    emitted = 0
+    if source.is_dir():
+        paths = sorted(p for p in source.iterdir() if p.suffix.lower() in IMAGE_SUFFIXES)
+        for path in paths[::step]:
+            if limit is not None and emitted >= limit:
+                return
+            frame = cv2.imread(str(path), cv2.IMREAD_COLOR)
+            if frame is None:
+                continue
+            emitted += 1
+            yield frame
+        return
+
+    cap = cv2.VideoCapture(str(source))
+    if not cap.isOpened():
+        raise FileNotFoundError(f"영상을 열 수 없습니다: {source}")
+    index = 0
+    try:
+        while limit is None or emitted < limit:
+            # 건너뛸 프레임은 디코딩하지 않도록 grab 만 합니다.
+            if index % step != 0:
+                if not cap.grab():
+                    break
+                index += 1
+                continue
+            success, frame = cap.read()
+            if not success:
+                break
+            index += 1
+            emitted += 1
+            yield frame
+    finally:
+        cap.release()
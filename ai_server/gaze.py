@@ -0,0 +1,146 @@
+from dataclasses import dataclass
+from typing import Optional
+import cv2
+import numpy as np
+from head_pose import HeadPose, HeadPoseTracker
+
+# refine_landmarks=True 일 때 MediaPipe Face Mesh 가 반환하는 랜드마크 개수
+NUM_LANDMARKS = 478
+
+# 눈 윤곽과 홍채 랜드마크 인덱스
+LEFT_EYE_INDEX = np.array([159, 158, 157, 173, 160, 161, 246, 33, 7, 163, 144, 145, 153, 154, 155, 133], dtype=np.intp)
+RIGHT_EYE_INDEX = np.array([380, 372, 373, 390, 249, 263, 381, 382, 362, 398, 384, 385, 386, 387, 388, 466], dtype=np.intp)
+LEFT_IRIS_INDEX = np.array([470, 471, 468, 469, 472], dtype=np.intp)
+RIGHT_IRIS_INDEX = np.array([475, 473, 476, 474, 477], dtype=np.intp)
+# 눈 너비를 재기 위한 눈꼬리 인덱스 [[왼쪽 바깥, 왼쪽 안쪽], [오른쪽 바깥, 오른쪽 안쪽]]
+EYE_CORNER_INDEX = np.array([[33, 133], [263, 362]], dtype=np.intp)
+
+# 홍채 중심이 눈 너비의 0.25 만큼 벗어나면 약 45도를 보는 것으로 근사합니다.
+IRIS_OFFSET_TO_DEG = 180.0
+
+# 네 그룹을 한 번의 fancy indexing 과 np.add.reduceat 으로 합산하기 위해 이어 붙인 인덱스와 그룹 시작 위치
+_GROUP_INDEX = np.concatenate([LEFT_EYE_INDEX, RIGHT_EYE_INDEX, LEFT_IRIS_INDEX, RIGHT_IRIS_INDEX])
+_GROUP_SIZES = np.array([len(LEFT_EYE_INDEX), len(RIGHT_EYE_INDEX), len(LEFT_IRIS_INDEX), len(RIGHT_IRIS_INDEX)])
+_GROUP_OFFSETS = np.concatenate([[0], np.cumsum(_GROUP_SIZES)[:-1]])
+_GROUP_DIVISOR = _GROUP_SIZES.astype(np.float32)[:, None]
+
+
+@dataclass
+class GazeResult:
+    """
+    한 프레임에 대한 시선 추정 결과.
+
+    centroids 는 (4, 3) 배열로 [왼쪽 눈, 오른쪽 눈, 왼쪽 홍채, 오른쪽 홍채] 순서의 정규화 좌표 평균입니다.
+    gaze 는 (2, 3) 배열로 [왼쪽, 오른쪽] 눈의 단위 시선 벡터입니다.
+    off_axis_deg 는 화면(카메라) 정면에서 벗어난 시선 각도의 근사값입니다.
+    """
+    centroids: np.ndarray
+    gaze: np.ndarray
+    rotation: np.ndarray
+    rvec: np.ndarray
+    tvec: np.ndarray
+    off_axis_deg: float
+
+
+def landmarks_to_array(face_landmarks) -> np.ndarray:
+    """
+    MediaPipe NormalizedLandmarkList 를 (N, 3) float32 배열로 한 번에 변환합니다.
+    이후 모든 계산은 이 배열 위에서 NumPy 연산으로만 이루어집니다.
+    """
+    landmarks = face_landmarks.landmark
+    count = len(landmarks)
+    flat = np.fromiter(
+        (c for lm in landmarks for c in (lm.x, lm.y, lm.z)),
+        dtype=np.float32,
+        count=count * 3,
+    )
+    return flat.reshape(count, 3)
+
+
+def off_axis_angle_deg(points: np.ndarray, centroids: np.ndarray, rotation: np.ndarray) -> float:
+    """
+    시선이 카메라 정면에서 벗어난 각도를 근사합니다.
+
+    머리 각도는 얼굴 모델의 z 축이 카메라 광축과 이루는 각이고, 눈 각도는 홍채 중심이 눈 중심에서
+    벗어난 거리를 눈 너비로 나눈 비율에 IRIS_OFFSET_TO_DEG 를 곱한 값입니다. 두 값을 더한 상한값을 반환합니다.
+    """
+    head_deg = float(np.degrees(np.arccos(np.clip(abs(rotation[2, 2]), 0.0, 1.0))))
+    corners = points[EYE_CORNER_INDEX, :2]
+    eye_width = np.linalg.norm(corners[:, 0] - corners[:, 1], axis=1)
+    iris_offset = np.linalg.norm(centroids[2:, :2] - centroids[:2, :2], axis=1)
+    ratio = np.divide(iris_offset, eye_width, out=np.zeros_like(iris_offset), where=eye_width > 0)
+    return head_deg + float(ratio.mean()) * IRIS_OFFSET_TO_DEG
+
+
+def normalize_rows(v: np.ndarray) -> np.ndarray:
+    """각 행을 단위 벡터로 만듭니다. 길이가 0 인 행은 그대로 둡니다."""
+    norm = np.linalg.norm(v, axis=-1, keepdims=True)
+    return np.divide(v, norm, out=np.array(v, dtype=np.float64), where=norm != 0)
+
+
+class GazeEstimator:
+    """
+    face.py 의 랜드마크별 파이썬 루프를 대체하는 시선 추정기.
+
+    랜드마크 리스트를 한 번만 (478, 3) 배열로 바꾼 뒤, 미리 계산한 인덱스 배열로
+    눈/홍채 중심점을 구하고 solvePnP 로 얻은 머리 회전을 적용해 시선 벡터를 반환합니다.
+    스트림마다 하나씩 만들어 재사용하는 것을 전제로 합니다.
+    tracking=True 이면 HeadPoseTracker 가 직전 프레임의 자세에서 시작해 고정 랜드마크만으로 풉니다.
+    """
+
+    def __init__(
+        self,
+        obj_points_3d: np.ndarray,
+        camera_matrix: np.ndarray,
+        dist_coeffs: Optional[np.ndarray] = None,
+        tracking: bool = False,
+        max_reprojection_error: float = 3.0,
+    ):
+        self.obj_points_3d = np.ascontiguousarray(obj_points_3d[:NUM_LANDMARKS], dtype=np.float32)
+        self.camera_matrix = np.asarray(camera_matrix, dtype=np.float64)
+        self.dist_coeffs = np.zeros((1, 5)) if dist_coeffs is None else np.asarray(dist_coeffs, dtype=np.float64)
+        self.pose_tracker = HeadPoseTracker(
+            self.obj_points_3d, self.camera_matrix, self.dist_coeffs,
+            max_reprojection_error=max_reprojection_error, tracking=tracking,
+        )
+        # solvePnP 입력으로 재사용할 2D 좌표 버퍼
+        self._img_points = np.empty((NUM_LANDMARKS, 2), dtype=np.float32)
+
+    @staticmethod
+    def centroids(points: np.ndarray) -> np.ndarray:
+        """[왼쪽 눈, 오른쪽 눈, 왼쪽 홍채, 오른쪽 홍채] 중심점을 (4, 3) 배열로 반환합니다."""
+        return np.add.reduceat(points[_GROUP_INDEX], _GROUP_OFFSETS, axis=0) / _GROUP_DIVISOR
+
+    def image_points(self, points: np.ndarray, image_width: int, image_height: int) -> np.ndarray:
+        """정규화 좌표를 픽셀 좌표로 바꿔 내부 버퍼에 채운 뒤 반환합니다."""
+        np.multiply(points[:NUM_LANDMARKS, :2], (image_width, image_height), out=self._img_points)
+        return self._img_points
+
+    def head_pose(self, img_points: np.ndarray) -> HeadPose:
+        return self.pose_tracker.solve(img_points)
+
+    def reset(self) -> None:
+        """얼굴을 놓쳤을 때 호출합니다. 다음 프레임의 머리 자세는 처음부터 다시 풉니다."""
+        self.pose_tracker.reset()
+
+    def estimate_from_array(self, points: np.ndarray, image_width: int, image_height: int) -> Optional[GazeResult]:
+        centroids = self.centroids(points)
+        # 홍채 중심 - 눈 중심 = 얼굴 좌표계에서의 눈 방향
+        eye_direction_local = centroids[2:] - centroids[:2]
+
+        pose = self.head_pose(self.image_points(points, image_width, image_height))
+        if not pose.ok:
+            return None
+        rotation, _ = cv2.Rodrigues(pose.rvec)
+        gaze = normalize_rows(eye_direction_local @ rotation)
+        return GazeResult(
+            centroids=centroids, gaze=gaze, rotation=rotation, rvec=pose.rvec, tvec=pose.tvec,
+            off_axis_deg=off_axis_angle_deg(points, centroids, rotation),
+        )
+
+    def estimate(self, face_landmarks, image_width: int, image_height: int) -> Optional[GazeResult]:
+        """
+        MediaPipe 의 face_landmarks 하나로부터 시선 벡터를 계산합니다.
+        solvePnP 가 실패하면 None 을 반환합니다.
+        """
+        return self.estimate_from_array(landmarks_to_array(face_landmarks), image_width, image_height)
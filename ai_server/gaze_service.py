@@ -0,0 +1,563 @@
+"""
+여러 응시자의 프레임을 동시에 받아 FaceMesh 워커 프로세스 풀에 분배하는 시선 추론 서비스.
+
+- 스트림은 처음 들어올 때 담당 스트림이 가장 적은 워커에 배정되고, 이후에는 항상 같은 워커로 갑니다.
+  워커는 스트림마다 FaceMesh 인스턴스를 따로 들고 있어서 프레임 간 tracking 상태가 유지됩니다.
+- FairFrameScheduler 는 스트림별로 짧은 대기열만 두고(가장 오래된 프레임부터 버림),
+  라운드 로빈으로 한 번에 한 프레임씩 꺼내므로 프레임을 많이 보내는 스트림이 다른 스트림을 굶기지 못합니다.
+- 스트림마다 StreamFrameGate 를 두어 어둡거나 흐린 프레임, 그리고 결과가 안정적인 동안의 잉여 프레임은
+  워커로 보내기 전에 건너뜁니다.
+- 프레임 데이터는 워커마다 하나씩 둔 공유 메모리 FrameRing 으로 넘기고, 큐에는 슬롯 디스크립터만 보냅니다.
+  슬롯이 덮어써져 분석하지 못한 프레임은 버린 것으로 셉니다.
+- FaceMesh 는 주 응시자 한 명만 추적하고, 두 번째 사람 검출은 FaceCounter 가 다운스케일한 프레임으로
+  face_count_interval 초마다 한 번씩만 수행합니다. (결과의 face_count, 샘플링하지 않은 프레임은 None)
+- 워커별 대기열 깊이, 처리 중인 프레임 수, 처리량은 GazeWorkerPool.stats() 로 확인할 수 있습니다.
+  워커는 결과에 단계별 처리 시간(timings)을 담아 보내고, 수집 스레드가 metrics.py 의 메트릭으로 옮깁니다.
+- 프레임 하나를 처리하다 예외가 나면 워커는 error 결과를 보내고 그 스트림의 상태만 버립니다.
+  워커 프로세스가 죽으면 수집 스레드가 확인해 새로 띄우고, 죽은 워커가 가져간 프레임은 버린 것으로 셉니다.
+"""
+import multiprocessing as mp
+import queue
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field, asdict, replace
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+import numpy as np
+from frame_gate import StreamFrameGate, ANALYSE
+from frame_ring import FrameRing, FrameSlot
+from metrics import (
+    FRAMES_RECEIVED, FRAMES_SKIPPED, FRAMES_DROPPED, FRAMES_PROCESSED, STAGE_LATENCY, FRAME_LAG, STREAM_LAG, debug_log,
+)
+
+# submit() 결과
+QUEUED = "queued"
+DROPPED_OLDER = "dropped_older"
+
+# 워커로 보내는 메시지 종류
+_FRAME = "frame"
+_CLOSE_STREAM = "close_stream"
+_STOP = "stop"
+
+
+@dataclass
+class FrameTask:
+    stream_id: str
+    seq: int
+    timestamp: float
+    frame: Optional[np.ndarray]
+    intrinsics_key: Optional[str] = None
+    # 공유 메모리로 넘긴 경우 frame 은 None 이고 slot 으로 읽습니다.
+    slot: Optional[FrameSlot] = None
+
+
+class FairFrameScheduler:
+    """
+    스트림별 대기열을 라운드 로빈으로 순회하는 스케줄러.
+
+    스트림마다 최대 max_pending 개의 프레임만 보관하고, 넘치면 가장 오래된 프레임을 버립니다.
+    실시간 감독에서는 밀린 프레임보다 최신 프레임이 중요하기 때문입니다.
+    """
+
+    def __init__(self, max_pending: int = 2):
+        self.max_pending = max_pending
+        self._pending: Dict[str, Deque[FrameTask]] = {}
+        self._ready: Deque[str] = deque()
+        self.dropped: Dict[str, int] = {}
+
+    def push(self, task: FrameTask) -> bool:
+        """프레임을 넣습니다. 오래된 프레임을 버렸다면 False 를 반환합니다."""
+        pending = self._pending.get(task.stream_id)
+        if pending is None:
+            pending = self._pending[task.stream_id] = deque()
+        if not pending:
+            self._ready.append(task.stream_id)
+        kept = True
+        if len(pending) >= self.max_pending:
+            pending.popleft()
+            self.dropped[task.stream_id] = self.dropped.get(task.stream_id, 0) + 1
+            kept = False
+        pending.append(task)
+        return kept
+
+    def pending_count(self, stream_id: str) -> int:
+        pending = self._pending.get(stream_id)
+        return len(pending) if pending else 0
+
+    def remove_stream(self, stream_id: str) -> None:
+        self._pending.pop(stream_id, None)
+        self.dropped.pop(stream_id, None)
+        try:
+            self._ready.remove(stream_id)
+        except ValueError:
+            pass
+
+    def drain(self, can_dispatch: Callable[[str], bool]) -> Iterator[FrameTask]:
+        """
+        준비된 스트림을 한 바퀴 돌며 스트림당 최대 한 프레임씩 꺼냅니다.
+        can_dispatch 가 False 인 스트림(담당 워커가 바쁜 경우)은 건너뛰고 다음 바퀴로 미룹니다.
+        """
+        for _ in range(len(self._ready)):
+            stream_id = self._ready.popleft()
+            pending = self._pending.get(stream_id)
+            if not pending:
+                continue
+            if not can_dispatch(stream_id):
+                self._ready.append(stream_id)
+                continue
+            task = pending.popleft()
+            if pending:
+                self._ready.append(stream_id)
+            yield task
+
+
+@dataclass
+class WorkerStats:
+    worker_id: int
+    streams: int = 0
+    queue_depth: int = 0
+    in_flight: int = 0
+    processed: int = 0
+    dropped: int = 0
+    skipped: int = 0
+    started_at: float = field(default_factory=time.monotonic)
+
+    def as_dict(self) -> dict:
+        data = asdict(self)
+        elapsed = max(time.monotonic() - self.started_at, 1e-9)
+        data["throughput_fps"] = self.processed / elapsed
+        data.pop("started_at")
+        return data
+
+
+def _drop_stream_state(stream_id: str, face_meshes: dict, estimators: dict, estimator_sizes: dict, face_counters: dict) -> None:
+    mesh = face_meshes.pop(stream_id, None)
+    if mesh is not None:
+        try:
+            mesh.close()
+        except Exception:
+            pass
+    estimators.pop(stream_id, None)
+    estimator_sizes.pop(stream_id, None)
+    counter = face_counters.pop(stream_id, None)
+    if counter is not None:
+        try:
+            counter.close()
+        except Exception:
+            pass
+
+
+def _worker_main(
+    worker_id: int,
+    task_queue: mp.Queue,
+    result_queue: mp.Queue,
+    tracking: bool,
+    ring_spec: Optional[Tuple[str, int, int]] = None,
+    face_count_interval: Optional[float] = None,
+) -> None:
+    """워커 프로세스 본체. 스트림별 FaceMesh 를 지연 생성하고 시선 추정 결과를 돌려보냅니다."""
+    import cv2
+    import mediapipe as mp_solutions
+    from face_count import FaceCounter
+    from gaze import GazeEstimator
+    from intrinsics import IntrinsicsCache
+    from util import get_canonical_face_model_obj
+
+    # 정규 얼굴 모델은 memory-map 으로 열어 모든 워커가 같은 읽기 전용 페이지를 공유합니다.
+    obj_points_3d = get_canonical_face_model_obj()
+    if obj_points_3d is None:
+        raise RuntimeError("정규 얼굴 모델을 로드할 수 없습니다.")
+    intrinsics_cache = IntrinsicsCache()
+    face_meshes: Dict[str, object] = {}
+    # 머리 자세 추적 상태와 카메라 내부 파라미터도 스트림마다 따로 유지합니다.
+    estimators: Dict[str, GazeEstimator] = {}
+    estimator_sizes: Dict[str, Tuple[int, int]] = {}
+    face_counters: Dict[str, FaceCounter] = {}
+    ring = FrameRing.attach(*ring_spec) if ring_spec else None
+
+    while True:
+        message = task_queue.get()
+        kind = message[0]
+        if kind == _STOP:
+            break
+        if kind == _CLOSE_STREAM:
+            _drop_stream_state(message[1], face_meshes, estimators, estimator_sizes, face_counters)
+            continue
+
+        _, task = message
+        try:
+            mesh = face_meshes.get(task.stream_id)
+            if mesh is None:
+                mesh = face_meshes[task.stream_id] = mp_solutions.solutions.face_mesh.FaceMesh(
+                    max_num_faces=1,
+                    refine_landmarks=True,
+                    min_detection_confidence=0.5,
+                    min_tracking_confidence=0.5,
+                )
+
+            started = time.perf_counter()
+            frame = task.frame if task.slot is None else ring.view(task.slot)
+            image_rgb = None
+            if frame is not None:
+                image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+                # cvtColor 가 복사본을 만들므로 그 뒤에 슬롯이 덮어써지지 않았는지만 확인하면 됩니다.
+                if task.slot is not None and not ring.is_current(task.slot):
+                    image_rgb = None
+            if image_rgb is None:
+                result_queue.put({
+                    "worker_id": worker_id, "stream_id": task.stream_id, "seq": task.seq,
+                    "timestamp": task.timestamp, "stale": True,
+                })
+                continue
+            image_height, image_width, _ = image_rgb.shape
+            if estimator_sizes.get(task.stream_id) != (image_width, image_height):
+                # 처음 보는 스트림이거나 해상도가 바뀌면 해당 기기의 내부 파라미터로 추정기를 새로 만듭니다.
+                intrinsics = intrinsics_cache.load(task.intrinsics_key, (image_width, image_height))
+                estimators[task.stream_id] = GazeEstimator(
+                    obj_points_3d, intrinsics.camera_matrix, intrinsics.dist_coeffs, tracking=tracking,
+                )
+                estimator_sizes[task.stream_id] = (image_width, image_height)
+            estimator = estimators[task.stream_id]
+            t0 = time.perf_counter()
+            results = mesh.process(image_rgb)
+            t1 = time.perf_counter()
+            timings = {"cvt_color": t0 - started, "face_mesh": t1 - t0}
+            face_count = None
+            if face_count_interval is not None:
+                counter = face_counters.get(task.stream_id)
+                if counter is None:
+                    counter = face_counters[task.stream_id] = FaceCounter(interval=face_count_interval)
+                face_count = counter.sample(image_rgb, task.timestamp)
+                if face_count is not None:
+                    t2 = time.perf_counter()
+                    timings["face_count"] = t2 - t1
+                    t1 = t2
+            gaze, off_axis_deg = None, None
+            if results.multi_face_landmarks:
+                gaze_result = estimator.estimate(results.multi_face_landmarks[0], image_width, image_height)
+                timings["pnp"] = time.perf_counter() - t1
+                if gaze_result is not None:
+                    gaze = gaze_result.gaze.tolist()
+                    off_axis_deg = gaze_result.off_axis_deg
+            else:
+                estimator.reset()
+            result_queue.put({
+                "worker_id": worker_id,
+                "stream_id": task.stream_id,
+                "seq": task.seq,
+                "timestamp": task.timestamp,
+                "face_detected": bool(results.multi_face_landmarks),
+                "gaze": gaze,
+                "off_axis_deg": off_axis_deg,
+                "face_count": face_count,
+                "latency": time.perf_counter() - started,
+                "timings": timings,
+            })
+        except Exception as e:
+            # 한 프레임의 실패로 워커가 죽으면 담당 스트림이 모두 멈추므로, 오류 결과를 보내 in_flight 를 돌려주고
+            # 해당 스트림의 상태는 버려 다음 프레임에서 새로 만듭니다.
+            _drop_stream_state(task.stream_id, face_meshes, estimators, estimator_sizes, face_counters)
+            result_queue.put({
+                "worker_id": worker_id, "stream_id": task.stream_id, "seq": task.seq,
+                "timestamp": task.timestamp, "error": repr(e),
+            })
+
+    for mesh in face_meshes.values():
+        mesh.close()
+    for counter in face_counters.values():
+        counter.close()
+    if ring is not None:
+        ring.close()
+
+
+class GazeWorkerPool:
+    """
+    FaceMesh 워커 프로세스 풀과 공정 스케줄러를 묶은 서비스 객체.
+
+    submit() 으로 BGR 프레임을 넣으면 디스패처 스레드가 담당 워커로 보내고,
+    결과는 on_result 콜백(없으면 latest_result)으로 받을 수 있습니다.
+    """
+
+    def __init__(
+        self,
+        num_workers: Optional[int] = None,
+        max_pending_per_stream: int = 2,
+        max_in_flight_per_worker: int = 4,
+        tracking: bool = True,
+        gate_factory: Optional[Callable[[], StreamFrameGate]] = StreamFrameGate,
+        on_result: Optional[Callable[[dict], None]] = None,
+        max_frame_shape: Optional[Tuple[int, int, int]] = (720, 1280, 3),
+        face_count_interval: Optional[float] = 0.5,
+        respawn_backoff: float = 5.0,
+    ):
+        self.num_workers = num_workers or max(mp.cpu_count() - 1, 1)
+        self.max_in_flight_per_worker = max_in_flight_per_worker
+        self.on_result = on_result
+        # None 이면 모든 프레임을 분석합니다.
+        self.gate_factory = gate_factory
+
+        self.tracking = tracking
+        self.face_count_interval = face_count_interval
+        self.respawn_backoff = respawn_backoff
+
+        # FaceMesh 는 fork 이후 안전하지 않으므로 spawn 으로 워커를 만듭니다.
+        self._ctx = mp.get_context("spawn")
+        self._result_queue: mp.Queue = self._ctx.Queue()
+        self._task_queues: List[mp.Queue] = []
+        self._processes: List[mp.Process] = []
+        self._respawned_at: List[float] = [0.0] * self.num_workers
+        # 워커를 다시 띄우면서 더 쓰지 않는 작업 큐. 디스패처가 보내던 묶음을 다 보낸 뒤에 닫습니다.
+        self._retired_queues: List[mp.Queue] = []
+        # 처리 중인 프레임 수가 max_in_flight_per_worker 로 제한되므로 슬롯을 두 배로 잡으면 평소에는 덮어쓰지 않습니다.
+        # max_frame_shape 가 None 이거나 슬롯보다 큰 프레임은 기존처럼 큐로 pickle 해서 보냅니다.
+        self._rings: List[Optional[FrameRing]] = []
+        for worker_id in range(self.num_workers):
+            self._rings.append(FrameRing.create(max_in_flight_per_worker * 2, max_frame_shape) if max_frame_shape else None)
+            task_queue, process = self._start_worker(worker_id)
+            self._task_queues.append(task_queue)
+            self._processes.append(process)
+
+        self._lock = threading.Condition()
+        self._scheduler = FairFrameScheduler(max_pending=max_pending_per_stream)
+        self._assignment: Dict[str, int] = {}
+        self._seq: Dict[str, int] = {}
+        self._latest: Dict[str, dict] = {}
+        self._gates: Dict[str, StreamFrameGate] = {}
+        self._intrinsics_keys: Dict[str, str] = {}
+        self._stats = [WorkerStats(worker_id=i) for i in range(self.num_workers)]
+        self._running = True
+
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name="gaze-dispatcher", daemon=True)
+        self._collector = threading.Thread(target=self._collect_loop, name="gaze-collector", daemon=True)
+        self._dispatcher.start()
+        self._collector.start()
+
+    def _start_worker(self, worker_id: int) -> Tuple[mp.Queue, mp.Process]:
+        task_queue = self._ctx.Queue()
+        ring = self._rings[worker_id]
+        ring_spec = (ring.name, ring.slots, ring.slot_bytes) if ring else None
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, task_queue, self._result_queue, self.tracking, ring_spec, self.face_count_interval),
+            name=f"gaze-worker-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        return task_queue, process
+
+    def _check_workers(self) -> None:
+        """
+        죽은 워커를 새 프로세스와 새 작업 큐로 바꿉니다. 죽은 워커가 가져간 프레임의 결과는 오지 않으므로
+        in_flight 를 0 으로 돌려 담당 스트림이 멈추지 않게 합니다. 시작하자마자 죽는 워커가 계속 다시 뜨지 않도록
+        워커마다 respawn_backoff 초에 한 번만 다시 띄웁니다. 담당 스트림의 FaceMesh/추적 상태는 처음부터 다시 만듭니다.
+        """
+        now = time.monotonic()
+        with self._lock:
+            if not self._running:
+                return
+            for worker_id, process in enumerate(self._processes):
+                if process.is_alive() or now - self._respawned_at[worker_id] < self.respawn_backoff:
+                    continue
+                print(f"gaze worker {worker_id} exited (exitcode={process.exitcode}), respawning")
+                old_queue = self._task_queues[worker_id]
+                self._task_queues[worker_id], self._processes[worker_id] = self._start_worker(worker_id)
+                self._respawned_at[worker_id] = now
+                stats = self._stats[worker_id]
+                FRAMES_DROPPED.labels("worker_died").inc(stats.in_flight)
+                stats.dropped += stats.in_flight
+                stats.in_flight = 0
+                # 디스패처가 락 밖에서 아직 이 큐로 보내는 중일 수 있으므로 여기서 닫지 않고 디스패처에 맡깁니다.
+                self._retired_queues.append(old_queue)
+                self._lock.notify()
+
+    def _assign(self, stream_id: str) -> int:
+        worker_id = self._assignment.get(stream_id)
+        if worker_id is None:
+            worker_id = min(range(self.num_workers), key=lambda w: self._stats[w].streams)
+            self._assignment[stream_id] = worker_id
+            self._stats[worker_id].streams += 1
+        return worker_id
+
+    def set_intrinsics_key(self, stream_id: str, key: Optional[str]) -> None:
+        """
+        스트림이 사용할 카메라 내부 파라미터 key(기기 id 또는 응시자 id)를 지정합니다.
+        지정하지 않았거나 캐시에 없는 key 는 이미지 크기로부터 만든 기본값을 사용합니다.
+        """
+        with self._lock:
+            if key is None:
+                self._intrinsics_keys.pop(stream_id, None)
+            else:
+                self._intrinsics_keys[stream_id] = key
+
+    def submit(self, stream_id: str, frame: np.ndarray, timestamp: Optional[float] = None) -> str:
+        """
+        스트림의 BGR 프레임을 넣습니다.
+
+        :return: QUEUED, 대기열이 가득 차 가장 오래된 프레임을 버렸다면 DROPPED_OLDER,
+                 게이트에서 걸러졌다면 frame_gate 의 SKIP_* 값
+        """
+        with self._lock:
+            worker_id = self._assign(stream_id)
+            gate = self._gates.get(stream_id)
+            if gate is None and self.gate_factory is not None:
+                gate = self._gates[stream_id] = self.gate_factory()
+        if gate is not None:
+            # 품질 검사는 NumPy 연산이므로 전체 락 밖에서 수행합니다. (게이트는 자체 락을 가집니다.)
+            verdict = gate.admit(frame)
+            if verdict != ANALYSE:
+                with self._lock:
+                    self._stats[worker_id].skipped += 1
+                FRAMES_RECEIVED.inc()
+                FRAMES_SKIPPED.labels(verdict).inc()
+                return verdict
+
+        with self._lock:
+            # 게이트 검사 중에 스트림이 닫혔을 수 있으므로 다시 배정합니다.
+            worker_id = self._assign(stream_id)
+            seq = self._seq.get(stream_id, 0)
+            self._seq[stream_id] = seq + 1
+            kept = self._scheduler.push(FrameTask(
+                stream_id, seq, timestamp or time.time(), frame, self._intrinsics_keys.get(stream_id)
+            ))
+            stats = self._stats[worker_id]
+            if kept:
+                stats.queue_depth += 1
+            else:
+                stats.dropped += 1
+            self._lock.notify()
+        FRAMES_RECEIVED.inc()
+        if not kept:
+            FRAMES_DROPPED.labels("queue").inc()
+        return QUEUED if kept else DROPPED_OLDER
+
+    def close_stream(self, stream_id: str) -> None:
+        with self._lock:
+            worker_id = self._assignment.pop(stream_id, None)
+            if worker_id is None:
+                return
+            stats = self._stats[worker_id]
+            stats.streams -= 1
+            stats.queue_depth -= self._scheduler.pending_count(stream_id)
+            self._scheduler.remove_stream(stream_id)
+            self._seq.pop(stream_id, None)
+            self._latest.pop(stream_id, None)
+            self._gates.pop(stream_id, None)
+            self._intrinsics_keys.pop(stream_id, None)
+        STREAM_LAG.remove(stream_id)
+        try:
+            self._task_queues[worker_id].put((_CLOSE_STREAM, stream_id))
+        except (ValueError, OSError):
+            # 워커가 다시 뜨는 중이면 새 워커에는 이 스트림 상태가 없으므로 알리지 않아도 됩니다.
+            pass
+
+    def latest_result(self, stream_id: str) -> Optional[dict]:
+        with self._lock:
+            return self._latest.get(stream_id)
+
+    def stats(self) -> List[dict]:
+        with self._lock:
+            return [s.as_dict() for s in self._stats]
+
+    def _can_dispatch(self, stream_id: str) -> bool:
+        return self._stats[self._assignment[stream_id]].in_flight < self.max_in_flight_per_worker
+
+    def _dispatch_loop(self) -> None:
+        while True:
+            sent: List[Tuple[int, FrameTask]] = []
+            with self._lock:
+                # 이전 묶음을 다 보낸 뒤이므로 이 스레드는 더 이상 옛 큐를 들고 있지 않습니다.
+                retired, self._retired_queues = self._retired_queues, []
+                while self._running and not sent:
+                    for task in self._scheduler.drain(self._can_dispatch):
+                        worker_id = self._assignment[task.stream_id]
+                        stats = self._stats[worker_id]
+                        stats.queue_depth -= 1
+                        stats.in_flight += 1
+                        sent.append((worker_id, task))
+                    if not sent:
+                        self._lock.wait(timeout=0.5)
+                if not self._running:
+                    return
+            for old_queue in retired:
+                old_queue.cancel_join_thread()
+                old_queue.close()
+            # 공유 메모리 복사와 큐 전송은 락 밖에서 수행해 submit() 을 막지 않습니다.
+            # 링에 쓰는 쪽은 이 디스패처 스레드 하나뿐입니다.
+            for worker_id, task in sent:
+                ring = self._rings[worker_id]
+                if ring is not None and ring.fits(task.frame):
+                    task = replace(task, frame=None, slot=ring.write(task.frame))
+                # 보내기 직전에 현재 큐를 다시 읽습니다. 그 사이 워커가 다시 떴다면 새 워커로 갑니다.
+                try:
+                    self._task_queues[worker_id].put((_FRAME, task))
+                except (ValueError, OSError):
+                    # 큐가 닫혔다면(종료 중 등) 이 프레임은 버리고 in_flight 를 돌려줍니다.
+                    with self._lock:
+                        stats = self._stats[worker_id]
+                        stats.in_flight = max(stats.in_flight - 1, 0)
+                        stats.dropped += 1
+                        self._lock.notify()
+                    FRAMES_DROPPED.labels("worker_queue_closed").inc()
+
+    def _collect_loop(self) -> None:
+        next_check = time.monotonic() + 1.0
+        while self._running:
+            if time.monotonic() >= next_check:
+                self._check_workers()
+                next_check = time.monotonic() + 1.0
+            try:
+                result = self._result_queue.get(timeout=0.5)
+            except queue.Empty:
+                continue
+            with self._lock:
+                stats = self._stats[result["worker_id"]]
+                # 재시작으로 0 이 된 뒤 옛 워커가 남긴 결과가 늦게 올 수 있습니다.
+                stats.in_flight = max(stats.in_flight - 1, 0)
+                self._lock.notify()
+                if result.get("stale") or result.get("error"):
+                    stats.dropped += 1
+                    if result.get("error"):
+                        FRAMES_DROPPED.labels("error").inc()
+                        print(f"gaze worker {result['worker_id']} failed on {result['stream_id']}#{result['seq']}: {result['error']}")
+                    else:
+                        FRAMES_DROPPED.labels("stale").inc()
+                    continue
+                stats.processed += 1
+                open_stream = result["stream_id"] in self._assignment
+                if open_stream:
+                    self._latest[result["stream_id"]] = result
+                gate = self._gates.get(result["stream_id"])
+            self._record_metrics(result, open_stream)
+            if gate is not None:
+                gate.observe(result["gaze"], result["off_axis_deg"])
+            if self.on_result is not None:
+                self.on_result(result)
+
+    @staticmethod
+    def _record_metrics(result: dict, open_stream: bool) -> None:
+        FRAMES_PROCESSED.labels(str(result["face_detected"]).lower()).inc()
+        for stage, seconds in result["timings"].items():
+            STAGE_LATENCY.labels(stage).observe(seconds)
+        # timestamp 는 submit() 에 넘긴 수신 시각(time.time())입니다.
+        lag = time.time() - result["timestamp"]
+        FRAME_LAG.observe(lag)
+        if open_stream:
+            STREAM_LAG.labels(result["stream_id"]).set(lag)
+        debug_log.log("gaze_result", stream_id=result["stream_id"], seq=result["seq"], lag=lag,
+                      timings=result["timings"], off_axis_deg=result["off_axis_deg"], face_count=result["face_count"])
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            self._running = False
+            self._lock.notify_all()
+        for task_queue in self._task_queues:
+            task_queue.put((_STOP,))
+        for process in self._processes:
+            process.join(timeout=timeout)
+            if process.is_alive():
+                process.terminate()
+        self._dispatcher.join(timeout=timeout)
+        self._collector.join(timeout=timeout)
+        for ring in self._rings:
+            if ring is not None:
+                ring.close()
@@ -0,0 +1,97 @@
+from dataclasses import dataclass
+from typing import Optional
+import cv2
+import numpy as np
+
+# 표정에 따라 거의 움직이지 않는 랜드마크 (이마, 미간, 콧등, 코끝, 눈꼬리, 광대, 턱 끝)
+RIGID_LANDMARK_INDEX = np.array(
+    [10, 151, 9, 168, 6, 197, 195, 4, 1, 33, 133, 263, 362, 234, 454, 127, 356, 152, 199],
+    dtype=np.intp,
+)
+
+
+@dataclass
+class HeadPose:
+    ok: bool
+    rvec: np.ndarray
+    tvec: np.ndarray
+    reprojection_error: float  # 사용한 랜드마크들의 평균 재투영 오차 (px)
+    full_solve: bool  # 전체 랜드마크로 처음부터 다시 풀었는지 여부
+
+
+class HeadPoseTracker:
+    """
+    스트림 하나의 머리 자세를 프레임 간에 추적하는 solvePnP 래퍼.
+
+    직전 프레임의 rvec/tvec 을 초기값(useExtrinsicGuess)으로 넘겨 고정 랜드마크 일부만으로 풀고,
+    재투영 오차가 max_reprojection_error 를 넘거나 실패하면 전체 랜드마크로 처음부터 다시 풉니다.
+    tracking=False 이면 매 프레임 전체 랜드마크로 푸는 기존 동작과 같습니다.
+    """
+
+    def __init__(
+        self,
+        obj_points_3d: np.ndarray,
+        camera_matrix: np.ndarray,
+        dist_coeffs: Optional[np.ndarray] = None,
+        rigid_index: np.ndarray = RIGID_LANDMARK_INDEX,
+        max_reprojection_error: float = 3.0,
+        tracking: bool = True,
+    ):
+        self.obj_points_3d = np.ascontiguousarray(obj_points_3d, dtype=np.float32)
+        self.camera_matrix = np.asarray(camera_matrix, dtype=np.float64)
+        self.dist_coeffs = np.zeros((1, 5)) if dist_coeffs is None else np.asarray(dist_coeffs, dtype=np.float64)
+        self.rigid_index = np.asarray(rigid_index, dtype=np.intp)
+        self.rigid_obj_points = np.ascontiguousarray(self.obj_points_3d[self.rigid_index])
+        self.max_reprojection_error = max_reprojection_error
+        self.tracking = tracking
+        self._rvec: Optional[np.ndarray] = None
+        self._tvec: Optional[np.ndarray] = None
+
+    def reset(self) -> None:
+        """얼굴을 놓쳤을 때 호출해 다음 프레임은 전체 랜드마크로 풀도록 합니다."""
+        self._rvec = None
+        self._tvec = None
+
+    def _reprojection_error(self, obj_points: np.ndarray, img_points: np.ndarray, rvec, tvec) -> float:
+        projected, _ = cv2.projectPoints(obj_points, rvec, tvec, self.camera_matrix, self.dist_coeffs)
+        return float(np.linalg.norm(projected.reshape(-1, 2) - img_points, axis=1).mean())
+
+    def _full_solve(self, img_points: np.ndarray) -> HeadPose:
+        ok, rvec, tvec = cv2.solvePnP(
+            objectPoints=self.obj_points_3d,
+            imagePoints=img_points,
+            cameraMatrix=self.camera_matrix,
+            distCoeffs=self.dist_coeffs,
+            flags=cv2.SOLVEPNP_ITERATIVE,
+        )
+        if not ok:
+            self.reset()
+            return HeadPose(False, rvec, tvec, float("inf"), True)
+        self._rvec, self._tvec = rvec, tvec
+        # 추적 모드와 같은 기준으로 비교할 수 있도록 고정 랜드마크에 대한 오차를 기록합니다.
+        error = self._reprojection_error(self.rigid_obj_points, img_points[self.rigid_index], rvec, tvec)
+        return HeadPose(True, rvec, tvec, error, True)
+
+    def solve(self, img_points: np.ndarray) -> HeadPose:
+        """img_points 는 전체 랜드마크의 (N, 2) 픽셀 좌표입니다."""
+        if not self.tracking or self._rvec is None:
+            return self._full_solve(img_points)
+
+        rigid_img_points = np.ascontiguousarray(img_points[self.rigid_index])
+        # solvePnP 는 초기값 배열을 결과로 덮어쓰므로 직전 값을 복사해서 넘깁니다.
+        ok, rvec, tvec = cv2.solvePnP(
+            objectPoints=self.rigid_obj_points,
+            imagePoints=rigid_img_points,
+            cameraMatrix=self.camera_matrix,
+            distCoeffs=self.dist_coeffs,
+            rvec=self._rvec.copy(),
+            tvec=self._tvec.copy(),
+            useExtrinsicGuess=True,
+            flags=cv2.SOLVEPNP_ITERATIVE,
+        )
+        if ok:
+            error = self._reprojection_error(self.rigid_obj_points, rigid_img_points, rvec, tvec)
+            if error <= self.max_reprojection_error:
+                self._rvec, self._tvec = rvec, tvec
+                return HeadPose(True, rvec, tvec, error, False)
+        return self._full_solve(img_points)
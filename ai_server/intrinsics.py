@@ -0,0 +1,120 @@
+"""
+기기(또는 응시자)별 카메라 내부 파라미터 캐시.
+
+calibration_batch.py 가 계산한 camera_matrix / dist_coeffs 를 INTRINSICS_DIR/<key>.json 으로 저장하고,
+런타임 파이프라인은 load() 로 읽습니다. 한 번도 캘리브레이션하지 않은 기기는 이미지 크기로부터
+해석적으로 만든 값(fx = fy = 이미지 너비, 주점 = 이미지 중앙, 왜곡 없음)을 사용합니다.
+"""
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Literal, Optional, Tuple
+import numpy as np
+from util import DATA_DIR
+
+INTRINSICS_DIR = DATA_DIR / "intrinsics"
+
+
+@dataclass
+class CameraIntrinsics:
+    camera_matrix: np.ndarray
+    dist_coeffs: np.ndarray
+    image_size: Tuple[int, int]  # (width, height)
+    source: Literal["calibrated", "analytic"]
+    rms: Optional[float] = None
+
+    def scaled_to(self, image_size: Tuple[int, int]) -> "CameraIntrinsics":
+        """다른 해상도로 들어온 프레임에 맞게 초점 거리와 주점을 비례해서 바꿉니다."""
+        if tuple(image_size) == tuple(self.image_size):
+            return self
+        sx = image_size[0] / self.image_size[0]
+        sy = image_size[1] / self.image_size[1]
+        camera_matrix = self.camera_matrix.copy()
+        camera_matrix[0, :] *= sx
+        camera_matrix[1, :] *= sy
+        return CameraIntrinsics(camera_matrix, self.dist_coeffs, tuple(image_size), self.source, self.rms)
+
+
+def analytic_intrinsics(image_size: Tuple[int, int]) -> CameraIntrinsics:
+    """calibration.py 의 초기 추정값과 같은 방식으로 이미지 크기만으로 내부 파라미터를 만듭니다."""
+    width, height = image_size
+    camera_matrix = np.array([[width, 0, width / 2],
+                              [0, width, height / 2],
+                              [0, 0, 1]], dtype=np.float64)
+    return CameraIntrinsics(camera_matrix, np.zeros((1, 5)), (width, height), "analytic")
+
+
+class IntrinsicsCache:
+    """
+    key(기기 id 또는 응시자 id)별 내부 파라미터를 파일로 저장하고, 읽은 값은 메모리에 보관합니다.
+    파일이 없었던 key 는 miss_ttl 초 동안만 기억해, 그 뒤에 다른 프로세스가 캘리브레이션한 값도 읽어 오도록 합니다.
+    """
+
+    def __init__(self, root: Path = INTRINSICS_DIR, miss_ttl: float = 30.0):
+        self.root = Path(root)
+        self.miss_ttl = miss_ttl
+        self._memory: Dict[str, CameraIntrinsics] = {}
+        # key -> 다시 파일을 확인할 시각 (time.monotonic)
+        self._misses: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        safe = re.sub(r"[^0-9A-Za-z._-]", "_", key)
+        return self.root / f"{safe}.json"
+
+    def save(self, key: str, intrinsics: CameraIntrinsics) -> Path:
+        self.root.mkdir(parents=True, exist_ok=True)
+        path = self._path(key)
+        data = asdict(intrinsics)
+        data["camera_matrix"] = intrinsics.camera_matrix.tolist()
+        data["dist_coeffs"] = np.asarray(intrinsics.dist_coeffs).reshape(1, -1).tolist()
+        data["image_size"] = list(intrinsics.image_size)
+        data["key"] = key
+        data["saved_at"] = datetime.now().isoformat()
+        tmp_path = path.with_name(path.name + ".tmp")
+        tmp_path.write_text(json.dumps(data, indent=2))
+        os.replace(tmp_path, path)
+        with self._lock:
+            self._memory[key] = intrinsics
+            self._misses.pop(key, None)
+        return path
+
+    def get(self, key: str) -> Optional[CameraIntrinsics]:
+        """저장된 캘리브레이션 값을 반환합니다. 없으면 None."""
+        with self._lock:
+            if key in self._memory:
+                return self._memory[key]
+            if self._misses.get(key, 0.0) > time.monotonic():
+                return None
+        path = self._path(key)
+        intrinsics = None
+        if path.exists():
+            data = json.loads(path.read_text())
+            intrinsics = CameraIntrinsics(
+                camera_matrix=np.array(data["camera_matrix"], dtype=np.float64),
+                dist_coeffs=np.array(data["dist_coeffs"], dtype=np.float64),
+                image_size=tuple(data["image_size"]),
+                source="calibrated",
+                rms=data.get("rms"),
+            )
+        with self._lock:
+            if intrinsics is None:
+                self._misses[key] = time.monotonic() + self.miss_ttl
+            else:
+                self._memory[key] = intrinsics
+                self._misses.pop(key, None)
+        return intrinsics
+
+    def load(self, key: Optional[str], image_size: Tuple[int, int]) -> CameraIntrinsics:
+        """
+        key 의 캘리브레이션 값을 image_size 에 맞춰 반환하고, 없으면 해석적 기본값을 반환합니다.
+        """
+        intrinsics = self.get(key) if key else None
+        if intrinsics is None:
+            return analytic_intrinsics(image_size)
+        return intrinsics.scaled_to(image_size)
@@ -0,0 +1,216 @@
+from contextlib import asynccontextmanager
+import asyncio
+import os
+import threading
+import time
+import cv2
+import numpy as np
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import PlainTextResponse
+from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel, Field
+from util import get_canonical_face_model_obj
+from gaze_service import GazeWorkerPool
+from frame_gate import StreamFrameGate
+from events import DetectedEvent, EventLogWriter, GazeEventMonitor, StreamInfo
+from audio import AudioNoiseAnalyzer
+from metrics import REGISTRY, STAGE_LATENCY, WORKER_QUEUE_DEPTH, WORKER_IN_FLIGHT
+from prohibited_items import BatchInferenceScheduler, ProhibitedItemTracker, create_detector
+
+num_workers: int | None = int(os.getenv("GAZE_WORKERS")) if os.getenv("GAZE_WORKERS") else None
+# 이 각도(도)를 넘는 시선이 이어지면 gaze_off_screen 이벤트 후보가 됩니다.
+gaze_off_screen_deg: float = float(os.getenv("GAZE_OFF_SCREEN_DEG", "35"))
+event_flush_interval: float = float(os.getenv("EVENT_FLUSH_INTERVAL", "5"))
+# 두 번째 사람 검출(얼굴 수 세기) 주기(초). 0 이면 끕니다.
+face_count_interval: float = float(os.getenv("FACE_COUNT_INTERVAL", "0.5"))
+# 마이크 PCM(mono, s16le) 샘플링 레이트
+audio_sample_rate: int = int(os.getenv("AUDIO_SAMPLE_RATE", "16000"))
+
+
+class ProhibitedItemMonitor:
+    """
+    금지 물품 검출 결과를 스트림별 ProhibitedItemTracker 로 판정해 이벤트로 기록합니다.
+    on_result 는 BatchInferenceScheduler 의 스레드 풀에서 동시에 불리므로 tracker 상태는 락 안에서만 바꿉니다.
+    """
+
+    def __init__(self, monitor: GazeEventMonitor):
+        self.monitor = monitor
+        self._trackers: dict[str, ProhibitedItemTracker] = {}
+        self._lock = threading.Lock()
+
+    def on_result(self, stream_id: str, timestamp: float, detections) -> None:
+        with self._lock:
+            tracker = self._trackers.setdefault(stream_id, ProhibitedItemTracker())
+            events = tracker.update(detections, timestamp)
+        for details in events:
+            self.monitor.emit(DetectedEvent(
+                stream_id=stream_id,
+                event_type="prohibited_item_detected",
+                severity="high",
+                message=f"금지 물품({details['label']})이 감지되었습니다.",
+                # 처음 알릴 때는 물품이 보이기 시작한 시각, 계속 보여서 다시 알릴 때는 그 시각입니다.
+                occurred_at=details["detected_at"] if details["repeated"] else details["started_at"],
+                details=details,
+            ))
+
+    def remove_stream(self, stream_id: str) -> None:
+        with self._lock:
+            self._trackers.pop(stream_id, None)
+
+
+async def audio_tick_loop(analyzer: AudioNoiseAnalyzer, monitor: GazeEventMonitor, interval: float):
+    """창 길이마다 준비된 모든 스트림의 오디오를 한 번에 분석하고 audio_noise 이벤트를 기록합니다."""
+    while True:
+        await asyncio.sleep(interval)
+        events = await asyncio.to_thread(analyzer.tick)
+        for stream_id, details in events:
+            monitor.emit(DetectedEvent(
+                stream_id=stream_id,
+                event_type="audio_noise",
+                severity="medium" if details["voice_windows"] else "low",
+                message="응시자 주변에서 일정 시간 이상 소음 또는 대화가 감지되었습니다.",
+                occurred_at=details["started_at"],
+                details=details,
+            ))
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # 워커를 띄우기 전에 정규 얼굴 모델 캐시가 준비되어 있는지 확인합니다.
+    if get_canonical_face_model_obj() is None:
+        raise RuntimeError("정규 얼굴 모델을 로드할 수 없습니다.")
+    app.state.writer = EventLogWriter(flush_interval=event_flush_interval)
+    app.state.monitor = GazeEventMonitor(
+        app.state.writer, enter_deg=gaze_off_screen_deg, exit_deg=gaze_off_screen_deg - 10,
+    )
+    app.state.pool = GazeWorkerPool(
+        num_workers=num_workers,
+        gate_factory=lambda: StreamFrameGate(borderline_angle_deg=gaze_off_screen_deg),
+        on_result=app.state.monitor.on_result,
+        face_count_interval=face_count_interval or None,
+    )
+    print(f"시선 추론 워커 {app.state.pool.num_workers}개 시작.")
+    app.state.audio = AudioNoiseAnalyzer(sample_rate=audio_sample_rate)
+    # PROHIBITED_ITEM_BACKEND 가 없으면 금지 물품 검출은 끕니다.
+    detector = create_detector()
+    app.state.items = None
+    if detector is not None:
+        app.state.item_monitor = ProhibitedItemMonitor(app.state.monitor)
+        app.state.items = BatchInferenceScheduler(
+            detector, app.state.item_monitor.on_result,
+            batch_size=int(os.getenv("PROHIBITED_ITEM_BATCH", "8")),
+            num_workers=int(os.getenv("PROHIBITED_ITEM_WORKERS", "1")),
+        )
+    audio_task = asyncio.create_task(audio_tick_loop(app.state.audio, app.state.monitor, app.state.audio.window_seconds))
+
+    yield
+
+    audio_task.cancel()
+    if app.state.items is not None:
+        app.state.items.shutdown()
+    app.state.pool.shutdown()
+    app.state.writer.close()
+
+
+app = FastAPI(lifespan=lifespan)
+
+# CORS middleware
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=["*"],  # In production, restrict this to your frontend's domain
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+)
+
+
+class StreamRegistration(BaseModel):
+    exam_id: str = Field(min_length=1)
+    session_id: str = Field(min_length=1)
+    user_id: str = Field(pattern=r"^[0-9a-fA-F]{24}$", description="응시자의 User id (ObjectId)")
+    device_id: str | None = Field(default=None, description="카메라 내부 파라미터 캐시 key. 없으면 user_id 를 사용합니다.")
+
+
+@app.put("/streams/{stream_id}", status_code=204)
+async def register_stream(stream_id: str, registration: StreamRegistration):
+    """
+    스트림과 응시자를 연결합니다. 등록된 스트림의 결과만 EventLog 로 기록됩니다.
+    """
+    app.state.monitor.register(stream_id, StreamInfo(
+        exam_id=registration.exam_id, session_id=registration.session_id, user_id=registration.user_id,
+    ))
+    app.state.pool.set_intrinsics_key(stream_id, registration.device_id or registration.user_id)
+
+
+@app.post("/streams/{stream_id}/frames", status_code=202)
+async def submit_frame(stream_id: str, request: Request):
+    """
+    JPEG/PNG 로 인코딩된 프레임 한 장을 body 로 받아 워커 풀에 넣습니다.
+    """
+    body = await request.body()
+    if not body:
+        raise HTTPException(status_code=422, detail="Empty frame")
+    # 디코딩은 GIL 을 놓는 OpenCV 함수이므로 스레드에서 수행합니다.
+    started = time.perf_counter()
+    frame = await asyncio.to_thread(cv2.imdecode, np.frombuffer(body, dtype=np.uint8), cv2.IMREAD_COLOR)
+    STAGE_LATENCY.labels("decode").observe(time.perf_counter() - started)
+    if frame is None:
+        raise HTTPException(status_code=422, detail="Invalid image")
+    now = time.time()
+    status = app.state.pool.submit(stream_id, frame, now)
+    # 물품 검출은 스트림당 sample_interval 마다 한 장만 받으므로, 받을 프레임만 스레드에서 전처리합니다.
+    if app.state.items is not None and app.state.items.should_sample(stream_id, now):
+        await asyncio.to_thread(app.state.items.enqueue, stream_id, frame, now)
+    return {"status": status}
+
+
+@app.post("/streams/{stream_id}/audio", status_code=202)
+async def submit_audio(stream_id: str, request: Request):
+    """
+    mono, signed 16-bit little-endian PCM 조각을 body 로 받습니다. (AUDIO_SAMPLE_RATE Hz)
+    """
+    body = await request.body()
+    if not body or len(body) % 2:
+        raise HTTPException(status_code=422, detail="Invalid PCM chunk")
+    app.state.audio.push(stream_id, body, time.time())
+
+
+@app.get("/streams/{stream_id}/gaze")
+async def latest_gaze(stream_id: str):
+    result = app.state.pool.latest_result(stream_id)
+    if result is None:
+        raise HTTPException(status_code=404, detail="No result for this stream yet")
+    return result
+
+
+@app.delete("/streams/{stream_id}", status_code=204)
+async def close_stream(stream_id: str):
+    app.state.pool.close_stream(stream_id)
+    app.state.audio.remove_stream(stream_id)
+    if app.state.items is not None:
+        app.state.items.remove_stream(stream_id)
+        app.state.item_monitor.remove_stream(stream_id)
+    app.state.monitor.unregister(stream_id)
+
+
+@app.get("/stats")
+async def worker_stats():
+    return {
+        "workers": app.state.pool.stats(),
+        "prohibited_items": app.state.items.stats() if app.state.items is not None else None,
+        "events": {"written": app.state.writer.written, "flushes": app.state.writer.flushes},
+    }
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus text exposition format. 워커별 게이지는 스크레이프할 때만 갱신합니다."""
+    for stats in app.state.pool.stats():
+        WORKER_QUEUE_DEPTH.labels(stats["worker_id"]).set(stats["queue_depth"])
+        WORKER_IN_FLIGHT.labels(stats["worker_id"]).set(stats["in_flight"])
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4")
+
+
+if __name__ == "__main__":
+    import uvicorn
+    uvicorn.run("main:app", host="0.0.0.0", port=2130)
@@ -0,0 +1,221 @@
+"""
+시선 추론 서비스의 메트릭과 샘플링 디버그 로그.
+
+- Counter / Gauge / Histogram : 외부 의존성 없는 최소한의 Prometheus 메트릭. REGISTRY.render() 가
+  text exposition format(0.0.4)을 만들고, main.py 의 GET /metrics 가 그대로 내보냅니다.
+- SampledLogger : sample_rate 비율만 골라 JSON 한 줄로 남기는 디버그 로거. 포맷팅과 출력은 백그라운드 스레드에서
+  하므로 호출하는 쪽은 난수 하나와 큐 put 하나만 부담합니다. AI_SERVER_DEBUG_SAMPLE_RATE 가 0 이면 꺼집니다.
+"""
+import bisect
+import json
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+# 단계별 지연 시간 버킷 (초). FaceMesh 가 수십 ms 이므로 1ms ~ 1s 구간을 촘촘히 둡니다.
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.02, 0.035, 0.05, 0.075, 0.1, 0.15, 0.25, 0.5, 1.0)
+LAG_BUCKETS = (0.05, 0.1, 0.2, 0.35, 0.5, 0.75, 1.0, 2.0, 5.0)
+
+
+def _format_labels(names: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), registry: "Registry" = None):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+        self._children: Dict[Tuple[str, ...], object] = {}
+        (registry if registry is not None else REGISTRY).register(self)
+
+    def labels(self, *values, **kwargs):
+        if kwargs:
+            values = tuple(kwargs[n] for n in self.labelnames)
+        key = tuple(str(v) for v in values)
+        child = self._children.get(key)
+        if child is None:
+            with self._lock:
+                child = self._children.setdefault(key, self._new_child())
+        return child
+
+    def remove(self, *values) -> None:
+        with self._lock:
+            self._children.pop(tuple(str(v) for v in values), None)
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def _default(self):
+        return self.labels()
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            children = list(self._children.items())
+        for key, child in children:
+            lines.extend(child.render(self.name, self.labelnames, key))
+        return lines
+
+
+class _ValueChild:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        with self._lock:
+            self.value -= amount
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def render(self, name: str, labelnames, key) -> List[str]:
+        return [f"{name}{_format_labels(labelnames, key)} {self.value}"]
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def _new_child(self):
+        return _ValueChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default().inc(amount)
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def _new_child(self):
+        return _ValueChild()
+
+    def set(self, value: float) -> None:
+        self._default().set(value)
+
+
+class _HistogramChild:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self._lock = threading.Lock()
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def render(self, name: str, labelnames, key) -> List[str]:
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float("inf"),), counts):
+            cumulative += count
+            le = 'le="+Inf"' if bound == float("inf") else f'le="{bound!r}"'
+            lines.append(f"{name}_bucket{_format_labels(labelnames, key, le)} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labelnames, key)} {total}")
+        lines.append(f"{name}_count{_format_labels(labelnames, key)} {cumulative}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS, registry: "Registry" = None):
+        self.buckets = tuple(sorted(buckets))
+        super().__init__(name, documentation, labelnames, registry)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value: float) -> None:
+        self._default().observe(value)
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+
+    def register(self, metric: _Metric) -> None:
+        self._metrics.append(metric)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+FRAMES_RECEIVED = Counter("gaze_frames_received_total", "submit() 으로 들어온 프레임 수")
+FRAMES_SKIPPED = Counter("gaze_frames_skipped_total", "StreamFrameGate 가 건너뛴 프레임 수", ["reason"])
+FRAMES_DROPPED = Counter("gaze_frames_dropped_total", "분석하지 못하고 버린 프레임 수", ["reason"])
+FRAMES_PROCESSED = Counter("gaze_frames_processed_total", "워커가 분석을 마친 프레임 수", ["face_detected"])
+EVENTS_EMITTED = Counter("gaze_events_total", "writer 로 넘긴 이벤트 수", ["event_type"])
+STAGE_LATENCY = Histogram("gaze_stage_seconds", "단계별 처리 시간", ["stage"])
+FRAME_LAG = Histogram("gaze_frame_lag_seconds", "프레임 수신부터 결과 수집까지 걸린 시간", buckets=LAG_BUCKETS)
+STREAM_LAG = Gauge("gaze_stream_lag_seconds", "스트림별 최근 결과의 지연 시간", ["stream_id"])
+WORKER_QUEUE_DEPTH = Gauge("gaze_worker_queue_depth", "워커별 대기 중인 프레임 수", ["worker_id"])
+WORKER_IN_FLIGHT = Gauge("gaze_worker_in_flight", "워커별 처리 중인 프레임 수", ["worker_id"])
+
+
+class SampledLogger:
+    """
+    sample_rate 비율의 호출만 JSON 한 줄로 기록합니다. 직렬화와 출력은 백그라운드 스레드가 맡습니다.
+    """
+
+    def __init__(self, name: str = "ai_server", sample_rate: Optional[float] = None, max_queue: int = 10000):
+        if sample_rate is None:
+            sample_rate = float(os.getenv("AI_SERVER_DEBUG_SAMPLE_RATE", "0"))
+        self.sample_rate = sample_rate
+        self._logger = logging.getLogger(name)
+        self._queue: "queue.Queue[dict]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        if self.sample_rate > 0:
+            if not self._logger.handlers:
+                self._logger.addHandler(logging.StreamHandler())
+            self._logger.setLevel(logging.DEBUG)
+            self._thread = threading.Thread(target=self._run, name=f"{name}-debug-log", daemon=True)
+            self._thread.start()
+
+    def log(self, event: str, **fields) -> None:
+        if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+            return
+        fields["event"] = event
+        fields["ts"] = time.time()
+        try:
+            self._queue.put_nowait(fields)
+        except queue.Full:
+            # 로그 때문에 분석이 밀리면 안 되므로 넘치면 버립니다.
+            pass
+
+    def _run(self) -> None:
+        while True:
+            record = self._queue.get()
+            self._logger.debug(json.dumps(record, ensure_ascii=False, default=str))
+
+
+debug_log = SampledLogger()
@@ -0,0 +1,346 @@
+"""
+여러 스트림에서 샘플링한 프레임을 고정 크기 배치로 묶어 금지 물품(휴대폰, 책, 이어폰 등)을 검출하는 모듈.
+
+- ItemDetector : 검출기 인터페이스. preprocess() 로 프레임 한 장을 입력 텐서로 바꾸고, infer() 로 배치 하나를 처리합니다.
+  - StubDetector : 가중치 없이 배치/백프레셔/처리량을 확인하기 위한 결정적 검출기
+  - OnnxDetector : onnxruntime 으로 돌리는 CPU 검출기 (onnxruntime 이 설치된 경우에만 사용 가능)
+- BatchInferenceScheduler : 스트림별 샘플링 간격, 가장 오래된 것부터 버리는 유한 대기열, 최대 대기 시간으로
+  배치를 만들고 스레드 풀에서 추론한 뒤 결과를 스트림별로 돌려줍니다.
+- ProhibitedItemTracker : 같은 물품이 min_hits 번 이상 연속 검출되면 prohibited_item_detected 이벤트를 만들고,
+  물품이 계속 보이면 cooldown 마다 다시 만듭니다.
+"""
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
+import cv2
+import numpy as np
+
+# submit() 결과
+QUEUED = "queued"
+SKIP_RATE = "skip_rate"
+DROPPED_OLDER = "dropped_older"
+
+DEFAULT_LABELS = ("cell phone", "book", "earphone", "laptop")
+
+
+@dataclass
+class Detection:
+    label: str
+    score: float
+    box: Tuple[float, float, float, float]  # 정규화된 x1, y1, x2, y2
+
+
+class ItemDetector(ABC):
+    """배치 단위로 동작하는 금지 물품 검출기 인터페이스."""
+
+    input_size: Tuple[int, int] = (320, 320)  # (width, height)
+
+    def preprocess(self, frame: np.ndarray) -> np.ndarray:
+        """BGR 프레임을 input_size 의 RGB float32 (H, W, 3) 텐서로 바꿉니다. 제출 스레드에서 실행됩니다."""
+        resized = cv2.resize(frame, self.input_size, interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(resized, cv2.COLOR_BGR2RGB).astype(np.float32) / 255.0
+
+    @abstractmethod
+    def infer(self, batch: np.ndarray) -> List[List[Detection]]:
+        """(N, H, W, 3) 배치를 받아 이미지별 검출 결과 목록을 반환합니다."""
+
+
+class StubDetector(ItemDetector):
+    """
+    모델 가중치 없이 파이프라인을 시험하기 위한 결정적 검출기.
+
+    왼쪽 위 16x16 영역의 빨간 채널 평균이 trigger 이상이면 화면 왼쪽 위에 "cell phone" 을 검출한 것으로 봅니다.
+    추론 비용은 batch_latency + item_latency * N 초 동안 잠들어 흉내 냅니다. (GIL 을 놓으므로 스레드 풀에서 병렬로 돕니다)
+    """
+
+    def __init__(self, batch_latency: float = 0.01, item_latency: float = 0.004, trigger: float = 0.8,
+                 input_size: Tuple[int, int] = (320, 320)):
+        self.batch_latency = batch_latency
+        self.item_latency = item_latency
+        self.trigger = trigger
+        self.input_size = input_size
+
+    def infer(self, batch: np.ndarray) -> List[List[Detection]]:
+        time.sleep(self.batch_latency + self.item_latency * len(batch))
+        red = batch[:, :16, :16, 0].mean(axis=(1, 2))
+        return [
+            [Detection("cell phone", float(r), (0.0, 0.0, 0.1, 0.1))] if r >= self.trigger else []
+            for r in red
+        ]
+
+
+class OnnxDetector(ItemDetector):
+    """
+    onnxruntime CPU 검출기.
+
+    모델 입력은 (N, 3, H, W) float32, 출력은 (N, K, 6) [x1, y1, x2, y2, score, class] (좌표는 0~1 정규화) 로 가정합니다.
+    배치 축이 고정된 모델이면 BatchInferenceScheduler 가 빈 이미지로 채워 batch_size 를 맞춥니다.
+    """
+
+    def __init__(self, model_path: str, labels: Sequence[str] = DEFAULT_LABELS, score_threshold: float = 0.5,
+                 input_size: Tuple[int, int] = (320, 320), intra_op_threads: int = 1):
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise ImportError("OnnxDetector 를 사용하려면 onnxruntime 을 설치해야 합니다.") from e
+        options = ort.SessionOptions()
+        # 배치 병렬성은 스케줄러의 워커 수로 조절하므로 세션 하나는 코어 하나만 씁니다.
+        options.intra_op_num_threads = intra_op_threads
+        self._session = ort.InferenceSession(model_path, sess_options=options, providers=["CPUExecutionProvider"])
+        self._input_name = self._session.get_inputs()[0].name
+        self.labels = list(labels)
+        self.score_threshold = score_threshold
+        self.input_size = input_size
+
+    def infer(self, batch: np.ndarray) -> List[List[Detection]]:
+        outputs = self._session.run(None, {self._input_name: np.ascontiguousarray(batch.transpose(0, 3, 1, 2))})[0]
+        results = []
+        for rows in outputs:
+            rows = rows[rows[:, 4] >= self.score_threshold]
+            results.append([
+                Detection(self.labels[int(c)] if int(c) < len(self.labels) else str(int(c)), float(s),
+                          (float(x1), float(y1), float(x2), float(y2)))
+                for x1, y1, x2, y2, s, c in rows
+            ])
+        return results
+
+
+def create_detector(backend: Optional[str] = None) -> Optional[ItemDetector]:
+    """
+    PROHIBITED_ITEM_BACKEND 환경 변수("stub" 또는 "onnx")로 검출기를 만듭니다. 지정하지 않으면 None (검출 안 함).
+    onnx 는 PROHIBITED_ITEM_MODEL 경로의 모델을 사용합니다.
+    """
+    backend = backend or os.getenv("PROHIBITED_ITEM_BACKEND")
+    if not backend:
+        return None
+    if backend == "stub":
+        return StubDetector()
+    if backend == "onnx":
+        model_path = os.getenv("PROHIBITED_ITEM_MODEL")
+        if not model_path:
+            raise ValueError("PROHIBITED_ITEM_MODEL 이 설정되지 않았습니다.")
+        return OnnxDetector(model_path)
+    raise ValueError(f"지원하지 않는 검출기입니다: {backend}")
+
+
+@dataclass
+class _Item:
+    stream_id: str
+    timestamp: float
+    tensor: np.ndarray
+    enqueued_at: float = field(default_factory=time.monotonic)
+
+
+class BatchInferenceScheduler:
+    """
+    스트림 프레임을 batch_size 개씩 모아 검출기로 보내는 스케줄러.
+
+    - 스트림마다 sample_interval 초에 한 장만 받습니다.
+    - 대기열은 max_queue 개로 제한하고, 넘치면 가장 오래된 프레임을 버립니다.
+    - 배치는 batch_size 개가 모이거나 첫 프레임이 max_wait 초 기다렸을 때 만들어지고,
+      max_latency 초보다 오래 기다린 프레임은 추론하지 않고 버립니다.
+    - 동시에 처리하는 배치는 num_workers 개까지입니다. 워커가 모두 바쁘면 배치를 만들지 않고 기다리므로
+      대기열이 차서 오래된 프레임부터 버려집니다. (백프레셔)
+    """
+
+    def __init__(
+        self,
+        detector: ItemDetector,
+        on_result: Callable[[str, float, List[Detection]], None],
+        batch_size: int = 8,
+        max_wait: float = 0.1,
+        max_latency: float = 2.0,
+        max_queue: int = 64,
+        sample_interval: float = 1.0,
+        num_workers: int = 1,
+        pad_batches: bool = False,
+    ):
+        self.detector = detector
+        self.on_result = on_result
+        self.batch_size = batch_size
+        self.max_wait = max_wait
+        self.max_latency = max_latency
+        self.max_queue = max_queue
+        self.sample_interval = sample_interval
+        self.num_workers = num_workers
+        self.pad_batches = pad_batches
+
+        self._lock = threading.Condition()
+        self._queue: Deque[_Item] = deque()
+        self._last_sampled: Dict[str, float] = {}
+        self._in_flight = 0
+        self._running = True
+        self.submitted = 0
+        self.dropped = 0
+        self.expired = 0
+        self.processed = 0
+        self.batches = 0
+        self._latencies: Deque[float] = deque(maxlen=1000)
+
+        self._executor = ThreadPoolExecutor(max_workers=num_workers, thread_name_prefix="item-detector")
+        self._batcher = threading.Thread(target=self._batch_loop, name="item-batcher", daemon=True)
+        self._batcher.start()
+
+    def should_sample(self, stream_id: str, timestamp: float) -> bool:
+        """
+        이 프레임을 받을 차례인지 확인하고, 받는다면 스트림의 샘플 시각을 갱신합니다.
+        전처리 없이 락만 잡으므로 이벤트 루프에서 바로 불러도 됩니다. True 면 이어서 enqueue() 를 불러야 합니다.
+        """
+        with self._lock:
+            last = self._last_sampled.get(stream_id)
+            if last is not None and timestamp - last < self.sample_interval:
+                return False
+            self._last_sampled[stream_id] = timestamp
+            return True
+
+    def submit(self, stream_id: str, frame: np.ndarray, timestamp: Optional[float] = None) -> str:
+        timestamp = timestamp or time.time()
+        if not self.should_sample(stream_id, timestamp):
+            return SKIP_RATE
+        return self.enqueue(stream_id, frame, timestamp)
+
+    def enqueue(self, stream_id: str, frame: np.ndarray, timestamp: float) -> str:
+        """should_sample() 을 통과한 프레임을 전처리해 대기열에 넣습니다."""
+        # 리사이즈/색 변환은 GIL 을 놓는 OpenCV 함수이므로 락 밖에서 수행합니다.
+        tensor = self.detector.preprocess(frame)
+        with self._lock:
+            status = QUEUED
+            if len(self._queue) >= self.max_queue:
+                self._queue.popleft()
+                self.dropped += 1
+                status = DROPPED_OLDER
+            self._queue.append(_Item(stream_id, timestamp, tensor))
+            self.submitted += 1
+            self._lock.notify()
+        return status
+
+    def remove_stream(self, stream_id: str) -> None:
+        with self._lock:
+            self._last_sampled.pop(stream_id, None)
+
+    def _take_batch(self) -> Optional[List[_Item]]:
+        """락을 잡은 상태에서 호출됩니다. 배치를 만들 수 있으면 꺼내서 반환합니다."""
+        now = time.monotonic()
+        while self._queue and now - self._queue[0].enqueued_at > self.max_latency:
+            self._queue.popleft()
+            self.expired += 1
+        if not self._queue or self._in_flight >= self.num_workers:
+            return None
+        if len(self._queue) < self.batch_size and now - self._queue[0].enqueued_at < self.max_wait:
+            return None
+        return [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+
+    def _batch_loop(self) -> None:
+        while True:
+            with self._lock:
+                batch = None
+                while self._running:
+                    batch = self._take_batch()
+                    if batch is not None:
+                        break
+                    timeout = self.max_wait
+                    if self._queue:
+                        timeout = max(self.max_wait - (time.monotonic() - self._queue[0].enqueued_at), 0.001)
+                    self._lock.wait(timeout=timeout)
+                if not self._running:
+                    return
+                self._in_flight += 1
+            self._executor.submit(self._run_batch, batch)
+
+    def _run_batch(self, items: List[_Item]) -> None:
+        try:
+            tensors = [item.tensor for item in items]
+            if self.pad_batches and len(tensors) < self.batch_size:
+                tensors += [np.zeros_like(tensors[0])] * (self.batch_size - len(tensors))
+            results = self.detector.infer(np.stack(tensors))
+        except Exception as e:
+            print(f"금지 물품 검출 실패: {e}")
+            results = None
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._lock.notify()
+        if results is None:
+            return
+        done = time.monotonic()
+        with self._lock:
+            self.batches += 1
+            self.processed += len(items)
+            self._latencies.extend(done - item.enqueued_at for item in items)
+        for item, detections in zip(items, results):
+            self.on_result(item.stream_id, item.timestamp, detections)
+
+    def stats(self) -> dict:
+        with self._lock:
+            latencies = np.array(self._latencies) if self._latencies else np.zeros(1)
+            return {
+                "queue_depth": len(self._queue),
+                "in_flight": self._in_flight,
+                "submitted": self.submitted,
+                "processed": self.processed,
+                "dropped": self.dropped,
+                "expired": self.expired,
+                "batches": self.batches,
+                "mean_batch_size": self.processed / self.batches if self.batches else 0.0,
+                "latency_p50": float(np.percentile(latencies, 50)),
+                "latency_p99": float(np.percentile(latencies, 99)),
+            }
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        with self._lock:
+            self._running = False
+            self._lock.notify_all()
+        self._batcher.join(timeout=timeout)
+        self._executor.shutdown(wait=True)
+
+
+class ProhibitedItemTracker:
+    """
+    스트림 하나의 검출 결과로 금지 물품 구간을 판정합니다.
+    같은 label 이 min_hits 번 이상 연속 검출된 상태에서 cooldown 이 지났으면 이벤트를 만들고, 그 label 은
+    cooldown 초 동안 다시 알리지 않습니다. 물품이 계속 보이면 cooldown 이 끝날 때마다 repeated 이벤트를 다시 만듭니다.
+    스레드 안전하지 않으므로 호출하는 쪽(ProhibitedItemMonitor)이 락을 잡습니다.
+    """
+
+    def __init__(self, min_hits: int = 2, cooldown: float = 60.0):
+        self.min_hits = min_hits
+        self.cooldown = cooldown
+        self._hits: Dict[str, int] = {}
+        self._since: Dict[str, float] = {}
+        self._max_score: Dict[str, float] = {}
+        self._cooldown_until: Dict[str, float] = {}
+
+    def update(self, detections: List[Detection], now: float) -> List[dict]:
+        seen: Dict[str, Detection] = {}
+        for d in detections:
+            if d.label not in seen or d.score > seen[d.label].score:
+                seen[d.label] = d
+        for label in list(self._hits):
+            if label not in seen:
+                self._hits.pop(label)
+                self._since.pop(label, None)
+                self._max_score.pop(label, None)
+
+        events = []
+        for label, d in seen.items():
+            self._hits[label] = self._hits.get(label, 0) + 1
+            self._since.setdefault(label, now)
+            self._max_score[label] = max(self._max_score.get(label, 0.0), d.score)
+            if self._hits[label] >= self.min_hits and now >= self._cooldown_until.get(label, 0.0):
+                repeated = label in self._cooldown_until and self._hits[label] > self.min_hits
+                self._cooldown_until[label] = now + self.cooldown
+                events.append({
+                    "label": label,
+                    "started_at": self._since[label],
+                    "detected_at": now,
+                    "repeated": repeated,
+                    "hits": self._hits[label],
+                    "max_score": self._max_score[label],
+                    "box": list(d.box),
+                })
+        return events
@@ -1,33 +1,97 @@
-import requests
+import hashlib
+import os
+import sys
+from pathlib import Path
+from typing import Optional
 import numpy as np
 
+# face_model_with_iris.obj 파일의 URL
+CANONICAL_FACE_MODEL_URL = "https://raw.githubusercontent.com/google-ai-edge/mediapipe/refs/heads/master/mediapipe/modules/face_geometry/data/face_model_with_iris.obj"
+# 파싱 방식이나 원본 obj 가 바뀌면 올려서 기존 캐시를 무효화합니다.
+CANONICAL_FACE_MODEL_VERSION = 1
 
-def get_canonical_face_model_obj():
-    """MediaPipe의 정규 3D 얼굴 모델 obj 파일을 다운로드하고 파싱합니다."""
-    # face_model_with_iris.obj 파일의 URL
-    url = "https://raw.githubusercontent.com/google-ai-edge/mediapipe/refs/heads/master/mediapipe/modules/face_geometry/data/face_model_with_iris.obj"
+DATA_DIR = Path(os.getenv("AI_SERVER_DATA_DIR") or Path(__file__).resolve().parent / "data")
+CANONICAL_FACE_MODEL_PATH = DATA_DIR / f"face_model_with_iris.v{CANONICAL_FACE_MODEL_VERSION}.npy"
 
-    try:
-        response = requests.get(url)
-        response.raise_for_status()  # HTTP 오류가 발생하면 예외를 발생시킵니다.
-    except requests.exceptions.RequestException as e:
-        print(f"Error downloading the obj file: {e}")
-        return None
+# 이미 체크섬을 확인한 파일 경로. 같은 프로세스에서 여러 번 로드해도 한 번만 검증합니다.
+_verified_paths: set[str] = set()
+
+
+def _checksum_path(npy_path: Path) -> Path:
+    return npy_path.with_name(npy_path.name + ".sha256")
+
+
+def _sha256_of(path: Path) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
 
-    # 정점(vertex) 데이터만 파싱합니다.
-    lines = response.text.splitlines()
+
+def parse_obj_vertices(text: str) -> np.ndarray:
+    """obj 텍스트에서 정점(vertex) 데이터만 파싱합니다."""
     vertices = []
-    for line in lines:
+    for line in text.splitlines():
         if line.startswith('v '):
             parts = line.split(' ')
             # 'v'를 제외하고 float으로 변환하여 추가합니다.
             vertices.append([float(p) for p in parts[1:] if p])
-
     return np.array(vertices, dtype=np.float32)
 
 
+def download_canonical_face_model(path: Path = CANONICAL_FACE_MODEL_PATH) -> Path:
+    """
+    MediaPipe의 정규 3D 얼굴 모델 obj 파일을 한 번 다운로드해 .npy 로 저장합니다.
+    배포 시 한 번만 실행하면 되며, 이후에는 네트워크 없이 get_canonical_face_model_obj() 로 로드합니다.
+    """
+    import requests
+
+    response = requests.get(CANONICAL_FACE_MODEL_URL, timeout=30)
+    response.raise_for_status()  # HTTP 오류가 발생하면 예외를 발생시킵니다.
+    vertices = parse_obj_vertices(response.text)
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # 다른 프로세스가 쓰다 만 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체합니다.
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        np.save(f, vertices)
+    os.replace(tmp_path, path)
+    _checksum_path(path).write_text(_sha256_of(path) + "\n")
+    return path
+
+
+def get_canonical_face_model_obj(path: Path = CANONICAL_FACE_MODEL_PATH) -> Optional[np.ndarray]:
+    """
+    캐시된 정규 3D 얼굴 모델 정점을 읽기 전용 memory-map 으로 로드합니다.
+    모든 워커 프로세스가 같은 페이지 캐시를 공유하므로 프로세스마다 다운로드/파싱 비용이 들지 않습니다.
+    캐시가 없거나 체크섬이 맞지 않으면 None 을 반환합니다.
+    """
+    path = Path(path)
+    checksum_path = _checksum_path(path)
+    if not path.exists() or not checksum_path.exists():
+        print(f"정규 얼굴 모델 캐시가 없습니다: {path}\n"
+              f"먼저 `python util.py download` 를 실행해 주세요.")
+        return None
+
+    if str(path) not in _verified_paths:
+        expected = checksum_path.read_text().strip()
+        if _sha256_of(path) != expected:
+            print(f"정규 얼굴 모델 캐시의 체크섬이 일치하지 않습니다: {path}\n"
+                  f"`python util.py download` 로 다시 받아 주세요.")
+            return None
+        _verified_paths.add(str(path))
+
+    return np.load(path, mmap_mode='r')
+
+
 def normalize_vector(v):
     norm = np.linalg.norm(v)
     if norm == 0:  # 0 벡터인 경우 0으로 반환
         return v
-    return v / norm
\ No newline at end of file
+    return v / norm
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "download":
+        saved = download_canonical_face_model()
+        print(f"정규 얼굴 모델 저장 완료: {saved}")
+    else:
+        print("사용법: python util.py download")
@@ -1,29 +1,127 @@
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
+from fastapi.responses import FileResponse, HTMLResponse, Response, StreamingResponse
 from backend.db import (
     Exam,
     User,
     ExamSession,
     ExamContent,
-    ExamHTML,
-    ExamQuestion,
-    ExamQuestionSelection,
-    ExamQuestionSelectionLocation,
-    Schedule, ExamDetectRule
+    Schedule, ExamDetectRule,
+    ExamCreationJob, ExamCreationRequest, ExamCreationFile,
 )
-from backend.db import exam_crud, exam_session_crud, user_crud
-from backend.core import AuthenticationChecker, create_examinees_from_csv, build_exam_html_and_index
+from backend.db import exam_crud, exam_session_crud, user_crud, exam_creation_job_crud
+from backend.core import AuthenticationChecker, create_examinees_from_csv, convert_exam_papers
+from backend.core import spool_upload, SpooledUpload, UploadBudget, blob_store, build_exam_content
+from backend.core import asset_store, asset_media_type
+from backend.core.upload_spool import EXAM_UPLOAD_MAX_PDF_BYTES, EXAM_UPLOAD_MAX_CSV_BYTES
+from backend.core.exam_jobs import enqueue_exam_creation, expire_stale_job, job_spool_dir, remove_job_spool_dir, TERMINAL_JOB_STATUSES
 from typing import List, Optional, Literal
 from uuid import uuid4
 from secrets import token_urlsafe
 from datetime import datetime, timedelta, timezone
+import asyncio
 import json
-import os
-import tempfile
+from dataclasses import asdict
 from bson import ObjectId
 from pydantic import BaseModel, Field
 
 exam_router = APIRouter()
 
+# 시험 생성 작업 SSE 에서 작업 문서를 다시 읽는 간격 (초)
+JOB_EVENTS_POLL_SECONDS = 1.0
+# SSE 연결 하나를 유지하는 최대 시간 (초). 넘으면 닫으며, 클라이언트(EventSource)가 다시 연결합니다.
+JOB_EVENTS_MAX_SECONDS = 10 * 60
+
+
+async def _convert_uploaded_papers(pdf_files: List[UploadFile], budget: UploadBudget) -> List[dict]:
+    """
+    업로드된 교시별 PDF 를 청크 단위로 임시 파일에 옮긴 뒤(해시는 옮기면서 계산) 프로세스 풀에서 동시에 변환합니다.
+    변환기는 옮겨 둔 파일 경로를 그대로 읽으며, 변환하는 동안 이벤트 루프는 다른 요청을 계속 처리합니다.
+    """
+    spooled: List[SpooledUpload] = []
+    try:
+        for upload in pdf_files:
+            spooled.append(await spool_upload(upload, EXAM_UPLOAD_MAX_PDF_BYTES, budget, suffix=".pdf"))
+        return await convert_exam_papers([s.path for s in spooled], [s.sha256 for s in spooled])
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to process PDF index/html: {e}")
+    finally:
+        # Remove temp PDFs after processing
+        for s in spooled:
+            s.remove()
+
+
+async def _read_examinee_csv(examinee_infos: UploadFile, budget: UploadBudget) -> str:
+    spooled = await spool_upload(examinee_infos, EXAM_UPLOAD_MAX_CSV_BYTES, budget, suffix=".csv")
+    try:
+        return spooled.read_text()
+    finally:
+        spooled.remove()
+
+
+def _accepts_encoding(accept_encoding: str, encoding: str) -> bool:
+    """
+    Accept-Encoding 헤더에서 encoding 의 q 값이 0 보다 큰지 봅니다. 직접 나오지 않으면 "*" 의 q 값을 따르고,
+    둘 다 없으면 받지 않는 것으로 봅니다. (gzip 은 x-gzip 도 같은 것으로 봅니다)
+    """
+    names = {encoding, "x-gzip"} if encoding == "gzip" else {encoding}
+    exact: Optional[float] = None
+    wildcard: Optional[float] = None
+    for item in accept_encoding.split(","):
+        coding, _, params = item.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        if coding in names:
+            exact = q if exact is None else max(exact, q)
+        elif coding == "*":
+            wildcard = q
+    q = exact if exact is not None else wildcard
+    return q is not None and q > 0
+
+
+def _html_response(request: Request, ref: Optional[str], inline_html: str) -> Response:
+    """
+    blob_store 의 HTML 을 그대로 파일로 내려보냅니다. ref 가 sha256 이므로 ETag 로 쓰고, 같으면 304 를 돌려줍니다.
+    저장할 때 압축해 둔 바이트는 클라이언트가 gzip 을 받으면 Content-Encoding: gzip 으로 그대로 보내고,
+    받지 못할 때만 풀어서 보냅니다. ref 가 없는 예전 문서는 문서 안의 HTML 을 내려보냅니다.
+    """
+    if ref is None:
+        return HTMLResponse(inline_html)
+    path, encoding = blob_store.locate(ref)
+    if path is None:
+        raise HTTPException(status_code=404, detail="Exam html not found")
+    if encoding is not None and not _accepts_encoding(request.headers.get("accept-encoding", ""), encoding):
+        encoding = None
+    etag = f'"{ref}.{encoding}"' if encoding else f'"{ref}"'
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", "Vary": "Accept-Encoding"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    if encoding is None and path.suffix == ".gz":
+        return HTMLResponse(blob_store.get(ref), headers=headers)
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return FileResponse(path, media_type="text/html; charset=utf-8", headers=headers)
+
+
+async def _get_exam_content_or_404(exam_id: str, exam_content_id: str) -> ExamContent:
+    exam = await exam_crud.get(ObjectId(exam_id))
+    if not exam:
+        raise HTTPException(status_code=404, detail="Exam not found")
+    for content in exam.contents:
+        if content.exam_content_id == exam_content_id:
+            return content
+    raise HTTPException(status_code=404, detail="Exam content not found")
+
 
 class ExamCardInfo(BaseModel):
     exam_id: str = Field(description="시험 ID", min_length=5)
@@ -99,6 +197,53 @@ async def get_exam_for_admin(exam_id: str):
     return exam
 
 
+@exam_router.get(
+    "/{exam_id}/contents/{exam_content_id}/outer",
+    dependencies=[Depends(AuthenticationChecker(role=["admin", "examinee", "supervisor"]))]
+)
+async def get_exam_outer_html(exam_id: str, exam_content_id: str, request: Request):
+    """
+    시험지의 외곽 HTML(page-container 를 비운 문서)을 text/html 로 반환합니다.
+    """
+    content = await _get_exam_content_or_404(exam_id, exam_content_id)
+    return _html_response(request, content.outer_html_ref, content.outer_html)
+
+
+@exam_router.get(
+    "/{exam_id}/contents/{exam_content_id}/pages/{page_index}",
+    dependencies=[Depends(AuthenticationChecker(role=["admin", "examinee", "supervisor"]))]
+)
+async def get_exam_page(exam_id: str, exam_content_id: str, page_index: int, request: Request):
+    """
+    시험지 한 페이지의 HTML(id='pf..' div)을 text/html 로 반환합니다. 시험 화면은 스크롤하면서 보이는 페이지만 받아 갑니다.
+    """
+    content = await _get_exam_content_or_404(exam_id, exam_content_id)
+    for page in content.htmls:
+        if page.page_index == page_index:
+            return _html_response(request, page.html_ref, page.html)
+    raise HTTPException(status_code=404, detail="Exam page not found")
+
+
+@exam_router.get("/assets/{asset_name}")
+async def get_exam_asset(asset_name: str):
+    """
+    시험지 HTML 이 참조하는 공유 폰트/CSS/이미지/JS 를 반환합니다. (EXAM_SHARED_ASSETS)
+    이름이 내용 해시라 바뀌지 않으므로 브라우저와 프록시가 오래 캐시하도록 immutable 로 내려보냅니다.
+    쿠키 없이 캐시될 수 있도록 인증을 거치지 않으며, 이름은 인증된 시험지 HTML 을 통해서만 알 수 있습니다.
+    """
+    try:
+        path = asset_store.path(asset_name)
+    except ValueError:
+        raise HTTPException(status_code=404, detail="Asset not found")
+    if not path.exists():
+        raise HTTPException(status_code=404, detail="Asset not found")
+    return FileResponse(
+        path,
+        media_type=asset_media_type(asset_name),
+        headers={"Cache-Control": "public, max-age=31536000, immutable"},
+    )
+
+
 @exam_router.get("/supervisor", response_model=List[ExamSession])
 async def get_exams_for_supervisor(user_info: User = Depends(AuthenticationChecker(role=['supervisor']))):
     """
@@ -119,9 +264,48 @@ async def get_exams_for_examinee(user_info: User = Depends(AuthenticationChecker
     )
 
 
+class ExamCreationJobStatus(BaseModel):
+    job_id: str = Field(description="시험 생성 작업 ID")
+    status: Literal['queued', 'running', 'succeeded', 'failed']
+    stage: str = Field(description="현재 단계 (queued, users, converting, building, saving, done)")
+    progress: float = Field(description="0 ~ 1 사이의 진행률")
+    message: Optional[str] = None
+    exam_id: Optional[str] = Field(default=None, description="성공하면 만들어진 Exam 의 id")
+    error: Optional[str] = None
+    status_url: str = Field(description="작업 상태를 폴링할 주소")
+    events_url: str = Field(description="작업 상태를 server-sent events 로 받을 주소")
+    created_at: datetime
+    updated_at: datetime
+
+
+def _job_status(job: ExamCreationJob) -> ExamCreationJobStatus:
+    status_url = f"/api/exams/admin/create_jobs/{job.job_id}"
+    return ExamCreationJobStatus(
+        job_id=job.job_id,
+        status=job.status,
+        stage=job.stage,
+        progress=job.progress,
+        message=job.message,
+        exam_id=job.exam_id,
+        error=job.error,
+        status_url=status_url,
+        events_url=status_url + "/events",
+        created_at=job.created_at,
+        updated_at=job.updated_at,
+    )
+
+
+async def _get_job_or_404(job_id: str) -> ExamCreationJob:
+    job = await exam_creation_job_crud.get_by({"job_id": job_id})
+    if job is None:
+        raise HTTPException(status_code=404, detail="Exam creation job not found")
+    return job
+
+
 @exam_router.post(
     "/admin/create_exams",
-    response_model=Exam,
+    status_code=202,
+    response_model=ExamCreationJobStatus,
     dependencies=[Depends(AuthenticationChecker(role=["admin"]))],
 )
 async def create_exams(
@@ -135,8 +319,9 @@ async def create_exams(
     break_time: int = Form(..., description="Break time between periods in minutes"),
 ):
     """
-    Creates an Exam along with Users (proctors and examinees), parses PDFs to HTML and index,
-    and constructs ExamContent and Schedules.
+    Validates the request, stores the uploads and enqueues an exam-creation job, returning 202 with the job status.
+    Users (proctors and examinees) are upserted, PDFs are converted to HTML and index, and the Exam is saved
+    by the job (see backend/core/exam_jobs.py). Poll status_url or subscribe to events_url for progress.
 
     :param title 시험 제목(str 타입)
     :param start_time: 시험 시작 datetime(시험이 처음 시작 될 때를 의미합니다.)
@@ -148,6 +333,7 @@ async def create_exams(
     :param break_time: 쉬는 시간(한 교시마다 몇 분 동안 쉬는지)(int)
     """
     print(title, start_time, end_time, supervisor_infos, examinee_infos, exam_papers, exam_duration_time, break_time)
+    upload_budget = UploadBudget()
     try:
         exam_start = datetime.fromisoformat(start_time.replace("Z", "+00:00"))
         exam_end = datetime.fromisoformat(end_time.replace("Z", "+00:00"))
@@ -168,228 +354,92 @@ async def create_exams(
                 raise ValueError
     except Exception:
         raise HTTPException(status_code=422, detail="Invalid supervisor_infos JSON")
-
-    # Create or fetch proctor users
-    proctor_docs: List[User] = []
     for p in proctor_items:
-        email = (p.get("email") or "").strip()
-        pname = (p.get("name") or "").strip()
-        if not email or not pname:
+        if not (p.get("email") or "").strip() or not (p.get("name") or "").strip():
             raise HTTPException(status_code=422, detail="Proctor name and email are required")
-        existing = await user_crud.get_by({"email": email, "role": "supervisor"})
-        if existing:
-            proctor_docs.append(existing)
-        else:
-            new_user = User(email=email, name=pname, role="supervisor", pwd=str(token_urlsafe(32)))
-            created = await user_crud.create(new_user)
-            proctor_docs.append(created)
+    if not title or not proctor_items:
+        raise HTTPException(status_code=422, detail="Missing required exam fields")
 
-    # Create or fetch examinee users from CSV
-    examinee_docs: List[User] = []
     if examinee_infos is None:
         raise HTTPException(status_code=403, detail="examinee information file are required")
 
-    content = (await examinee_infos.read()).decode("utf-8", errors="ignore")
-    parsed = await create_examinees_from_csv(content)
-    for u in parsed:
-        existing = await user_crud.get_by({"email": u.email, "role": "examinee"})
-        if existing:
-            examinee_docs.append(existing)
-        else:
-            created = await user_crud.create(u)
-            examinee_docs.append(created)
-
     # Validate periods and files
     pdf_files = exam_papers or []
     if len(pdf_files) == 0:
         raise HTTPException(status_code=422, detail="At least one PDF file is required")
-
-    # Build period start/end times using duration/break and count of PDFs
-    period_count = len(pdf_files)
     if exam_duration_time <= 0:
         raise HTTPException(status_code=422, detail="exam_duration_time must be positive minutes")
     if break_time < 0:
         raise HTTPException(status_code=422, detail="break_time must be >= 0 minutes")
 
-    period_times: List[tuple[datetime, datetime]] = []
-    cursor = exam_start
-    for i in range(period_count):
-        p_start = cursor
-        p_end = p_start + timedelta(minutes=int(exam_duration_time))
-        period_times.append((p_start, p_end))
-        cursor = p_end
-        if i < period_count - 1:
-            cursor = cursor + timedelta(minutes=int(break_time))
-    # Use computed end time to ensure consistency
-    computed_exam_end = period_times[-1][1]
-    exam_end = computed_exam_end
-
-    # Process each PDF: build HTML and index
-    contents: List[ExamContent] = []
-    schedules: List[Schedule] = []
-
-    for idx, (period_start, period_end) in enumerate(period_times):
-        upload: UploadFile = pdf_files[idx]
-        # Persist to a temp file to pass a path to converter
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tf:
-            pdf_tmp_path = tf.name
-            tf.write(await upload.read())
-
-        try:
-            result = build_exam_html_and_index(pdf_tmp_path, output_html_path=None, return_html_string=True)
-        except Exception as e:
-            # Cleanup and fail
-            try:
-                os.remove(pdf_tmp_path)
-            except Exception:
-                pass
-            raise HTTPException(status_code=500, detail=f"Failed to process PDF index/html: {e}")
-        finally:
-            # Remove temp PDF after processing
-            try:
-                os.remove(pdf_tmp_path)
-            except Exception:
-                pass
+    # Store uploads where the worker can read them, then enqueue
+    job_id = str(uuid4())
+    spool_dir = job_spool_dir(job_id)
+    try:
+        csv_file = await spool_upload(examinee_infos, EXAM_UPLOAD_MAX_CSV_BYTES, upload_budget, suffix=".csv", dir=spool_dir)
+        pdf_spooled: List[SpooledUpload] = []
+        for upload in pdf_files:
+            pdf_spooled.append(await spool_upload(upload, EXAM_UPLOAD_MAX_PDF_BYTES, upload_budget, suffix=".pdf", dir=spool_dir))
+
+        job = await exam_creation_job_crud.create(ExamCreationJob(
+            job_id=job_id,
+            request=ExamCreationRequest(
+                title=title,
+                exam_start_datetime=exam_start,
+                exam_end_datetime=exam_end,
+                proctors=proctor_items,
+                examinee_infos=ExamCreationFile(**asdict(csv_file)),
+                exam_papers=[ExamCreationFile(**asdict(s)) for s in pdf_spooled],
+                exam_duration_time=int(exam_duration_time),
+                break_time=int(break_time),
+            ),
+        ))
+        await enqueue_exam_creation(job_id)
+    except Exception:
+        remove_job_spool_dir(job_id)
+        raise
+    return _job_status(job)
 
-        html_str: str = result.get("html") or ""
-        pages_map = result.get("pages") or {}
-
-        # Extract pf pages from html
-        page_divs: List[str] = []
-        import re as _re
-        # pdf2htmlEX 는 대부분의 html 파일을 다음과 같은 형태로 생성 합니다.
-        # 이전 hthml 내용...
-        # <div id="page-container">
-        #   <div id="pf1" class="pf w0 h0" data-page-no="1">pdf 내용...</div>
-        #   <div id="pf2" class="pf w0 h0" data-page-no="2">pdf 내용...</div>
-        #   <div id="pf3" class="pf w0 h0" data-page-no="3">pdf 내용...</div>
-        #                       ...
-        #   <div id="pf[0-9]+" class="pf w0 h0" data-page-no="[0-9]+">pdf 내용...</div>
-        # </div>
-        # <div class="loading-indicator"></div>
-        # 이후 html 내용...
-        # regex 의 패턴 중 하나인 `<div[^>]*id=\"pf[0-9]+\"[^>]*>.*?</div>[\n ]*?(?=<div id=\"pf)` 은
-        # `<div id="pf1" class="pf w0 h0" data-page-no="1">pdf 내용...</div>\n <div id="pf` 값을 찾아 줍니다.
-        # 또다른 regex 의 패턴인 `<div[^>]*id=\"pf[0-9]+\"[^>]*>.*?</div>[\n ]*?</div>[\n ]*?(?=<div class=\"loading-indicator\">)` 는
-        # <div id="page-container"> 태그가 가진 마지막 태그인 <div id="pf[0-9]+" class="pf w0 h0" data-page-no="[0-9]+">pdf 내용...</div> 태그를 찾기 위해 사용됩니다. 첫 번째 패턴은 맨 마지막 태그를 찾지 못하니까요.
-        # 그래서 <div id="page-container"> 의 닫힘 </div> 태그를 추가하고 <div class="loading-indicator"> 를 기준으로 하여 맨 마지막 태그를 찾습니다.
-        for m in _re.finditer(r"<div[^>]*id=\"pf[0-9a-zA-Z]+\"[^>]*>.*?</div>[\n ]*?(?=<div id=\"pf)|<div[^>]*id=\"pf[0-9a-zA-Z]+\"[^>]*>.*?</div>[\n ]*?</div>[\n ]*?(?=<div class=\"loading-indicator\">)", html_str, flags=_re.DOTALL | _re.IGNORECASE):
-            page_divs.append(m.group())
-        if len(page_divs) > 1:
-            # 이 코드가 바로 <div id="page-container"> 의 닫음 태그를 삭제하는 코드입니다.
-            page_divs[-1] = "</div>".join(page_divs[-1].split("</div>")[:-1])
-        # Build ExamHTMLs with questions from pages_map
-        exam_htmls: List[ExamHTML] = []
-        for p_idx, page_html in enumerate(page_divs, start=1):
-            real_key = _re.match(r"<div id=\"pf[0-9a-zA-Z]+\"", page_html)
-            page_key = str(p_idx) if real_key.group() is None else real_key.group().replace("<div id=\"pf", "").replace("\"", "")
-            qmap = pages_map.get(page_key, {})
-            questions_list: List[ExamQuestion] = []
-            for qid_str, opts in qmap.items():
-                try:
-                    q_index = int(qid_str)
-                except Exception:
-                    q_index = 0
-                eq = ExamQuestion(
-                    question_id=qid_str,
-                    question_index=q_index,
-                    selection=[],
-                )
-                for opt_key, rect in opts.items():
-                    try:
-                        sel_index = int(opt_key)
-                    except Exception:
-                        continue
-                    loc = ExamQuestionSelectionLocation(
-                        x0=float(rect.get("x0", 0.0)),
-                        y0=float(rect.get("y0", 0.0)),
-                        x1=float(rect.get("x1", 0.0)),
-                        y1=float(rect.get("y1", 0.0)),
-                    )
-                    sel = ExamQuestionSelection(
-                        question_id=qid_str,
-                        selection_index=sel_index,
-                        location=loc,
-                    )
-                    eq.selection.append(sel)
-                questions_list.append(eq)
-            exam_htmls.append(ExamHTML(html=page_html, questions=questions_list, page_index=p_idx))
-
-        if not exam_htmls:
-            p_idx = 1
-            page_key = str(p_idx)
-            qmap = pages_map.get(page_key, {})
-            questions_list: List[ExamQuestion] = []
-            for qid_str, opts in qmap.items():
-                try:
-                    q_index = int(qid_str)
-                except Exception:
-                    q_index = 0
-                eq = ExamQuestion(
-                    question_id=qid_str,
-                    question_index=q_index,
-                    selection=[],
-                )
-                for opt_key, rect in opts.items():
-                    try:
-                        sel_index = int(opt_key)
-                    except Exception:
-                        continue
-                    loc = ExamQuestionSelectionLocation(
-                        x0=float(rect.get("x0", 0.0)),
-                        y0=float(rect.get("y0", 0.0)),
-                        x1=float(rect.get("x1", 0.0)),
-                        y1=float(rect.get("y1", 0.0)),
-                    )
-                    sel = ExamQuestionSelection(
-                        question_id=qid_str,
-                        selection_index=sel_index,
-                        location=loc,
-                    )
-                    eq.selection.append(sel)
-                questions_list.append(eq)
-            exam_htmls.append(ExamHTML(html=html_str, questions=questions_list, page_index=p_idx))
-
-        outer_html = html_str
-
-        content_id = str(uuid4())
-        schedule_id = str(uuid4())
-
-        contents.append(
-            ExamContent(
-                exam_content_id=content_id,
-                schedule_id=schedule_id,
-                outer_html=outer_html,
-                htmls=exam_htmls,
-                html_height= (1548.95 + 13 * 2) * len(exam_htmls)
-            )
-        )
-        schedules.append(
-            Schedule(
-                schedule_id=schedule_id,
-                schedule_index=idx + 1,
-                start_datetime=period_start,
-                end_datetime=period_end,
-                content_id=content_id,
-            )
-        )
 
-    if not title or not proctor_docs or not contents or not schedules:
-        raise HTTPException(status_code=422, detail="Missing required exam fields")
+@exam_router.get(
+    "/admin/create_jobs/{job_id}", response_model=ExamCreationJobStatus,
+    dependencies=[Depends(AuthenticationChecker(role=["admin"]))]
+)
+async def get_exam_creation_job(job_id: str):
+    """
+    시험 생성 작업의 현재 상태를 반환합니다. status 가 succeeded 이면 exam_id 로 시험을 조회할 수 있습니다.
+    """
+    return _job_status(await expire_stale_job(await _get_job_or_404(job_id)))
 
-    exam = Exam(
-        exam_title=title,
-        proctors=proctor_docs,
-        exam_start_datetime=exam_start,
-        exam_end_datetime=exam_end,
-        schedules=schedules,
-        contents=contents,
-        expected_examinees=examinee_docs,
-        exam_duration_time=int(exam_duration_time),
-        break_time=int(break_time),
-    )
 
-    return await exam_crud.create(exam)
+@exam_router.get(
+    "/admin/create_jobs/{job_id}/events",
+    dependencies=[Depends(AuthenticationChecker(role=["admin"]))]
+)
+async def stream_exam_creation_job(job_id: str):
+    """
+    시험 생성 작업의 상태가 바뀔 때마다 server-sent event(progress)로 보내고, 작업이 끝나면 스트림을 닫습니다.
+    워커가 멈춘 작업은 failed 로 보내고 닫으며, 연결은 JOB_EVENTS_MAX_SECONDS 를 넘기지 않습니다.
+    """
+    await _get_job_or_404(job_id)
+
+    async def events():
+        last_payload = None
+        deadline = asyncio.get_running_loop().time() + JOB_EVENTS_MAX_SECONDS
+        while asyncio.get_running_loop().time() < deadline:
+            job = await exam_creation_job_crud.get_by({"job_id": job_id})
+            if job is None:
+                return
+            job = await expire_stale_job(job)
+            payload = _job_status(job).model_dump_json()
+            if payload != last_payload:
+                yield f"event: progress\ndata: {payload}\n\n"
+                last_payload = payload
+            if job.status in TERMINAL_JOB_STATUSES:
+                return
+            await asyncio.sleep(JOB_EVENTS_POLL_SECONDS)
+
+    return StreamingResponse(events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
 
 
 @exam_router.put(
@@ -417,6 +467,7 @@ async def update_exams(
     existing_exam = await exam_crud.get(exam_id)
     if not existing_exam:
         raise HTTPException(status_code=404, detail="Exam not found")
+    upload_budget = UploadBudget()
 
     # Parse base fields
     try:
@@ -451,122 +502,13 @@ async def update_exams(
 
         contents_acc: List[ExamContent] = []
         schedules_acc: List[Schedule] = []
+        results = await _convert_uploaded_papers(pdf_files_in, upload_budget)
 
         for idx, (period_start, period_end) in enumerate(period_times_in):
-            upload: UploadFile = pdf_files_in[idx]
-            with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tf:
-                pdf_tmp_path = tf.name
-                tf.write(await upload.read())
-
-            try:
-                result = build_exam_html_and_index(pdf_tmp_path, output_html_path=None, return_html_string=True)
-            except Exception as e:
-                try:
-                    os.remove(pdf_tmp_path)
-                except Exception:
-                    pass
-                raise HTTPException(status_code=500, detail=f"Failed to process PDF index/html: {e}")
-            finally:
-                try:
-                    os.remove(pdf_tmp_path)
-                except Exception:
-                    pass
-
-            html_str: str = result.get("html") or ""
-            pages_map = result.get("pages") or {}
-
-            # Extract page divs
-            page_divs: List[str] = []
-            import re as _re
-            for m in _re.finditer(r"<div[^>]*id=\"pf[0-9a-zA-Z]+\"[^>]*>.*?</div>[\n ]*?(?=<div id=\"pf)|<div[^>]*id=\"pf[0-9a-zA-Z]+\"[^>]*>.*?</div>[\n ]*?</div>[\n ]*?(?=<div class=\"loading-indicator\">)", html_str, flags=_re.DOTALL | _re.IGNORECASE):
-                page_divs.append(m.group())
-
-            exam_htmls: List[ExamHTML] = []
-            for p_idx, page_html in enumerate(page_divs, start=1):
-                real_key = _re.match(r"<div id=\"pf[0-9a-zA-Z]+\"", page_html)
-                page_key = str(p_idx) if real_key.group() is None else real_key.group().replace("<div id=\"pf",
-                                                                                                "").replace("\"", "")
-                qmap = pages_map.get(page_key, {})
-                questions_list: List[ExamQuestion] = []
-                for qid_str, opts in qmap.items():
-                    try:
-                        q_index = int(qid_str)
-                    except Exception:
-                        q_index = 0
-                    eq = ExamQuestion(
-                        question_id=qid_str,
-                        question_index=q_index,
-                        selection=[],
-                    )
-                    for opt_key, rect in opts.items():
-                        try:
-                            sel_index = int(opt_key)
-                        except Exception:
-                            continue
-                        loc = ExamQuestionSelectionLocation(
-                            x0=float(rect.get("x0", 0.0)),
-                            y0=float(rect.get("y0", 0.0)),
-                            x1=float(rect.get("x1", 0.0)),
-                            y1=float(rect.get("y1", 0.0)),
-                        )
-                        sel = ExamQuestionSelection(
-                            question_id=qid_str,
-                            selection_index=sel_index,
-                            location=loc,
-                        )
-                        eq.selection.append(sel)
-                    questions_list.append(eq)
-                exam_htmls.append(ExamHTML(html=page_html, questions=questions_list, page_index=p_idx))
-
-            if not exam_htmls:
-                p_idx = 1
-                page_key = str(p_idx)
-                qmap = pages_map.get(page_key, {})
-                questions_list: List[ExamQuestion] = []
-                for qid_str, opts in qmap.items():
-                    try:
-                        q_index = int(qid_str)
-                    except Exception:
-                        q_index = 0
-                    eq = ExamQuestion(
-                        question_id=qid_str,
-                        question_index=q_index,
-                        selection=[],
-                    )
-                    for opt_key, rect in opts.items():
-                        try:
-                            sel_index = int(opt_key)
-                        except Exception:
-                            continue
-                        loc = ExamQuestionSelectionLocation(
-                            x0=float(rect.get("x0", 0.0)),
-                            y0=float(rect.get("y0", 0.0)),
-                            x1=float(rect.get("x1", 0.0)),
-                            y1=float(rect.get("y1", 0.0)),
-                        )
-                        sel = ExamQuestionSelection(
-                            question_id=qid_str,
-                            selection_index=sel_index,
-                            location=loc,
-                        )
-                        eq.selection.append(sel)
-                    questions_list.append(eq)
-                exam_htmls.append(ExamHTML(html=html_str, questions=questions_list, page_index=p_idx))
-
-            outer_html = html_str
-
+            result = results[idx]
             content_id = str(uuid4())
             schedule_id = str(uuid4())
-
-            contents_acc.append(
-                ExamContent(
-                    exam_content_id=content_id,
-                    schedule_id=schedule_id,
-                    outer_html=outer_html, # TODO: 원래 html 을 그대로 사용하고 있습니다. 변경 필요
-                    htmls=exam_htmls,
-                    html_height = 1548.95 * len(exam_htmls)
-                )
-            )
+            contents_acc.append(await build_exam_content(result.get("html") or "", result.get("pages") or {}, content_id, schedule_id))
             schedules_acc.append(
                 Schedule(
                     schedule_id=schedule_id,
@@ -610,7 +552,7 @@ async def update_exams(
     # Reconcile examinees if CSV provided
     new_examinees: List[User] = list(existing_exam.expected_examinees)
     if examinee_infos is not None:
-        csv_content = (await examinee_infos.read()).decode("utf-8", errors="ignore")
+        csv_content = await _read_examinee_csv(examinee_infos, upload_budget)
         parsed_users = await create_examinees_from_csv(csv_content)
         # Build maps
         incoming_examinee_emails = {u.email for u in parsed_users}
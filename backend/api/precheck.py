@@ -1,16 +1,129 @@
-from fastapi import APIRouter, Depends, UploadFile, File
+import os
+from typing import List, Optional
+from bson import ObjectId
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
 from backend.core import AuthenticationChecker
-from backend.db import User
+from backend.core.face_verification import check_model_files, face_verifier
+from backend.db import User, user_crud, exam_crud
 
 precheck_router = APIRouter()
 
+# 업로드 이미지 최대 크기 (웹캠 JPEG 한 장 기준으로 넉넉하게)
+MAX_IMAGE_BYTES = 8 * 1024 * 1024
 
-@precheck_router.post("/identity-verification")
+
+async def _read_image(image: UploadFile) -> bytes:
+    data = await image.read(MAX_IMAGE_BYTES + 1)
+    if not data:
+        raise HTTPException(status_code=422, detail="Empty image")
+    if len(data) > MAX_IMAGE_BYTES:
+        raise HTTPException(status_code=413, detail="Image too large")
+    return data
+
+
+def _require_face_models() -> None:
+    """얼굴 모델 파일이 없으면 신원 확인 관련 API 만 503 으로 막습니다."""
+    try:
+        check_model_files()
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+async def _find_examinee(user_info: User, query: dict) -> Optional[User]:
+    """
+    기준 사진을 다룰 응시자를 찾습니다. 감독관은 자신이 감독하는 시험의 응시자만 다룰 수 있으며,
+    그 밖의 응시자는 없는 것(None)으로 취급합니다.
+    """
+    examinee = await user_crud.get_by({**query, "role": "examinee"})
+    if examinee is None or user_info.role == "admin":
+        return examinee
+    if await exam_crud.get_by({"proctors._id": user_info.id, "expected_examinees._id": examinee.id}) is None:
+        return None
+    return examinee
+
+
+async def _find_examinee_by_id(user_info: User, user_id: str) -> User:
+    if not ObjectId.is_valid(user_id):
+        raise HTTPException(status_code=404, detail="Examinee not found")
+    examinee = await _find_examinee(user_info, {"_id": ObjectId(user_id)})
+    if examinee is None:
+        raise HTTPException(status_code=404, detail="Examinee not found")
+    return examinee
+
+
+@precheck_router.post("/identity-verification", dependencies=[Depends(_require_face_models)])
 async def identity_verification(
     user_info: User = Depends(AuthenticationChecker(role=["examinee"])),
     image: UploadFile = File(...)
 ):
     """
     사용자 신원 확인을 처리합니다.
+    업로드한 사진의 얼굴 임베딩을 응시자의 기준 임베딩과 비교하고, 일치하지 않으면 403 을 반환합니다.
+    기준 사진이 없으면 no_reference(403) 입니다. FACE_ENROLL_ON_FIRST_VERIFY 를 켜면 이 사진을 확인 대기 기준으로 저장하고
+    pending_review(403) 를 돌려주며, 감독관이 승인한 뒤 다시 확인해야 통과합니다.
+    얼굴을 찾지 못했거나 이미지가 잘못된 경우는 422 를 반환합니다.
+    """
+    verification = await face_verifier.verify(str(user_info.id), await _read_image(image))
+    if not verification.result:
+        status_code = 422 if verification.reason in ("invalid_image", "no_face") else 403
+        raise HTTPException(status_code=status_code, detail=verification.model_dump())
+    return verification.model_dump()
+
+
+@precheck_router.put("/reference-face/{user_id}", dependencies=[Depends(_require_face_models)])
+async def register_reference_face(
+    user_id: str,
+    image: UploadFile = File(...),
+    user_info: User = Depends(AuthenticationChecker(role=["admin", "supervisor"])),
+):
+    """
+    응시자의 기준 얼굴 사진을 등록(또는 교체)합니다. 신원 확인은 이 사진의 임베딩과 비교합니다.
+    감독관은 자신이 감독하는 시험의 응시자만 등록할 수 있습니다.
+    """
+    await _find_examinee_by_id(user_info, user_id)
+    result = await face_verifier.enroll(user_id, await _read_image(image))
+    if not result.result:
+        raise HTTPException(status_code=422, detail=result.model_dump())
+    return result.model_dump()
+
+
+@precheck_router.post("/reference-face/{user_id}/approve")
+async def approve_reference_face(
+    user_id: str,
+    user_info: User = Depends(AuthenticationChecker(role=["admin", "supervisor"])),
+):
+    """
+    첫 신원 확인 때 확인 대기로 저장된 기준 사진을 승인합니다. 승인 뒤부터 신원 확인에 이 사진을 씁니다.
+    감독관은 자신이 감독하는 시험의 응시자만 승인할 수 있습니다.
+    """
+    await _find_examinee_by_id(user_info, user_id)
+    if not await face_verifier.approve(user_id):
+        raise HTTPException(status_code=404, detail="Reference face not found")
+    return {"result": True}
+
+
+@precheck_router.post("/reference-faces", dependencies=[Depends(_require_face_models)])
+async def register_reference_faces(
+    images: List[UploadFile] = File(...),
+    user_info: User = Depends(AuthenticationChecker(role=["admin", "supervisor"])),
+):
+    """
+    응시자 기준 얼굴 사진을 한꺼번에 등록합니다. 파일 이름(확장자 제외)은 응시자 email 이어야 합니다. (예: kim@example.com.jpg)
+    파일마다 등록 결과를 돌려주며, 일부가 실패해도 나머지는 등록합니다. 감독관은 자신이 감독하는 시험의 응시자만 등록할 수 있습니다.
     """
-    return {"result": True}
\ No newline at end of file
+    results = []
+    for image in images:
+        email = os.path.splitext(os.path.basename(image.filename or ""))[0].strip()
+        item = {"filename": image.filename, "email": email}
+        examinee = await _find_examinee(user_info, {"email": email}) if email else None
+        if examinee is None:
+            results.append({**item, "result": False, "reason": "examinee_not_found"})
+            continue
+        try:
+            data = await _read_image(image)
+        except HTTPException as e:
+            results.append({**item, "result": False, "reason": str(e.detail)})
+            continue
+        result = await face_verifier.enroll(str(examinee.id), data)
+        results.append({**item, **result.model_dump()})
+    return {"enrolled": sum(1 for r in results if r["result"]), "results": results}
@@ -0,0 +1,75 @@
+"""
+extract_questions_options_positions_by_page 의 예전 구현(블록 x 기호마다 page.search_for)과
+현재 구현(페이지당 rawdict 한 번 + 선택지 글리프 인덱스)의 속도와 결과를 비교합니다.
+
+30~50 페이지 분량의 실제 시험지 PDF 로 돌리는 것을 기준으로 하며, 두 구현의 결과가 하나라도 다르면
+다른 페이지/문항을 출력하고 종료 코드 1 로 끝납니다.
+
+사용법 (저장소 루트에서):
+    python -m backend.benchmarks.bench_extractor exams/2024_1.pdf exams/2024_2.pdf --repeat 5
+"""
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List
+import fitz  # pymupdf
+from backend.core.exam_question_extractor import extract_questions_options_positions_by_page
+from backend.benchmarks.legacy_extractor import legacy_extract_questions_options_positions_by_page
+
+
+def _time(fn: Callable[[str], dict], pdf_path: str, repeat: int) -> tuple[List[float], dict]:
+    timings = []
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(pdf_path)
+        timings.append(time.perf_counter() - started)
+    return timings, result
+
+
+def _diff(expected: dict, actual: dict) -> List[str]:
+    problems = []
+    for page in sorted(set(expected) | set(actual), key=int):
+        e, a = expected.get(page), actual.get(page)
+        if e == a:
+            continue
+        for question in sorted(set(e or {}) | set(a or {}), key=int):
+            if (e or {}).get(question) != (a or {}).get(question):
+                problems.append(f"page {page} question {question}: legacy={(e or {}).get(question)} new={(a or {}).get(question)}")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdfs", nargs="+", type=Path)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    mismatched = False
+    total_legacy, total_new = 0.0, 0.0
+    print(f"{'pdf':<30} {'pages':>5} {'options':>7} {'legacy ms':>10} {'new ms':>8} {'speed-up':>8}  identical")
+    for pdf_path in args.pdfs:
+        with fitz.open(pdf_path) as doc:
+            page_count = doc.page_count
+        legacy_times, legacy_result = _time(legacy_extract_questions_options_positions_by_page, str(pdf_path), args.repeat)
+        new_times, new_result = _time(extract_questions_options_positions_by_page, str(pdf_path), args.repeat)
+        legacy_ms = statistics.median(legacy_times) * 1e3
+        new_ms = statistics.median(new_times) * 1e3
+        total_legacy += legacy_ms
+        total_new += new_ms
+        options = sum(len(q) for page in new_result.values() for q in page.values())
+        problems = _diff(legacy_result, new_result)
+        print(f"{pdf_path.name[:30]:<30} {page_count:5d} {options:7d} {legacy_ms:10.1f} {new_ms:8.1f} "
+              f"{legacy_ms / new_ms:7.1f}x  {'yes' if not problems else 'NO'}")
+        for problem in problems[:20]:
+            print(f"    {problem}")
+        mismatched |= bool(problems)
+    if len(args.pdfs) > 1:
+        print(f"{'total':<30} {'':5} {'':7} {total_legacy:10.1f} {total_new:8.1f} {total_legacy / total_new:7.1f}x")
+    sys.exit(1 if mismatched else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+pdf2htmlEX 결과 HTML 의 페이지 분할 속도를 예전 정규식 방식과 split_exam_html 로 비교합니다.
+
+HTML 파일을 넘기면 그 파일로, 넘기지 않으면 --pages / --page-kb 크기의 pdf2htmlEX 모양 합성 HTML 로 잽니다.
+(폰트/이미지를 base64 로 넣은 실제 시험지는 페이지당 수백 KB 입니다)
+두 방식이 찾은 페이지가 하나라도 다르면 종료 코드 1 로 끝납니다.
+
+사용법 (저장소 루트에서):
+    python -m backend.benchmarks.bench_page_splitter --pages 40 --page-kb 200 --repeat 5
+    python -m backend.benchmarks.bench_page_splitter exams/2024_1.html
+"""
+import argparse
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, List, Tuple
+from backend.core.html_pages import split_exam_html
+
+_LEGACY_PAGE_PATTERN = re.compile(
+    r"<div[^>]*id=\"pf[0-9a-zA-Z]+\"[^>]*>.*?</div>[\n ]*?(?=<div id=\"pf)|<div[^>]*id=\"pf[0-9a-zA-Z]+\"[^>]*>.*?</div>[\n ]*?</div>[\n ]*?(?=<div class=\"loading-indicator\">)",
+    re.DOTALL | re.IGNORECASE,
+)
+
+
+def legacy_split(html: str) -> List[str]:
+    """예전 create_exams 의 페이지 분할 (정규식 + 마지막 페이지에서 page-container 닫힘 태그 제거)."""
+    page_divs = [m.group() for m in _LEGACY_PAGE_PATTERN.finditer(html)]
+    if len(page_divs) > 1:
+        page_divs[-1] = "</div>".join(page_divs[-1].split("</div>")[:-1])
+    return [p.rstrip("\n ") for p in page_divs]
+
+
+def new_split(html: str) -> List[str]:
+    return [page_html for _, page_html in split_exam_html(html).iter_pages()]
+
+
+def synthetic_html(pages: int, page_kb: int) -> str:
+    # base64 폰트/이미지를 흉내 낸 긴 텍스트와 중첩 div 로 페이지 하나를 만듭니다.
+    filler = ("A" * 76 + "\n") * max(1, page_kb * 1024 // 77)
+    body = []
+    for no in range(1, pages + 1):
+        body.append(
+            f'<div id="pf{no:x}" class="pf w0 h0" data-page-no="{no}">'
+            f'<div class="pc pc{no:x} w0 h0"><img class="bi" src="data:image/png;base64,{filler}"/>'
+            + "".join(f'<div class="t m0 x1 h2 y{i}">{no}-{i}. ① ② ③ ④ ⑤</div>' for i in range(30))
+            + '</div><div class="pi" data-data=\'{"ctm":[1,0,0,1,0,0]}\'></div></div>\n'
+        )
+    return (
+        '<!DOCTYPE html><html><head><style type="text/css">@font-face{src:url(data:font/woff;base64,'
+        + filler + ')}</style><script>var x="<div>";</script></head><body>\n'
+        + '<div id="sidebar"><div id="outline"></div></div>\n<div id="page-container">\n'
+        + "".join(body)
+        + '</div>\n<div class="loading-indicator"></div>\n</body></html>'
+    )
+
+
+def _time(fn: Callable[[str], List[str]], html: str, repeat: int) -> Tuple[List[float], List[str]]:
+    timings = []
+    result: List[str] = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn(html)
+        timings.append(time.perf_counter() - started)
+    return timings, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("html", nargs="*", type=Path)
+    parser.add_argument("--pages", type=int, default=40)
+    parser.add_argument("--page-kb", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    inputs = [(p.name, p.read_text(encoding="utf-8", errors="ignore")) for p in args.html]
+    if not inputs:
+        inputs = [(f"synthetic {args.pages}p x {args.page_kb}KB", synthetic_html(args.pages, args.page_kb))]
+
+    mismatched = False
+    print(f"{'html':<30} {'MB':>6} {'pages':>5} {'legacy ms':>10} {'new ms':>8} {'speed-up':>8}  identical")
+    for name, html in inputs:
+        legacy_times, legacy_pages = _time(legacy_split, html, args.repeat)
+        new_times, new_pages = _time(new_split, html, args.repeat)
+        legacy_ms = statistics.median(legacy_times) * 1e3
+        new_ms = statistics.median(new_times) * 1e3
+        identical = legacy_pages == new_pages
+        mismatched |= not identical
+        print(f"{name[:30]:<30} {len(html) / 1e6:6.1f} {len(new_pages):5d} {legacy_ms:10.1f} {new_ms:8.1f} "
+              f"{legacy_ms / max(new_ms, 1e-6):7.1f}x  {'yes' if identical else 'NO'}")
+        if not identical:
+            print(f"    legacy found {len(legacy_pages)} pages, new found {len(new_pages)}")
+    sys.exit(1 if mismatched else 0)
+
+
+if __name__ == "__main__":
+    main()
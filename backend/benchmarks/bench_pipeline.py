@@ -0,0 +1,211 @@
+"""
+synthetic_exam 으로 만든 합성 시험지로 build_exam_html_and_index 의 두 단계를 잽니다.
+
+시나리오마다
+  - 위치 추출 시간 (extract_questions_options_positions_by_page, --repeat 회 중 중앙값)
+  - pdf2htmlEX 변환 시간 (convert_pdf_to_html_with_wsl, --page-chunks 로 페이지 병렬 변환 비교)
+  - 변환된 HTML 크기 (원본 / gzip -9, blob_store 에 저장되는 크기)
+  - 위치 정확도: 정답 선택지 중 모든 변이 --tolerance px 안에 들어온 비율과 최대 오차
+를 출력하고, --per-page 면 페이지별 정확도도 출력합니다. 빠지거나 어긋난 선택지, 정답에 없는 선택지가
+하나라도 있으면 종료 코드 1 로 끝나므로 추출기 최적화의 속도/정확도 회귀를 함께 확인할 수 있습니다.
+
+pdf2htmlEX 가 없으면 변환 열은 "-" 로 두고 추출만 잽니다. (--skip-convert 로 직접 끌 수도 있습니다)
+--pages 등을 주면 그 시나리오 하나만, 주지 않으면 SCENARIOS 를 모두 돌립니다.
+
+사용법 (저장소 루트에서):
+    python -m backend.benchmarks.bench_pipeline
+    python -m backend.benchmarks.bench_pipeline --pages 40 --questions-per-page 10 --page-chunks 4 --per-page
+"""
+import argparse
+import gzip
+import os
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, List, Optional, Tuple, TypeVar
+from backend.core.exam_question_extractor import convert_pdf_to_html_with_wsl, extract_questions_options_positions_by_page
+from backend.benchmarks.synthetic_exam import LAYOUTS, PositionMap, SyntheticExamSpec, generate_exam_pdf
+
+SCENARIOS = (
+    SyntheticExamSpec(pages=4, questions_per_page=5, layout="single", options_per_line=5),
+    SyntheticExamSpec(pages=4, questions_per_page=6, layout="single", options_per_line=1, max_stem_lines=1),
+    SyntheticExamSpec(pages=40, questions_per_page=10, layout="two_column", options_per_line=5),
+    SyntheticExamSpec(pages=40, questions_per_page=8, layout="two_column", options_per_line=2),
+)
+
+T = TypeVar("T")
+
+
+@dataclass
+class PageAccuracy:
+    page: str
+    expected: int = 0
+    matched: int = 0
+    misplaced: int = 0
+    missing: int = 0
+    extra: int = 0
+    max_error: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.matched == self.expected and not self.extra
+
+
+@dataclass
+class ScenarioResult:
+    label: str
+    pages: List[PageAccuracy] = field(default_factory=list)
+    extract_ms: float = 0.0
+    convert_ms: Optional[float] = None
+    html_bytes: Optional[int] = None
+    html_gzip_bytes: Optional[int] = None
+
+    @property
+    def expected(self) -> int:
+        return sum(p.expected for p in self.pages)
+
+    @property
+    def matched(self) -> int:
+        return sum(p.matched for p in self.pages)
+
+    @property
+    def max_error(self) -> float:
+        return max((p.max_error for p in self.pages), default=0.0)
+
+    @property
+    def ok(self) -> bool:
+        return all(p.ok for p in self.pages)
+
+
+def _median_ms(fn: Callable[[], T], repeat: int) -> Tuple[float, T]:
+    timings = []
+    result = None
+    for _ in range(max(1, repeat)):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1e3, result
+
+
+def score_positions(truth: PositionMap, actual: PositionMap, tolerance: float) -> List[PageAccuracy]:
+    """
+    페이지별로 정답과 추출 결과를 (문항, 선택지) 단위로 맞춰 봅니다.
+    네 변(x0,y0,x1,y1)의 오차가 모두 tolerance px 이하면 matched, 넘으면 misplaced 입니다.
+    """
+    results = []
+    for page in sorted(set(truth) | set(actual), key=int):
+        acc = PageAccuracy(page)
+        expected_questions = truth.get(page, {})
+        actual_questions = actual.get(page, {})
+        for question in set(expected_questions) | set(actual_questions):
+            expected_options = expected_questions.get(question, {})
+            actual_options = actual_questions.get(question, {})
+            acc.extra += len(set(actual_options) - set(expected_options))
+            for option, rect in expected_options.items():
+                acc.expected += 1
+                found = actual_options.get(option)
+                if found is None:
+                    acc.missing += 1
+                    continue
+                error = max(abs(float(found[k]) - rect[k]) for k in ("x0", "y0", "x1", "y1"))
+                acc.max_error = max(acc.max_error, error)
+                if error <= tolerance:
+                    acc.matched += 1
+                else:
+                    acc.misplaced += 1
+        results.append(acc)
+    return results
+
+
+def run_scenario(spec: SyntheticExamSpec, work_dir: str, args: argparse.Namespace, convert: bool) -> ScenarioResult:
+    pdf_path = os.path.join(work_dir, f"{spec.layout}_{spec.pages}p_{spec.questions_per_page}q_{spec.options_per_line}.pdf")
+    truth = generate_exam_pdf(spec, pdf_path)
+    result = ScenarioResult(spec.label())
+
+    result.extract_ms, actual = _median_ms(lambda: extract_questions_options_positions_by_page(pdf_path), args.repeat)
+    result.pages = score_positions(truth, actual, args.tolerance)
+
+    if convert:
+        html_path = str(Path(pdf_path).with_suffix(".html"))
+        result.convert_ms, _ = _median_ms(
+            lambda: convert_pdf_to_html_with_wsl(pdf_path, html_path, page_chunks=args.page_chunks),
+            args.convert_repeat,
+        )
+        data = Path(html_path).read_bytes()
+        result.html_bytes = len(data)
+        result.html_gzip_bytes = len(gzip.compress(data, compresslevel=9, mtime=0))
+    return result
+
+
+def _spec_from_args(args: argparse.Namespace) -> Optional[SyntheticExamSpec]:
+    custom = {
+        "pages": args.pages,
+        "questions_per_page": args.questions_per_page,
+        "layout": args.layout,
+        "options_per_line": args.options_per_line,
+        "max_stem_lines": args.max_stem_lines,
+    }
+    custom = {k: v for k, v in custom.items() if v is not None}
+    if not custom:
+        return None
+    return SyntheticExamSpec(seed=args.seed, **custom)
+
+
+def _kb(size: Optional[int]) -> str:
+    return "-" if size is None else f"{size / 1024:.0f}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int)
+    parser.add_argument("--questions-per-page", type=int)
+    parser.add_argument("--layout", choices=LAYOUTS)
+    parser.add_argument("--options-per-line", type=int)
+    parser.add_argument("--max-stem-lines", type=int)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3, help="위치 추출 반복 횟수")
+    parser.add_argument("--convert-repeat", type=int, default=1, help="pdf2htmlEX 변환 반복 횟수")
+    parser.add_argument("--page-chunks", type=int, default=1, help="convert_pdf_to_html_with_wsl 의 page_chunks")
+    parser.add_argument("--tolerance", type=float, default=2.0, help="정답으로 볼 최대 오차 (px)")
+    parser.add_argument("--skip-convert", action="store_true")
+    parser.add_argument("--per-page", action="store_true")
+    parser.add_argument("--keep", type=Path, help="만든 PDF/HTML 을 지우지 않고 둘 디렉터리")
+    args = parser.parse_args()
+
+    spec = _spec_from_args(args)
+    specs = [spec] if spec is not None else list(SCENARIOS)
+    convert = not args.skip_convert
+
+    if args.keep is not None:
+        args.keep.mkdir(parents=True, exist_ok=True)
+    with tempfile.TemporaryDirectory(prefix="bench_pipeline_") as tmp_dir:
+        work_dir = str(args.keep) if args.keep is not None else tmp_dir
+        failed = False
+        print(f"{'scenario':<42} {'extract ms':>10} {'convert ms':>10} {'html KB':>8} {'gzip KB':>8} {'accuracy':>9} {'max err':>7}")
+        for spec in specs:
+            try:
+                result = run_scenario(spec, work_dir, args, convert)
+            except RuntimeError as e:
+                if not convert:
+                    raise
+                # pdf2htmlEX 가 없는 환경: 추출만 다시 잽니다.
+                print(f"    conversion skipped: {e}")
+                convert = False
+                result = run_scenario(spec, work_dir, args, convert)
+            failed |= not result.ok
+            accuracy = result.matched / result.expected * 100 if result.expected else 100.0
+            convert_ms = "-" if result.convert_ms is None else f"{result.convert_ms:.0f}"
+            print(f"{result.label[:42]:<42} {result.extract_ms:10.1f} {convert_ms:>10} {_kb(result.html_bytes):>8} "
+                  f"{_kb(result.html_gzip_bytes):>8} {accuracy:8.1f}% {result.max_error:7.2f}")
+            for page in result.pages:
+                if args.per_page or not page.ok:
+                    print(f"    page {page.page:>3}: {page.matched}/{page.expected} matched, {page.misplaced} misplaced, "
+                          f"{page.missing} missing, {page.extra} extra, max err {page.max_error:.2f}px")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
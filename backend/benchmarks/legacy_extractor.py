@@ -0,0 +1,107 @@
+"""
+bench_extractor.py 에서 비교용으로 쓰는 예전 extract_questions_options_positions_by_page 구현.
+블록마다 선택지 기호별로 page.search_for 를 호출해 페이지 전체를 다시 검색합니다.
+"""
+import re
+from typing import Dict, Optional
+import fitz  # pymupdf
+from backend.core.exam_question_extractor import _rect_to_html_coords, _symbol_to_index
+
+
+def legacy_extract_questions_options_positions_by_page(pdf_path: str) -> Dict[str, Dict[str, Dict[str, Dict[str, float]]]]:
+    """
+    Extracts question numbers and option markers (①~⑤) with their positions for each page.
+
+    Returns a nested dict:
+    {
+      "1": {                          # page number (1-based)
+        "1": {                        # question number (as string)
+          "1": {"x0":..,"y0":..,"x1":..,"y1":..},  # option index 1~5
+          ...
+        },
+        ...
+      },
+      ...
+    }
+
+    Coordinates are scaled for pdf2htmlEX output assuming --zoom 1.3 and CSS px.
+    """
+    doc = fitz.open(pdf_path)
+
+    # Patterns
+    # question_pattern = re.compile(r"^(\d+)\.\s")
+    question_pattern = re.compile(r"^(\d+)\.", re.MULTILINE)
+
+    pages: Dict[str, Dict[str, Dict[str, Dict[str, float]]]] = {}
+
+    for page_index in range(doc.page_count):
+        page = doc.load_page(page_index)
+        page_key = str(page_index + 1)
+        pages[page_key] = {}
+
+        # Track current question while scanning in reading order
+        current_question: Optional[str] = None
+
+        # Read blocks (x0, y0, x1, y1, text, block_no, block_type)
+        blocks = page.get_text("blocks")
+        for block in blocks:
+            if len(block) < 7 or block[6] != 0:
+                continue
+
+            block_rect = fitz.Rect(block[0], block[1], block[2], block[3])
+            text = block[4] or ""
+
+            # Update current question if a new question number appears at the start of any line
+            for raw_line in text.split("\n"):
+                line = raw_line.strip()
+                if not line:
+                    continue
+                q_match = question_pattern.match(line)
+                if q_match:
+                    current_question = q_match.group(1)
+                    if current_question not in pages[page_key]:
+                        pages[page_key][current_question] = {}
+
+            # Find any option symbols present in the block text
+            # We search for actual glyphs ①~⑤ anywhere in the block
+            if not current_question:
+                # If we haven't seen a question yet, skip options to avoid mis-association
+                continue
+
+            has_option_symbol = any(sym in text for sym in ("①", "②", "③", "④", "⑤"))
+            if not has_option_symbol:
+                continue
+
+            # For each option symbol, locate its instances and keep the one inside the block
+            for symbol in ("①", "②", "③", "④", "⑤"):
+                if symbol not in text:
+                    continue
+                instances = page.search_for(symbol)
+                for inst in instances:
+                    # Keep only instances whose rect is within the block rect
+                    if (
+                            block_rect.x0 > inst.x0
+                            or inst.y0 < block_rect.y0
+                            or inst.x1 > block_rect.x1
+                            or inst.y1 > block_rect.y1
+                    ):
+                        continue
+
+                    x0, y0, x1, y1 = _rect_to_html_coords(inst)
+                    opt_index = _symbol_to_index(symbol)
+                    if opt_index is None:
+                        continue
+
+                    # Initialize question dict if not present (redundant safety)
+                    qdict = pages[page_key].setdefault(current_question, {})
+                    # Save the first good instance; if multiple, prefer the top-most (smallest y0)
+                    existing = qdict.get(str(opt_index))
+                    if existing is None or y0 < float(existing["y0"]):
+                        qdict[str(opt_index)] = {
+                            "x0": x0,
+                            "y0": y0,
+                            "x1": x1,
+                            "y1": y1,
+                        }
+    doc.close()
+    return pages
@@ -0,0 +1,169 @@
+"""
+PyMuPDF 로 객관식 시험지 모양의 합성 PDF 를 만들고, 선택지 기호(①~⑤)의 정답 위치를 함께 돌려줍니다.
+
+정답 위치는 extract_questions_options_positions_by_page 와 같은 모양/좌표계
+({page: {question: {option: {x0,y0,x1,y1}}}}, pdf2htmlEX --zoom 1.3 기준 px) 이므로 추출 결과와 바로 비교할 수 있습니다.
+글자를 직접 찍은 원점과 폰트 metric(advance, ascender/descender)으로 계산하므로 추출기를 거치지 않은 값입니다.
+
+- layout "single"     : 한 단에 문항을 차례로 배치
+- layout "two_column" : 수능처럼 두 단으로 배치 (왼쪽 단이 차면 오른쪽 단)
+- options_per_line    : 한 줄에 놓는 선택지 수 (5 = 한 줄, 1 = 세로로 한 줄씩)
+문항 본문은 seed 에 따라 1~max_stem_lines 줄이며, 문항 번호는 페이지를 넘어 1부터 이어집니다.
+
+사용법 (저장소 루트에서):
+    python -m backend.benchmarks.synthetic_exam exam.pdf --pages 40 --questions-per-page 10 --layout two_column
+    (exam.truth.json 에 정답 위치를 씁니다)
+"""
+import argparse
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Tuple
+import fitz  # pymupdf
+from backend.core.exam_question_extractor import OPTION_SYMBOLS, _rect_to_html_coords
+
+LAYOUTS = ("single", "two_column")
+PAGE_WIDTH, PAGE_HEIGHT = fitz.paper_size("a4")
+MARGIN = 50
+COLUMN_GAP = 24
+HEADER_HEIGHT = 36
+FONT_SIZE = 10
+LINE_HEIGHT = 15
+QUESTION_GAP = 12
+OPTION_INDENT = 12
+# 한글과 ①~⑤ 글리프가 모두 있는 PyMuPDF 내장 CJK 폰트
+FONT_NAME = "korea"
+
+_STEM_WORDS = ("다음", "글에", "대한", "설명으로", "가장", "적절한", "것은", "밑줄", "친", "부분의", "의미로", "옳지", "않은", "자료를", "보고")
+
+PositionMap = Dict[str, Dict[str, Dict[str, Dict[str, float]]]]
+
+
+@dataclass(frozen=True)
+class SyntheticExamSpec:
+    pages: int = 20
+    questions_per_page: int = 10
+    layout: str = "two_column"
+    options_per_line: int = 5
+    max_stem_lines: int = 2
+    seed: int = 0
+
+    def label(self) -> str:
+        return f"{self.pages}p x {self.questions_per_page}q {self.layout} opt/line={self.options_per_line}"
+
+
+def _columns(layout: str) -> List[Tuple[float, float]]:
+    """(x0, 폭) 목록"""
+    if layout not in LAYOUTS:
+        raise ValueError(f"unknown layout {layout!r}, expected one of {LAYOUTS}")
+    usable = PAGE_WIDTH - 2 * MARGIN
+    if layout == "single":
+        return [(MARGIN, usable)]
+    width = (usable - COLUMN_GAP) / 2
+    return [(MARGIN, width), (MARGIN + width + COLUMN_GAP, width)]
+
+
+def _stem_lines(rng: random.Random, question_no: int, max_lines: int) -> List[str]:
+    lines = []
+    for i in range(rng.randint(1, max(1, max_lines))):
+        words = " ".join(rng.choice(_STEM_WORDS) for _ in range(rng.randint(3, 6)))
+        lines.append(f"{question_no}. {words}" if i == 0 else words)
+    return lines
+
+
+def _option_rect(font: fitz.Font, symbol: str, x: float, baseline: float) -> fitz.Rect:
+    # rawdict 의 글자 bbox 와 같은 규칙: 가로는 advance, 세로는 ascender/descender
+    return fitz.Rect(
+        x,
+        baseline - font.ascender * FONT_SIZE,
+        x + font.text_length(symbol, fontsize=FONT_SIZE),
+        baseline - font.descender * FONT_SIZE,
+    )
+
+
+def generate_exam_pdf(spec: SyntheticExamSpec, pdf_path: str) -> PositionMap:
+    """spec 대로 pdf_path 에 시험지를 쓰고 정답 위치를 돌려줍니다. 문항이 페이지에 다 들어가지 않으면 ValueError."""
+    if not 1 <= spec.options_per_line <= len(OPTION_SYMBOLS):
+        raise ValueError(f"options_per_line must be between 1 and {len(OPTION_SYMBOLS)}")
+    rng = random.Random(spec.seed)
+    font = fitz.Font(FONT_NAME)
+    columns = _columns(spec.layout)
+    top = MARGIN + HEADER_HEIGHT
+    bottom = PAGE_HEIGHT - MARGIN
+    option_lines = -(-len(OPTION_SYMBOLS) // spec.options_per_line)
+
+    truth: PositionMap = {}
+    doc = fitz.open()
+    question_no = 0
+    for page_index in range(spec.pages):
+        page = doc.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        page_key = str(page_index + 1)
+        page_truth = truth[page_key] = {}
+        page.insert_text((MARGIN, MARGIN + FONT_SIZE * 1.5), f"제{page_index + 1}쪽 합성 시험지",
+                         fontname=FONT_NAME, fontsize=FONT_SIZE * 1.5)
+        page.draw_line((MARGIN, top - 10), (PAGE_WIDTH - MARGIN, top - 10))
+
+        column = 0
+        y = top
+        for _ in range(spec.questions_per_page):
+            question_no += 1
+            stem = _stem_lines(rng, question_no, spec.max_stem_lines)
+            height = (len(stem) + option_lines) * LINE_HEIGHT
+            if y + height > bottom:
+                column += 1
+                y = top
+                if column >= len(columns):
+                    raise ValueError(
+                        f"{spec.questions_per_page} questions do not fit on a page with layout {spec.layout!r}; "
+                        "lower questions_per_page or max_stem_lines"
+                    )
+            x0, width = columns[column]
+
+            for line in stem:
+                y += LINE_HEIGHT
+                page.insert_text((x0, y), line, fontname=FONT_NAME, fontsize=FONT_SIZE)
+
+            options = page_truth[str(question_no)] = {}
+            slot = (width - OPTION_INDENT) / spec.options_per_line
+            for i, symbol in enumerate(OPTION_SYMBOLS):
+                if i % spec.options_per_line == 0:
+                    y += LINE_HEIGHT
+                x = x0 + OPTION_INDENT + (i % spec.options_per_line) * slot
+                page.insert_text((x, y), f"{symbol} 보기{i + 1}", fontname=FONT_NAME, fontsize=FONT_SIZE)
+                rx0, ry0, rx1, ry1 = _rect_to_html_coords(_option_rect(font, symbol, x, y))
+                options[str(i + 1)] = {"x0": rx0, "y0": ry0, "x1": rx1, "y1": ry1}
+            y += QUESTION_GAP
+
+    doc.save(pdf_path, garbage=3, deflate=True)
+    doc.close()
+    return truth
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pdf", type=Path)
+    parser.add_argument("--pages", type=int, default=SyntheticExamSpec.pages)
+    parser.add_argument("--questions-per-page", type=int, default=SyntheticExamSpec.questions_per_page)
+    parser.add_argument("--layout", choices=LAYOUTS, default=SyntheticExamSpec.layout)
+    parser.add_argument("--options-per-line", type=int, default=SyntheticExamSpec.options_per_line)
+    parser.add_argument("--max-stem-lines", type=int, default=SyntheticExamSpec.max_stem_lines)
+    parser.add_argument("--seed", type=int, default=SyntheticExamSpec.seed)
+    args = parser.parse_args()
+
+    spec = SyntheticExamSpec(
+        pages=args.pages,
+        questions_per_page=args.questions_per_page,
+        layout=args.layout,
+        options_per_line=args.options_per_line,
+        max_stem_lines=args.max_stem_lines,
+        seed=args.seed,
+    )
+    truth = generate_exam_pdf(spec, str(args.pdf))
+    truth_path = args.pdf.with_suffix(".truth.json")
+    truth_path.write_text(json.dumps(truth, ensure_ascii=False, indent=2), encoding="utf-8")
+    print(f"{args.pdf} ({spec.label()}), ground truth: {truth_path}")
+
+
+if __name__ == "__main__":
+    main()
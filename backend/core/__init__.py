@@ -1,3 +1,9 @@
 from backend.core.utils import create_jwt, AuthenticationChecker, send_email
 from backend.core.utils import ExamSessionAuthenticationChecker, create_examinees_from_csv
-from backend.core.exam_question_extractor import build_exam_html_and_index
\ No newline at end of file
+from backend.core.exam_question_extractor import build_exam_html_and_index
+from backend.core.exam_conversion import convert_exam_paper, convert_exam_papers, shutdown_conversion_pool, terminate_conversion_pool
+from backend.core.upload_spool import spool_upload, SpooledUpload, UploadBudget
+from backend.core.html_pages import split_exam_html, stitch_html_chunks, SplitExamHtml, PageFragment
+from backend.core.blob_store import blob_store, BlobStore
+from backend.core.exam_assets import asset_store, asset_media_type
+from backend.core.exam_contents import build_exam_content, build_questions
@@ -0,0 +1,95 @@
+"""
+시험지 HTML(페이지 div, 외곽 HTML)을 DB 문서 밖에 두기 위한 로컬 content-addressed 파일 저장소.
+
+pdf2htmlEX 결과는 폰트/이미지가 들어 있어 시험지 하나에 수 MB 이고, Exam 과 그 Exam 을 그대로 품는 ExamSession 에
+넣어 두면 시험을 조회할 때마다 전부 끌려오고 큰 시험은 BSON 16MB 제한에 가까워집니다.
+내용의 sha256 을 키로 EXAM_BLOB_DIR/ab/cd/<sha256> 에 저장하고 문서에는 키(ref)만 남깁니다.
+같은 내용은 한 번만 저장되며, 파일은 임시 파일에 쓴 뒤 os.replace 로 바꿔 끼우므로 반쯤 쓴 파일을 읽는 일이 없습니다.
+
+pdf2htmlEX 마크업은 압축이 잘 되므로 저장할 때 한 번 gzip 으로 압축해 <sha256>.gz 로 둡니다. (ref 는 압축 전 내용의 해시)
+API 는 요청마다 압축하지 않고 이 바이트를 Content-Encoding: gzip 으로 그대로 내려보냅니다.
+압축 전에 저장된 파일(<sha256>)도 그대로 읽을 수 있습니다.
+"""
+import asyncio
+import gzip
+import hashlib
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import List, Optional, Tuple
+from dotenv import load_dotenv
+
+load_dotenv()
+EXAM_BLOB_DIR: str = os.getenv("EXAM_BLOB_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "exam_blobs"))
+
+_REF_PATTERN = re.compile(r"[0-9a-f]{64}")
+# 생성할 때 한 번만 압축하므로 가장 높은 압축률을 씁니다.
+GZIP_LEVEL = 9
+
+
+class BlobStore:
+    def __init__(self, root: str = EXAM_BLOB_DIR):
+        self.root = Path(root)
+
+    def path(self, ref: str) -> Path:
+        if not _REF_PATTERN.fullmatch(ref):
+            raise ValueError(f"invalid blob ref: {ref!r}")
+        return self.root / ref[:2] / ref[2:4] / ref
+
+    def locate(self, ref: str) -> Tuple[Optional[Path], Optional[str]]:
+        """
+        ref 의 저장 파일과 그 Content-Encoding 을 돌려줍니다. 압축본이 있으면 ("...gz", "gzip"), 없으면 (원본, None).
+        둘 다 없으면 (None, None) 입니다.
+        """
+        path = self.path(ref)
+        gz_path = path.with_name(path.name + ".gz")
+        if gz_path.exists():
+            return gz_path, "gzip"
+        if path.exists():
+            return path, None
+        return None, None
+
+    def exists(self, ref: str) -> bool:
+        return self.locate(ref)[0] is not None
+
+    def put(self, data: bytes) -> str:
+        ref = hashlib.sha256(data).hexdigest()
+        path = self.path(ref)
+        gz_path = path.with_name(path.name + ".gz")
+        if gz_path.exists():
+            return ref
+        # mtime=0 으로 같은 내용은 항상 같은 압축 바이트가 되게 합니다.
+        compressed = gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, prefix=".tmp_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(compressed)
+            os.replace(tmp_path, gz_path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        return ref
+
+    def put_text(self, text: str) -> str:
+        return self.put(text.encode("utf-8"))
+
+    def get(self, ref: str) -> bytes:
+        """압축 전 내용을 돌려줍니다."""
+        path, encoding = self.locate(ref)
+        if path is None:
+            raise FileNotFoundError(ref)
+        with open(path, "rb") as f:
+            data = f.read()
+        return gzip.decompress(data) if encoding == "gzip" else data
+
+    def put_texts(self, texts: List[str]) -> List[str]:
+        return [self.put_text(text) for text in texts]
+
+    async def aput_texts(self, texts: List[str]) -> List[str]:
+        """파일 쓰기가 이벤트 루프를 막지 않도록 스레드에서 한 번에 저장합니다."""
+        return await asyncio.to_thread(self.put_texts, texts)
+
+
+blob_store = BlobStore()
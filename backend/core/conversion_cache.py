@@ -0,0 +1,109 @@
+"""
+변환된 시험지(build_exam_html_and_index 결과)를 PDF 내용 해시로 저장하는 로컬 디스크 캐시.
+
+같은 PDF 를 update_exams 로 다시 올리거나 다른 시험에 재사용하면 pdf2htmlEX 와 추출을 다시 돌리지 않고
+해시 한 번으로 결과를 돌려줍니다. 키에는 PDF 바이트 외에 변환 설정(HTML_ZOOM, embed, 공유 자산을 쓸 때는
+HTML 에 들어가는 EXAM_ASSET_BASE_URL)도 들어가므로 설정이 바뀌면 자연스럽게 다른 항목이 됩니다.
+
+- 항목 하나는 {key}.json 파일 하나이며, 임시 파일에 쓴 뒤 os.replace 로 바꿔 끼웁니다.
+- 적중할 때마다 mtime 을 갱신하고, 전체 크기가 EXAM_CACHE_MAX_BYTES 를 넘으면 mtime 이 오래된 것부터 지웁니다.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+from dotenv import load_dotenv
+from backend.core.exam_assets import EXAM_ASSET_BASE_URL
+from backend.core.exam_question_extractor import HTML_ZOOM, HTML_EMBED, HTML_EMBED_SHARED
+
+load_dotenv()
+EXAM_CACHE_DIR: str = os.getenv("EXAM_CACHE_DIR", os.path.join(tempfile.gettempdir(), "exam_conversion_cache"))
+EXAM_CACHE_MAX_BYTES: int = int(os.getenv("EXAM_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+
+# 캐시 항목 형식이 바뀌면 올려서 예전 항목을 무효화합니다.
+CACHE_FORMAT_VERSION = 1
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_pdf_file(pdf_path: str) -> str:
+    """PDF 파일의 sha256 을 청크 단위로 읽어 계산합니다."""
+    digest = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def conversion_cache_key(pdf_sha256: str, zoom: float = HTML_ZOOM, embed: str = HTML_EMBED,
+                         asset_base_url: str = EXAM_ASSET_BASE_URL) -> str:
+    settings = f"v{CACHE_FORMAT_VERSION}|zoom={zoom}|embed={embed}"
+    if embed == HTML_EMBED_SHARED:
+        # 공유 자산 URL 이 HTML 에 그대로 박히므로, 주소가 바뀌면 예전 HTML 을 돌려주지 않게 합니다.
+        settings += f"|assets={asset_base_url}"
+    return hashlib.sha256(f"{pdf_sha256}|{settings}".encode()).hexdigest()
+
+
+class ConversionCache:
+    def __init__(self, root: str = EXAM_CACHE_DIR, max_bytes: int = EXAM_CACHE_MAX_BYTES):
+        self.root = Path(root)
+        self.max_bytes = max_bytes
+        self._evict_lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                result = json.load(f)
+            os.utime(path)
+            return result
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            # 깨진 항목은 지우고 다시 변환합니다.
+            path.unlink(missing_ok=True)
+            return None
+
+    def put(self, key: str, result: Dict[str, Any]) -> None:
+        if self.max_bytes <= 0:
+            return
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".tmp_", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(result, f, ensure_ascii=False)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._evict_lock:
+            entries = []
+            total = 0
+            for path in self.root.glob("*.json"):
+                if path.name.startswith(".tmp_"):
+                    continue
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+                total += stat.st_size
+            if total <= self.max_bytes:
+                return
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+
+
+conversion_cache = ConversionCache()
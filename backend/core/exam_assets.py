@@ -0,0 +1,103 @@
+"""
+pdf2htmlEX 가 따로 써 낸 폰트/CSS/이미지/JS 를 내용 해시 이름으로 공유 저장소에 옮기고, HTML 의 참조를 바꿔 씁니다.
+
+기본 변환(--embed cfijo)은 이 파일들을 base64 로 HTML 에 넣기 때문에 같은 폰트와 base CSS 가 시험지마다,
+응시자마다 다시 저장되고 다시 전송됩니다. EXAM_SHARED_ASSETS 를 켜면 --embed CFIJo 로 변환한 뒤 이 모듈이
+  1) 폰트/이미지/JS 를 먼저 옮기고 (파일 이름 -> <sha256>.<확장자>)
+  2) CSS 안의 url(...) 을 바뀐 이름으로 고친 다음 CSS 를 옮기고
+  3) HTML 의 href/src/url(...) 을 EXAM_ASSET_BASE_URL + 바뀐 이름으로 고칩니다.
+이름이 내용 해시이므로 같은 파일은 시험이 달라도 하나만 저장되고, GET /api/exams/assets/{name} 은
+immutable 로 오래 캐시하게 내려보냅니다.
+"""
+import hashlib
+import mimetypes
+import os
+import re
+import tempfile
+from pathlib import Path
+from typing import Dict
+from dotenv import load_dotenv
+
+load_dotenv()
+EXAM_SHARED_ASSETS: bool = os.getenv("EXAM_SHARED_ASSETS", "0").lower() in ("1", "true", "yes")
+EXAM_ASSET_DIR: str = os.getenv("EXAM_ASSET_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "exam_assets"))
+# 시험지 HTML 은 프론트엔드 문서(shadow DOM) 안에 들어가므로 백엔드의 절대 주소를 씁니다.
+EXAM_ASSET_BASE_URL: str = os.getenv("EXAM_ASSET_BASE_URL", "http://localhost:8000/api/exams/assets/")
+
+_ASSET_NAME_PATTERN = re.compile(r"[0-9a-f]{64}\.[0-9a-z]{1,8}")
+_HTML_REF_PATTERN = re.compile(r"""(\b(?:href|src)\s*=\s*)(["'])([^"']+)\2""", re.IGNORECASE)
+_CSS_URL_PATTERN = re.compile(r"""url\(\s*(["']?)([^"')]+)\1\s*\)""", re.IGNORECASE)
+
+_MEDIA_TYPES = {
+    ".woff": "font/woff",
+    ".woff2": "font/woff2",
+    ".ttf": "font/ttf",
+    ".otf": "font/otf",
+    ".svg": "image/svg+xml",
+    ".css": "text/css; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+}
+
+
+def asset_media_type(name: str) -> str:
+    ext = os.path.splitext(name)[1].lower()
+    return _MEDIA_TYPES.get(ext) or mimetypes.guess_type(name)[0] or "application/octet-stream"
+
+
+class AssetStore:
+    def __init__(self, root: str = EXAM_ASSET_DIR):
+        self.root = Path(root)
+
+    def path(self, name: str) -> Path:
+        if not _ASSET_NAME_PATTERN.fullmatch(name):
+            raise ValueError(f"invalid asset name: {name!r}")
+        return self.root / name
+
+    def put(self, data: bytes, ext: str) -> str:
+        name = f"{hashlib.sha256(data).hexdigest()}{ext.lower()}"
+        path = self.path(name)
+        if path.exists():
+            return name
+        self.root.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".tmp_")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        return name
+
+
+asset_store = AssetStore()
+
+
+def publish_shared_assets(html: str, asset_dir: str, store: AssetStore = asset_store, base_url: str = EXAM_ASSET_BASE_URL) -> str:
+    """
+    asset_dir 에 있는 pdf2htmlEX 결과 파일들을 store 로 옮기고, 참조를 바꾼 html 을 돌려줍니다.
+    asset_dir 에 없는 참조(외부 URL, data: URI 등)는 그대로 둡니다.
+    """
+    files = {p.name: p for p in Path(asset_dir).iterdir() if p.is_file() and p.suffix.lower() not in (".html", ".htm")}
+    published: Dict[str, str] = {}
+
+    def url_for(ref: str) -> str:
+        return base_url + published[ref] if ref in published else ref
+
+    def rewrite_css(css: str) -> str:
+        return _CSS_URL_PATTERN.sub(lambda m: f"url({url_for(m.group(2))})" if m.group(2) in published else m.group(0), css)
+
+    for name, path in files.items():
+        if path.suffix.lower() != ".css":
+            published[name] = store.put(path.read_bytes(), path.suffix)
+    for name, path in files.items():
+        if path.suffix.lower() == ".css":
+            css = rewrite_css(path.read_text(encoding="utf-8", errors="ignore"))
+            published[name] = store.put(css.encode("utf-8"), path.suffix)
+
+    html = _HTML_REF_PATTERN.sub(
+        lambda m: f"{m.group(1)}{m.group(2)}{url_for(m.group(3))}{m.group(2)}" if m.group(3) in published else m.group(0),
+        html,
+    )
+    # <style> 블록이나 style 속성에 남은 url(...) 도 바꿉니다.
+    return rewrite_css(html)
@@ -0,0 +1,74 @@
+"""
+pdf2htmlEX 변환 결과(html, pages)로 Exam 에 들어갈 ExamContent 를 만듭니다.
+create_exams(워커의 시험 생성 작업 포함)와 update_exams 가 함께 사용합니다.
+"""
+from typing import List
+from backend.db import ExamContent, ExamHTML, ExamQuestion, ExamQuestionSelection, ExamQuestionSelectionLocation
+from backend.core.blob_store import blob_store
+from backend.core.html_pages import split_exam_html
+
+
+def build_questions(qmap: dict) -> List[ExamQuestion]:
+    """extract_questions_options_positions_by_page 결과 중 한 페이지 분량을 ExamQuestion 목록으로 바꿉니다."""
+    questions_list: List[ExamQuestion] = []
+    for qid_str, opts in qmap.items():
+        try:
+            q_index = int(qid_str)
+        except Exception:
+            q_index = 0
+        eq = ExamQuestion(
+            question_id=qid_str,
+            question_index=q_index,
+            selection=[],
+        )
+        for opt_key, rect in opts.items():
+            try:
+                sel_index = int(opt_key)
+            except Exception:
+                continue
+            loc = ExamQuestionSelectionLocation(
+                x0=float(rect.get("x0", 0.0)),
+                y0=float(rect.get("y0", 0.0)),
+                x1=float(rect.get("x1", 0.0)),
+                y1=float(rect.get("y1", 0.0)),
+            )
+            sel = ExamQuestionSelection(
+                question_id=qid_str,
+                selection_index=sel_index,
+                location=loc,
+            )
+            eq.selection.append(sel)
+        questions_list.append(eq)
+    return questions_list
+
+
+async def build_exam_content(html_str: str, pages_map: dict, content_id: str, schedule_id: str) -> ExamContent:
+    """
+    pdf2htmlEX 결과를 페이지 div 로 나눠 ExamContent 를 만듭니다.
+    outer_html 은 page-container 를 비운 외곽 HTML 이며, 프론트엔드가 page-container 안에 페이지들을 채워 넣습니다.
+    HTML 본문은 blob_store 에 저장하고 문서에는 ref 만 남깁니다. 페이지는 get_exam_page 로 하나씩 받아 갑니다.
+    """
+    split = split_exam_html(html_str)
+    # (선택지 좌표를 찾을 페이지 번호, 페이지 HTML)
+    # 선택지 좌표는 10진수 페이지 번호(data-page-no)로 저장되어 있습니다. (id 의 pf 뒤는 16진수)
+    page_htmls = [(page.page_no, page_html) for page, page_html in split.iter_pages()]
+    if page_htmls:
+        outer_html = split.outer_html()
+    else:
+        # 페이지 div 를 찾지 못하면 전체 HTML 을 한 페이지로 둡니다.
+        outer_html = html_str
+        page_htmls = [("1", html_str)]
+
+    outer_ref, *page_refs = await blob_store.aput_texts([outer_html] + [page_html for _, page_html in page_htmls])
+    exam_htmls: List[ExamHTML] = [
+        ExamHTML(html_ref=ref, questions=build_questions(pages_map.get(page_no, {})), page_index=p_idx)
+        for p_idx, ((page_no, _), ref) in enumerate(zip(page_htmls, page_refs), start=1)
+    ]
+
+    return ExamContent(
+        exam_content_id=content_id,
+        schedule_id=schedule_id,
+        outer_html_ref=outer_ref,
+        htmls=exam_htmls,
+        html_height=(1548.95 + 13 * 2) * len(exam_htmls),
+    )
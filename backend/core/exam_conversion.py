@@ -0,0 +1,111 @@
+"""
+시험지 PDF 변환(build_exam_html_and_index)을 이벤트 루프 밖의 프로세스 풀에서 실행합니다.
+
+PyMuPDF 추출과 pdf2htmlEX subprocess 는 수 초 ~ 수십 초 동안 블로킹되므로 API 핸들러에서 직접 부르면
+그동안 다른 요청을 처리하지 못합니다. 교시별 PDF 를 이 풀에 동시에 넣고 asyncio.gather 로 기다립니다.
+동시에 변환하는 PDF 수는 EXAM_CONVERT_WORKERS 로 제한합니다. (기본값: CPU 수, 최대 4)
+변환 결과는 PDF 해시로 conversion_cache 에 저장해 두고, 같은 PDF 가 다시 오면 변환 없이 돌려줍니다.
+시간 제한을 넘긴 작업은 terminate_conversion_pool() 로 워커와 pdf2htmlEX 자식 프로세스까지 함께 끝냅니다.
+"""
+import asyncio
+import multiprocessing as mp
+import os
+import signal
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Dict, List, Optional
+from dotenv import load_dotenv
+from backend.core.exam_question_extractor import build_exam_html_and_index
+from backend.core.conversion_cache import conversion_cache, conversion_cache_key, hash_pdf_file
+
+load_dotenv()
+EXAM_CONVERT_WORKERS: int = int(os.getenv("EXAM_CONVERT_WORKERS", str(min(os.cpu_count() or 1, 4))))
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def _init_worker() -> None:
+    # 워커와 그 pdf2htmlEX 자식 프로세스를 한 프로세스 그룹으로 묶어 terminate_conversion_pool 에서 함께 끝냅니다.
+    if hasattr(os, "setsid"):
+        os.setsid()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # uvicorn 프로세스의 이벤트 루프/스레드 상태를 물려받지 않도록 spawn 으로 만듭니다.
+        _pool = ProcessPoolExecutor(max_workers=EXAM_CONVERT_WORKERS, mp_context=mp.get_context("spawn"), initializer=_init_worker)
+    return _pool
+
+
+async def convert_exam_paper(pdf_path: str, pdf_sha256: Optional[str] = None) -> Dict[str, Any]:
+    """
+    build_exam_html_and_index 를 프로세스 풀에서 실행합니다. 반환 값은 {"html": str, "pages": {...}} 입니다.
+    pdf_sha256 을 이미 알고 있으면 넘겨서 해시 계산을 건너뜁니다.
+    """
+    if pdf_sha256 is None:
+        pdf_sha256 = await asyncio.to_thread(hash_pdf_file, pdf_path)
+    key = conversion_cache_key(pdf_sha256)
+    cached = await asyncio.to_thread(conversion_cache.get, key)
+    if cached is not None:
+        return cached
+
+    loop = asyncio.get_running_loop()
+    pool = _get_pool()
+    try:
+        result = await loop.run_in_executor(pool, build_exam_html_and_index, pdf_path)
+    except BrokenProcessPool:
+        # 다른 작업의 시간 초과로 풀이 강제 종료되었다면 새 풀에서 한 번 더 변환합니다.
+        if pool is _pool:
+            shutdown_conversion_pool()
+        result = await loop.run_in_executor(_get_pool(), build_exam_html_and_index, pdf_path)
+    try:
+        await asyncio.to_thread(conversion_cache.put, key, result)
+    except OSError as e:
+        # 캐시에 못 쓰더라도 변환 결과는 그대로 돌려줍니다.
+        print(f"exam conversion cache write failed: {e}")
+    return result
+
+
+async def convert_exam_papers(pdf_paths: List[str], pdf_sha256s: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    """
+    여러 교시의 PDF 를 동시에 변환합니다. 하나라도 실패하면 나머지가 끝난 뒤 첫 번째 예외를 다시 올립니다.
+    """
+    if pdf_sha256s is None:
+        pdf_sha256s = [None] * len(pdf_paths)
+    results = await asyncio.gather(
+        *(convert_exam_paper(p, h) for p, h in zip(pdf_paths, pdf_sha256s)),
+        return_exceptions=True,
+    )
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+    return results
+
+
+def shutdown_conversion_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def terminate_conversion_pool() -> None:
+    """
+    진행 중인 변환까지 강제로 끝냅니다. (시간 제한을 넘긴 작업용)
+    같은 풀에서 변환 중이던 다른 작업은 convert_exam_paper 가 새 풀에서 다시 시도합니다.
+    """
+    global _pool
+    pool, _pool = _pool, None
+    if pool is None:
+        return
+    processes = list((pool._processes or {}).values())
+    pool.shutdown(wait=False, cancel_futures=True)
+    for process in processes:
+        try:
+            if hasattr(os, "killpg"):
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
@@ -0,0 +1,269 @@
+"""
+비동기 시험 생성 작업.
+
+create_exams 는 업로드를 EXAM_JOB_SPOOL_DIR/<job_id>/ 에 옮기고 ExamCreationJob 을 만든 뒤 곧바로 202 를 돌려줍니다.
+사용자 upsert, 교시별 pdf2htmlEX 변환, Exam 저장은 run_exam_creation_job 이 하며 단계마다 작업 문서의
+stage/progress 를 갱신합니다. 관리자 화면은 이 문서를 폴링하거나 SSE 로 받아 봅니다.
+
+- EXAM_JOB_BACKEND=dramatiq (기본) : Redis 의 EXAM_JOB_QUEUE 큐에 메시지를 넣고, message_queue_server 의 워커가 처리합니다.
+  API 는 워커 코드를 import 하지 않고 actor 이름으로만 메시지를 보냅니다.
+- EXAM_JOB_BACKEND=inline : 워커 없이 API 프로세스의 백그라운드 태스크로 처리합니다. (개발용)
+EXAM_JOB_SPOOL_DIR 은 API 와 워커가 함께 볼 수 있는 경로여야 합니다.
+
+실행 중인 작업은 EXAM_JOB_HEARTBEAT_SECONDS 마다 updated_at 을 갱신합니다. 워커 프로세스가 죽어 이 갱신이
+EXAM_JOB_STALE_SECONDS 넘게 멈추거나, 작업이 EXAM_JOB_QUEUED_STALE_SECONDS 넘게 queued 로 남아 있으면
+상태 조회(expire_stale_job) 때 failed 로 바꿉니다.
+"""
+import asyncio
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from secrets import token_urlsafe
+from typing import List, Optional, Set, Tuple
+from uuid import uuid4
+from dotenv import load_dotenv
+from fastapi import HTTPException
+from backend.db import Exam, ExamContent, ExamCreationJob, Schedule, User
+from backend.db import exam_crud, exam_creation_job_crud, user_crud
+from backend.core.exam_contents import build_exam_content
+from backend.core.exam_conversion import convert_exam_paper
+from backend.core.utils import create_examinees_from_csv
+
+load_dotenv()
+EXAM_JOB_BACKEND: str = os.getenv("EXAM_JOB_BACKEND", "dramatiq")
+EXAM_JOB_QUEUE: str = os.getenv("EXAM_JOB_QUEUE", "exam_jobs")
+EXAM_JOB_SPOOL_DIR: str = os.getenv("EXAM_JOB_SPOOL_DIR", os.path.join(tempfile.gettempdir(), "exam_jobs"))
+EXAM_JOB_HEARTBEAT_SECONDS: float = float(os.getenv("EXAM_JOB_HEARTBEAT_SECONDS", "15"))
+EXAM_JOB_STALE_SECONDS: float = float(os.getenv("EXAM_JOB_STALE_SECONDS", "120"))
+EXAM_JOB_QUEUED_STALE_SECONDS: float = float(os.getenv("EXAM_JOB_QUEUED_STALE_SECONDS", str(60 * 60)))
+EXAM_JOB_ACTOR = "create_exam"
+TERMINAL_JOB_STATUSES = ("succeeded", "failed")
+
+_broker = None
+# inline 모드에서 태스크가 GC 되지 않도록 잡아 둡니다.
+_inline_tasks: Set[asyncio.Task] = set()
+
+
+def job_spool_dir(job_id: str) -> str:
+    path = os.path.join(EXAM_JOB_SPOOL_DIR, job_id)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def remove_job_spool_dir(job_id: str) -> None:
+    shutil.rmtree(os.path.join(EXAM_JOB_SPOOL_DIR, job_id), ignore_errors=True)
+
+
+def get_broker():
+    """backend/db/redis.py 와 같은 REDIS_* 설정으로 dramatiq Redis 브로커를 만듭니다."""
+    global _broker
+    if _broker is None:
+        from dramatiq.brokers.redis import RedisBroker
+        _broker = RedisBroker(
+            host=os.getenv("REDIS_HOST"),
+            port=int(os.getenv("REDIS_PORT", "6379")),
+            username=os.getenv("REDIS_USER_NAME"),
+            password=os.getenv("REDIS_PWD"),
+        )
+    return _broker
+
+
+async def enqueue_exam_creation(job_id: str) -> None:
+    if EXAM_JOB_BACKEND == "inline":
+        task = asyncio.create_task(run_exam_creation_job(job_id))
+        _inline_tasks.add(task)
+        task.add_done_callback(_inline_tasks.discard)
+        return
+    import dramatiq
+    message = dramatiq.Message(
+        queue_name=EXAM_JOB_QUEUE,
+        actor_name=EXAM_JOB_ACTOR,
+        args=(job_id,),
+        kwargs={},
+        options={},
+    )
+    # redis 클라이언트가 동기식이므로 스레드에서 보냅니다.
+    await asyncio.to_thread(get_broker().enqueue, message)
+
+
+def compute_period_times(start: datetime, period_count: int, duration_minutes: int, break_minutes: int) -> List[Tuple[datetime, datetime]]:
+    period_times: List[Tuple[datetime, datetime]] = []
+    cursor = start
+    for i in range(period_count):
+        p_start = cursor
+        p_end = p_start + timedelta(minutes=int(duration_minutes))
+        period_times.append((p_start, p_end))
+        cursor = p_end
+        if i < period_count - 1:
+            cursor = cursor + timedelta(minutes=int(break_minutes))
+    return period_times
+
+
+async def _update_job(job: ExamCreationJob, **fields) -> None:
+    for key, value in fields.items():
+        setattr(job, key, value)
+    job.updated_at = datetime.now()
+    await job.save()
+
+
+async def _heartbeat(job: ExamCreationJob) -> None:
+    """작업이 살아 있는 동안 updated_at 만 갱신합니다. (다른 필드를 덮어쓰지 않도록 $set 으로)"""
+    while True:
+        await asyncio.sleep(EXAM_JOB_HEARTBEAT_SECONDS)
+        await job.set({ExamCreationJob.updated_at: datetime.now()})
+
+
+def is_job_stale(job: ExamCreationJob, now: Optional[datetime] = None) -> bool:
+    if job.status in TERMINAL_JOB_STATUSES:
+        return False
+    limit = EXAM_JOB_QUEUED_STALE_SECONDS if job.status == "queued" else EXAM_JOB_STALE_SECONDS
+    return ((now or datetime.now()) - job.updated_at).total_seconds() > limit
+
+
+async def expire_stale_job(job: ExamCreationJob) -> ExamCreationJob:
+    """갱신이 멈춘 작업을 failed 로 바꿔 돌려줍니다. 상태 조회와 SSE 가 끝나지 않는 작업을 기다리지 않게 합니다."""
+    if is_job_stale(job):
+        error = "Exam creation job was not picked up by a worker" if job.status == "queued" else "Exam creation worker stopped responding"
+        await _update_job(job, status="failed", error=error, message=None)
+    return job
+
+
+async def mark_job_failed(job_id: str, error: str) -> None:
+    """워커가 작업을 끝내지 못했을 때(시간 제한 등) 아직 끝나지 않은 작업을 failed 로 남깁니다."""
+    job = await exam_creation_job_crud.get_by({"job_id": job_id})
+    if job is not None and job.status not in TERMINAL_JOB_STATUSES:
+        await _update_job(job, status="failed", error=error, message=None)
+
+
+async def _get_or_create_proctors(proctor_items: List[dict]) -> List[User]:
+    proctor_docs: List[User] = []
+    for p in proctor_items:
+        email = (p.get("email") or "").strip()
+        pname = (p.get("name") or "").strip()
+        if not email or not pname:
+            raise HTTPException(status_code=422, detail="Proctor name and email are required")
+        existing = await user_crud.get_by({"email": email, "role": "supervisor"})
+        if existing:
+            proctor_docs.append(existing)
+        else:
+            new_user = User(email=email, name=pname, role="supervisor", pwd=str(token_urlsafe(32)))
+            created = await user_crud.create(new_user)
+            proctor_docs.append(created)
+    return proctor_docs
+
+
+async def _get_or_create_examinees(csv_content: str) -> List[User]:
+    examinee_docs: List[User] = []
+    parsed = await create_examinees_from_csv(csv_content)
+    for u in parsed:
+        existing = await user_crud.get_by({"email": u.email, "role": "examinee"})
+        if existing:
+            examinee_docs.append(existing)
+        else:
+            created = await user_crud.create(u)
+            examinee_docs.append(created)
+    return examinee_docs
+
+
+async def run_exam_creation_job(job_id: str) -> Optional[str]:
+    """
+    작업 하나를 끝까지 처리하고 만들어진 Exam 의 id 를 돌려줍니다. 이미 끝난 작업이면 아무것도 하지 않습니다.
+    실패하면 작업을 failed 로 남기며 예외를 올리지 않습니다. (재시도하지 않습니다)
+    queued 가 아닌 작업은 워커가 처리 도중 재시작되어 다시 전달된 메시지이므로, 다시 처리하지 않고 failed 로 남깁니다.
+    """
+    job = await exam_creation_job_crud.get_by({"job_id": job_id})
+    if job is None:
+        print(f"exam creation job not found: {job_id}")
+        return None
+    if job.status in TERMINAL_JOB_STATUSES:
+        return job.exam_id
+    if job.status != "queued":
+        print(f"exam creation job {job_id} was redelivered while {job.status}; marking it failed")
+        await _update_job(job, status="failed", error="Exam creation worker restarted while the job was running", message=None)
+        remove_job_spool_dir(job_id)
+        return None
+
+    request = job.request
+    heartbeat: Optional[asyncio.Task] = None
+    try:
+        await _update_job(job, status="running", stage="users", progress=0.02, message="Creating proctors and examinees")
+        heartbeat = asyncio.create_task(_heartbeat(job))
+        proctor_docs = await _get_or_create_proctors(request.proctors)
+        csv_content = await asyncio.to_thread(_read_text, request.examinee_infos.path)
+        examinee_docs = await _get_or_create_examinees(csv_content)
+
+        # Process all PDFs in parallel: build HTML and index
+        paper_count = len(request.exam_papers)
+        converted = 0
+        await _update_job(job, stage="converting", progress=0.1, message=f"0/{paper_count} papers converted")
+
+        async def convert(paper) -> dict:
+            nonlocal converted
+            try:
+                result = await convert_exam_paper(paper.path, paper.sha256)
+            except Exception as e:
+                raise HTTPException(status_code=500, detail=f"Failed to process PDF index/html: {e}")
+            converted += 1
+            await _update_job(
+                job,
+                progress=0.1 + 0.75 * converted / paper_count,
+                message=f"{converted}/{paper_count} papers converted",
+            )
+            return result
+
+        results = await asyncio.gather(*(convert(paper) for paper in request.exam_papers))
+
+        await _update_job(job, stage="building", progress=0.87, message="Splitting pages")
+        period_times = compute_period_times(
+            request.exam_start_datetime, paper_count, request.exam_duration_time, request.break_time
+        )
+        contents: List[ExamContent] = []
+        schedules: List[Schedule] = []
+        for idx, (period_start, period_end) in enumerate(period_times):
+            result = results[idx]
+            content_id = str(uuid4())
+            schedule_id = str(uuid4())
+            contents.append(await build_exam_content(result.get("html") or "", result.get("pages") or {}, content_id, schedule_id))
+            schedules.append(
+                Schedule(
+                    schedule_id=schedule_id,
+                    schedule_index=idx + 1,
+                    start_datetime=period_start,
+                    end_datetime=period_end,
+                    content_id=content_id,
+                )
+            )
+
+        if not request.title or not proctor_docs or not contents or not schedules:
+            raise HTTPException(status_code=422, detail="Missing required exam fields")
+
+        await _update_job(job, stage="saving", progress=0.95, message="Saving exam")
+        exam = await exam_crud.create(Exam(
+            exam_title=request.title,
+            proctors=proctor_docs,
+            exam_start_datetime=request.exam_start_datetime,
+            # Use computed end time to ensure consistency
+            exam_end_datetime=period_times[-1][1],
+            schedules=schedules,
+            contents=contents,
+            expected_examinees=examinee_docs,
+            exam_duration_time=int(request.exam_duration_time),
+            break_time=int(request.break_time),
+        ))
+        await _update_job(job, status="succeeded", stage="done", progress=1.0, message="Exam created", exam_id=str(exam.id))
+        return str(exam.id)
+    except HTTPException as e:
+        await _update_job(job, status="failed", error=str(e.detail), message=None)
+    except Exception as e:
+        await _update_job(job, status="failed", error=str(e), message=None)
+    finally:
+        if heartbeat is not None:
+            heartbeat.cancel()
+        remove_job_spool_dir(job_id)
+    return None
+
+
+def _read_text(path: str) -> str:
+    with open(path, "r", encoding="utf-8", errors="ignore") as f:
+        return f.read()
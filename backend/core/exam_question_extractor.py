@@ -1,4 +1,5 @@
 
+import bisect
 import fitz  # pymupdf
 import re
 import os
@@ -6,8 +7,11 @@ import platform
 import shutil
 import subprocess
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple
+from backend.core.exam_assets import EXAM_SHARED_ASSETS, publish_shared_assets
+from backend.core.html_pages import stitch_html_chunks
 
 dpi : int = 300
 zoom = dpi / 72
@@ -18,6 +22,20 @@ mat = fitz.Matrix(zoom, zoom)
 # 1pt = 1/72 inch, CSS px 는 1in = 96px 이므로 1pt ~= 96/72 px
 CSS_PX_PER_PT = 96 / 72
 HTML_ZOOM = 1.3
+# pdf2htmlEX --embed: css/font/image/javascript/outline 을 모두 HTML 한 파일에 넣습니다.
+HTML_EMBED_INLINE = "cfijo"
+# 대문자는 넣지 않고 파일로 따로 씁니다. 따로 쓴 파일은 exam_assets 가 공유 저장소로 옮깁니다.
+HTML_EMBED_SHARED = "CFIJo"
+HTML_EMBED = HTML_EMBED_SHARED if EXAM_SHARED_ASSETS else HTML_EMBED_INLINE
+# 시험지 하나를 나눠 동시에 돌릴 pdf2htmlEX 프로세스 수 (1 이면 나누지 않음). 여러 시험지를 이미
+# EXAM_CONVERT_WORKERS 개씩 동시에 변환하므로 둘을 곱한 값이 코어 수를 크게 넘지 않게 잡습니다.
+# 조각마다 따로 쓰는 폰트/이미지 파일 이름이 겹치므로 css/font/image 를 모두 HTML 에 넣을 때(HTML_EMBED_INLINE)만
+# 나눕니다. EXAM_SHARED_ASSETS 를 켜면 나누지 않습니다.
+PDF2HTML_PAGE_CHUNKS: int = int(os.getenv("PDF2HTML_PAGE_CHUNKS", "1"))
+# 조각마다 pdf2htmlEX 시작 비용이 있으므로 이보다 짧게는 나누지 않습니다.
+PDF2HTML_MIN_CHUNK_PAGES: int = int(os.getenv("PDF2HTML_MIN_CHUNK_PAGES", "4"))
+if PDF2HTML_PAGE_CHUNKS > 1 and EXAM_SHARED_ASSETS:
+    print("PDF2HTML_PAGE_CHUNKS is ignored because EXAM_SHARED_ASSETS is enabled")
 # html_mat = fitz.Matrix(HTML_ZOOM * CSS_PX_PER_PT, HTML_ZOOM * CSS_PX_PER_PT)
 html_mat = fitz.Matrix(HTML_ZOOM, HTML_ZOOM )
 
@@ -39,6 +57,67 @@ def _rect_to_html_coords(rect: fitz.Rect) -> Tuple[float, float, float, float]:
     return x0, y0, x1, y1
 
 
+OPTION_SYMBOLS = ("①", "②", "③", "④", "⑤")
+QUESTION_PATTERN = re.compile(r"^(\d+)\.", re.MULTILINE)
+
+
+class _OptionGlyphIndex:
+    """
+    한 페이지의 선택지 기호(①~⑤) 글리프를 y0 순으로 정렬해 둔 공간 인덱스.
+
+    블록 사각형 안에 들어가는 글리프를 찾을 때 y0 범위를 이분 탐색으로 좁히고, 남은 후보만 x/y1 로 확인합니다.
+    후보는 텍스트 추출 순서(order)로 돌려주므로 page.search_for 결과를 순서대로 훑던 것과 같은 결과를 냅니다.
+    """
+
+    def __init__(self, glyphs: List[Tuple[float, float, float, float, str, int]]):
+        # (y0, x0, x1, y1, symbol, order)
+        self._glyphs = sorted(glyphs)
+        self._y0s = [g[0] for g in self._glyphs]
+
+    def __len__(self) -> int:
+        return len(self._glyphs)
+
+    def within(self, rect: Tuple[float, float, float, float], symbols: set) -> List[Tuple[float, float, float, float, str, int]]:
+        bx0, by0, bx1, by1 = rect
+        lo = bisect.bisect_left(self._y0s, by0)
+        hi = bisect.bisect_right(self._y0s, by1)
+        hits = [
+            g for g in self._glyphs[lo:hi]
+            if g[4] in symbols and g[1] >= bx0 and g[2] <= bx1 and g[3] <= by1
+        ]
+        hits.sort(key=lambda g: g[5])
+        return hits
+
+
+def _read_page_blocks(page: fitz.Page) -> Tuple[List[Tuple[Tuple[float, float, float, float], str]], _OptionGlyphIndex]:
+    """
+    페이지 글자를 rawdict 로 한 번만 읽어 (블록 사각형, 블록 텍스트) 목록과 선택지 글리프 인덱스를 만듭니다.
+    블록 텍스트는 get_text("blocks") 와 같은 규칙(줄마다 개행)으로 만듭니다.
+    """
+    textpage = page.get_textpage(flags=fitz.TEXTFLAGS_BLOCKS)
+    raw = page.get_text("rawdict", textpage=textpage)
+    blocks = []
+    glyphs = []
+    order = 0
+    for block in raw["blocks"]:
+        if block.get("type", 0) != 0:
+            continue
+        lines = []
+        for line in block["lines"]:
+            chars = []
+            for span in line["spans"]:
+                for char in span["chars"]:
+                    c = char["c"]
+                    chars.append(c)
+                    if c in OPTION_SYMBOLS:
+                        x0, y0, x1, y1 = char["bbox"]
+                        glyphs.append((y0, x0, x1, y1, c, order))
+                        order += 1
+            lines.append("".join(chars))
+        blocks.append((tuple(block["bbox"]), "\n".join(lines) + "\n"))
+    return blocks, _OptionGlyphIndex(glyphs)
+
+
 def extract_questions_options_positions_by_page(pdf_path: str) -> Dict[str, Dict[str, Dict[str, Dict[str, float]]]]:
     """
     Extracts question numbers and option markers (①~⑤) with their positions for each page.
@@ -56,107 +135,69 @@ def extract_questions_options_positions_by_page(pdf_path: str) -> Dict[str, Dict
     }
 
     Coordinates are scaled for pdf2htmlEX output assuming --zoom 1.3 and CSS px.
+
+    페이지마다 글자를 한 번만 읽어 선택지 글리프 인덱스를 만들고, 블록을 읽기 순서대로 한 번 훑으면서
+    블록 안의 선택지를 그 시점의 문항 번호에 배정합니다. (예전에는 블록 x 기호마다 page.search_for 로 페이지 전체를 다시 검색했습니다)
     """
     doc = fitz.open(pdf_path)
 
-    # Patterns
-    # question_pattern = re.compile(r"^(\d+)\.\s")
-    question_pattern = re.compile(r"^(\d+)\.", re.MULTILINE)
-
     pages: Dict[str, Dict[str, Dict[str, Dict[str, float]]]] = {}
 
     for page_index in range(doc.page_count):
         page = doc.load_page(page_index)
         page_key = str(page_index + 1)
-        pages[page_key] = {}
+        page_questions = pages[page_key] = {}
+        blocks, option_index = _read_page_blocks(page)
 
         # Track current question while scanning in reading order
         current_question: Optional[str] = None
 
-        # Read blocks (x0, y0, x1, y1, text, block_no, block_type)
-        blocks = page.get_text("blocks")
-        for block in blocks:
-            if len(block) < 7 or block[6] != 0:
-                continue
-
-            block_rect = fitz.Rect(block[0], block[1], block[2], block[3])
-            text = block[4] or ""
-
+        for block_rect, text in blocks:
             # Update current question if a new question number appears at the start of any line
             for raw_line in text.split("\n"):
                 line = raw_line.strip()
                 if not line:
                     continue
-                q_match = question_pattern.match(line)
+                q_match = QUESTION_PATTERN.match(line)
                 if q_match:
                     current_question = q_match.group(1)
-                    if current_question not in pages[page_key]:
-                        pages[page_key][current_question] = {}
+                    page_questions.setdefault(current_question, {})
 
-            # Find any option symbols present in the block text
-            # We search for actual glyphs ①~⑤ anywhere in the block
-            if not current_question:
-                # If we haven't seen a question yet, skip options to avoid mis-association
+            # If we haven't seen a question yet, skip options to avoid mis-association
+            if not current_question or not option_index:
                 continue
-
-            has_option_symbol = any(sym in text for sym in ("①", "②", "③", "④", "⑤"))
-            if not has_option_symbol:
+            symbols = {sym for sym in OPTION_SYMBOLS if sym in text}
+            if not symbols:
                 continue
 
-            # For each option symbol, locate its instances and keep the one inside the block
-            for symbol in ("①", "②", "③", "④", "⑤"):
-                if symbol not in text:
-                    continue
-                instances = page.search_for(symbol)
-                for inst in instances:
-                    # Keep only instances whose rect is within the block rect
-                    if (
-                            block_rect.x0 > inst.x0
-                            or inst.y0 < block_rect.y0
-                            or inst.x1 > block_rect.x1
-                            or inst.y1 > block_rect.y1
-                    ):
-                        continue
-
-                    x0, y0, x1, y1 = _rect_to_html_coords(inst)
-                    opt_index = _symbol_to_index(symbol)
-                    if opt_index is None:
-                        continue
-
-                    # Initialize question dict if not present (redundant safety)
-                    qdict = pages[page_key].setdefault(current_question, {})
-                    # Save the first good instance; if multiple, prefer the top-most (smallest y0)
-                    existing = qdict.get(str(opt_index))
-                    if existing is None or y0 < float(existing["y0"]):
-                        qdict[str(opt_index)] = {
-                            "x0": x0,
-                            "y0": y0,
-                            "x1": x1,
-                            "y1": y1,
-                        }
+            qdict = page_questions[current_question]
+            for gy0, gx0, gx1, gy1, symbol, _ in option_index.within(block_rect, symbols):
+                x0, y0, x1, y1 = _rect_to_html_coords(fitz.Rect(gx0, gy0, gx1, gy1))
+                opt_key = str(_symbol_to_index(symbol))
+                # Save the first good instance; if multiple, prefer the top-most (smallest y0)
+                existing = qdict.get(opt_key)
+                if existing is None or y0 < float(existing["y0"]):
+                    qdict[opt_key] = {
+                        "x0": x0,
+                        "y0": y0,
+                        "x1": x1,
+                        "y1": y1,
+                    }
     doc.close()
     return pages
 
-def convert_pdf_to_html_with_wsl(
+def _pdf2htmlex_command(
     pdf_path: str,
-    output_html_path: Optional[str] = None,
-    zoom: float = HTML_ZOOM,
-    embed: str = "cfijo",
-) -> str:
+    output_html_path: str,
+    zoom: float,
+    embed: str,
+    first_page: Optional[int] = None,
+    last_page: Optional[int] = None,
+) -> List[str]:
     """
-    Convert a PDF to a single self-contained HTML using pdf2htmlEX.
-
-    - Prefers WSL on Windows. On Linux/macOS, calls pdf2htmlEX directly.
-    - Embeds assets to produce a single HTML file.
-    - Returns the path to the generated HTML file.
+    pdf2htmlEX 실행 명령을 만듭니다. Windows 에서는 WSL 을 거치고, Linux/macOS 에서는 바로 실행합니다.
+    first_page/last_page 를 주면 그 범위(1부터, 양끝 포함)만 변환합니다.
     """
-    pdf_path = str(Path(pdf_path).resolve())
-    if output_html_path is None:
-        out_dir = tempfile.mkdtemp(prefix="pdf2html_")
-        output_html_path = str(Path(out_dir) / (Path(pdf_path).stem + ".html"))
-    else:
-        Path(output_html_path).parent.mkdir(parents=True, exist_ok=True)
-
     system = platform.system().lower()
     pdf2html = shutil.which("pdf2htmlEX.AppImage")
     use_wsl = False
@@ -169,6 +210,12 @@ def convert_pdf_to_html_with_wsl(
                 "pdf2htmlEX is not available on Windows without WSL. Install WSL and pdf2htmlEX."
             )
 
+    page_range: List[str] = []
+    if first_page is not None:
+        page_range += ["--first-page", str(first_page)]
+    if last_page is not None:
+        page_range += ["--last-page", str(last_page)]
+
     # Build command
     if use_wsl:
         # Convert Windows paths to WSL paths using wslpath
@@ -183,26 +230,108 @@ def convert_pdf_to_html_with_wsl(
 
         wsl_pdf = to_wsl(pdf_path)
         wsl_out = to_wsl(str(Path(output_html_path).resolve()))
-        cmd = [
+        return [
             "wsl",
             "pdf2htmlEX.AppImage",
             f"--zoom", str(zoom),
+            "--embed", embed,
+            *page_range,
             "--dest-dir", os.path.dirname(wsl_out) or ".",
             wsl_pdf,
             os.path.basename(wsl_out),
         ]
+    if pdf2html is None:
+        raise RuntimeError("pdf2htmlEX binary not found in PATH. Please install it.")
+    return [
+        pdf2html,
+        f"--zoom", str(zoom),
+        "--embed", embed,
+        *page_range,
+        "--dest-dir", str(Path(output_html_path).parent),
+        pdf_path,
+        str(Path(output_html_path).name),
+    ]
+
+
+def _page_chunks(page_count: int, chunks: int) -> List[Tuple[int, int]]:
+    """1..page_count 를 PDF2HTML_MIN_CHUNK_PAGES 이상씩, 최대 chunks 개의 연속 구간 (first, last) 으로 나눕니다."""
+    chunks = max(1, min(chunks, page_count // max(1, PDF2HTML_MIN_CHUNK_PAGES)))
+    size, extra = divmod(page_count, chunks)
+    ranges: List[Tuple[int, int]] = []
+    first = 1
+    for i in range(chunks):
+        last = first + size - 1 + (1 if i < extra else 0)
+        ranges.append((first, last))
+        first = last + 1
+    return ranges
+
+
+def _run_pdf2htmlex_chunks(pdf_path: str, output_html_path: str, zoom: float, embed: str, ranges: List[Tuple[int, int]]) -> None:
+    """
+    페이지 구간마다 pdf2htmlEX 를 따로 띄워 동시에 변환하고, 결과를 이어 붙여 output_html_path 에 씁니다.
+    조각은 output_html_path 옆의 임시 디렉터리에 쓰고 끝나면 지웁니다.
+    """
+    work_dir = tempfile.mkdtemp(prefix="pdf2html_chunks_", dir=str(Path(output_html_path).parent))
+    procs: List[Tuple[int, str, subprocess.Popen]] = []
+    try:
+        for index, (first, last) in enumerate(ranges):
+            chunk_path = str(Path(work_dir) / f"chunk{index}" / "chunk.html")
+            Path(chunk_path).parent.mkdir(parents=True, exist_ok=True)
+            cmd = _pdf2htmlex_command(pdf_path, chunk_path, zoom, embed, first, last)
+            procs.append((first, chunk_path, subprocess.Popen(cmd)))
+        for _, _, proc in procs:
+            if proc.wait() != 0:
+                raise subprocess.CalledProcessError(proc.returncode, proc.args)
+
+        chunks: List[Tuple[int, str]] = []
+        for first, chunk_path, _ in procs:
+            if not Path(chunk_path).exists():
+                raise RuntimeError("Failed to generate HTML with pdf2htmlEX.")
+            with open(chunk_path, "r", encoding="utf-8", errors="ignore") as f:
+                chunks.append((first, f.read()))
+        with open(output_html_path, "w", encoding="utf-8") as f:
+            f.write(stitch_html_chunks(chunks))
+    finally:
+        for _, _, proc in procs:
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+
+def convert_pdf_to_html_with_wsl(
+    pdf_path: str,
+    output_html_path: Optional[str] = None,
+    zoom: float = HTML_ZOOM,
+    embed: str = HTML_EMBED,
+    page_chunks: int = PDF2HTML_PAGE_CHUNKS,
+) -> str:
+    """
+    Convert a PDF to a single self-contained HTML using pdf2htmlEX.
+
+    - Prefers WSL on Windows. On Linux/macOS, calls pdf2htmlEX directly.
+    - Embeds assets to produce a single HTML file.
+    - page_chunks > 1 이면 페이지 범위를 최대 그 개수의 구간으로 나눠 pdf2htmlEX 를 동시에 여러 개 실행하고
+      한 문서로 이어 붙입니다. css/font/image 를 모두 HTML 에 넣는(embed 에 "c", "f", "i") 경우에만 나누며,
+      아니면 한 번에 변환합니다.
+    - Returns the path to the generated HTML file.
+    """
+    pdf_path = str(Path(pdf_path).resolve())
+    if output_html_path is None:
+        out_dir = tempfile.mkdtemp(prefix="pdf2html_")
+        output_html_path = str(Path(out_dir) / (Path(pdf_path).stem + ".html"))
     else:
-        if pdf2html is None:
-            raise RuntimeError("pdf2htmlEX binary not found in PATH. Please install it.")
-        cmd = [
-            pdf2html,
-            f"--zoom", str(zoom),
-            "--dest-dir", str(Path(output_html_path).parent),
-            pdf_path,
-            str(Path(output_html_path).name),
-        ]
+        Path(output_html_path).parent.mkdir(parents=True, exist_ok=True)
+
+    ranges: List[Tuple[int, int]] = []
+    if page_chunks > 1 and all(flag in embed for flag in "cfi"):
+        with fitz.open(pdf_path) as doc:
+            ranges = _page_chunks(doc.page_count, page_chunks)
 
-    subprocess.run(cmd, check=True)
+    if len(ranges) > 1:
+        _run_pdf2htmlex_chunks(pdf_path, output_html_path, zoom, embed, ranges)
+    else:
+        subprocess.run(_pdf2htmlex_command(pdf_path, output_html_path, zoom, embed), check=True)
     if not Path(output_html_path).exists():
         raise RuntimeError("Failed to generate HTML with pdf2htmlEX.")
     return str(Path(output_html_path).resolve())
@@ -216,18 +345,30 @@ def build_exam_html_and_index(
     """
     High-level helper to be used by create_exams.
 
-    - Extracts question/option positions per page, scaled for pdf2htmlEX rendering.
-    - Converts the PDF to HTML using pdf2htmlEX (via WSL on Windows).
+    - Converts the PDF to HTML using pdf2htmlEX (via WSL on Windows) in a background thread.
+    - Meanwhile extracts question/option positions per page, scaled for pdf2htmlEX rendering.
+    - With EXAM_SHARED_ASSETS, fonts/CSS/images/JS are written as separate files, moved to the shared
+      asset store under content-hash names, and the HTML is rewritten to reference them.
     - Returns a dict suitable for DB storage and frontend rendering:
       {"html": "<string or path>", "pages": {page: {question: {opt: {x0,y0,x1,y1}}}}}
     """
-    pages = extract_questions_options_positions_by_page(pdf_path)
-
-    html_path = convert_pdf_to_html_with_wsl(pdf_path, output_html_path)
+    # 변환은 대부분 pdf2htmlEX 하위 프로세스를 기다리는 시간이므로, 그동안 이 스레드에서 위치를 추출합니다.
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="pdf2html") as executor:
+        html_future = executor.submit(convert_pdf_to_html_with_wsl, pdf_path, output_html_path, embed=HTML_EMBED)
+        pages = extract_questions_options_positions_by_page(pdf_path)
+        html_path = html_future.result()
+
+    html_content: Optional[str] = None
+    if HTML_EMBED == HTML_EMBED_SHARED:
+        with open(html_path, "r", encoding="utf-8", errors="ignore") as f:
+            html_content = publish_shared_assets(f.read(), str(Path(html_path).parent))
+        with open(html_path, "w", encoding="utf-8") as f:
+            f.write(html_content)
 
     if return_html_string:
-        with open(html_path, "r", encoding="utf-8", errors="ignore") as f:
-            html_content = f.read()
+        if html_content is None:
+            with open(html_path, "r", encoding="utf-8", errors="ignore") as f:
+                html_content = f.read()
         # Keep the file for traceability if explicit output path provided, else clean up
         if output_html_path is None:
             try:
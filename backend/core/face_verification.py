@@ -0,0 +1,266 @@
+"""
+사전 점검(pre-check) 신원 확인용 얼굴 검출/임베딩/비교.
+
+- 얼굴 검출(YuNet)과 임베딩(SFace)은 OpenCV DNN 모델로 프로세스 풀에서 실행하므로 이벤트 루프를 막지 않습니다.
+  모델은 워커 프로세스마다 initializer 에서 한 번만 로드합니다.
+- 응시자의 기준 임베딩(FaceReference)은 user id 를 key 로 하는 LRU/TTL 캐시에 보관합니다.
+  기준 사진은 관리자가 시험 생성 화면에서 <email>.jpg 로 올립니다(POST /api/pre-checks/reference-faces).
+  FACE_ENROLL_ON_FIRST_VERIFY 를 켜면 기준 사진이 없는 응시자의 첫 사진을 확인 대기로 저장하고,
+  감독관이 승인(POST /api/pre-checks/reference-face/{user_id}/approve)해야 기준으로 씁니다.
+- 같은 시간대에 한 기수의 응시자가 한꺼번에 사전 점검을 하므로, 풀에 들어가는 작업 수를 세마포어로 제한해
+  이미지가 메모리에 무한정 쌓이지 않게 합니다.
+
+모델 파일 경로는 FACE_DETECTION_MODEL(face_detection_yunet_2023mar.onnx),
+FACE_RECOGNITION_MODEL(face_recognition_sface_2021dec.onnx) 환경 변수로 지정합니다.
+상대 경로는 실행 위치가 아니라 FACE_MODEL_DIR(기본 backend/face_models) 기준입니다.
+파일은 풀을 만들기 전에 check_model_files() 로 확인하며, 없으면 신원 확인 API 만 503 을 돌려주고 나머지 API 는 그대로 동작합니다.
+"""
+import asyncio
+import multiprocessing as mp
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Optional, Tuple
+import numpy as np
+from dotenv import load_dotenv
+from pydantic import BaseModel, Field
+from backend.db import FaceReference
+
+load_dotenv()
+FACE_MODEL_DIR: str = os.getenv("FACE_MODEL_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "face_models"))
+
+
+def _resolve_model_path(path: str) -> str:
+    return os.path.abspath(path if os.path.isabs(path) else os.path.join(FACE_MODEL_DIR, path))
+
+
+FACE_DETECTION_MODEL: str = _resolve_model_path(os.getenv("FACE_DETECTION_MODEL", "face_detection_yunet_2023mar.onnx"))
+FACE_RECOGNITION_MODEL: str = _resolve_model_path(os.getenv("FACE_RECOGNITION_MODEL", "face_recognition_sface_2021dec.onnx"))
+FACE_VERIFY_WORKERS: int = int(os.getenv("FACE_VERIFY_WORKERS", str(max((os.cpu_count() or 2) - 1, 1))))
+# SFace 코사인 유사도 기준값. OpenCV 문서의 권장값은 0.363 입니다.
+FACE_MATCH_THRESHOLD: float = float(os.getenv("FACE_MATCH_THRESHOLD", "0.363"))
+# 켜면 기준 사진이 없는 응시자의 첫 신원 확인 사진을 확인 대기(approved=False) 기준으로 저장합니다.
+# 통과로 치지 않고 pending_review 를 돌려주며, 감독관이 승인한 뒤에 다시 확인해야 통과합니다. (기본은 꺼짐: no_reference)
+FACE_ENROLL_ON_FIRST_VERIFY: bool = os.getenv("FACE_ENROLL_ON_FIRST_VERIFY", "0").lower() in ("1", "true", "yes")
+# 검출 전에 이미지의 긴 변을 이 크기로 줄입니다. 웹캠 사진의 얼굴은 충분히 크므로 정확도 손실이 거의 없습니다.
+MAX_IMAGE_SIDE: int = 640
+
+_detector = None
+_recognizer = None
+
+
+def check_model_files() -> None:
+    """얼굴 검출/인식 모델 파일이 없으면 RuntimeError. 워커 initializer 에서 실패하면 풀 전체가 깨지므로 풀을 만들기 전에 확인합니다."""
+    missing = [path for path in (FACE_DETECTION_MODEL, FACE_RECOGNITION_MODEL) if not os.path.isfile(path)]
+    if missing:
+        raise RuntimeError(f"Face model files not found: {', '.join(missing)} (set FACE_MODEL_DIR or FACE_*_MODEL)")
+
+
+def _init_worker(detection_model: str, recognition_model: str) -> None:
+    """워커 프로세스마다 한 번 실행되어 모델을 로드합니다."""
+    global _detector, _recognizer
+    import cv2
+
+    # 워커 하나가 코어 하나만 쓰도록 해 프로세스 수로 병렬성을 조절합니다.
+    cv2.setNumThreads(1)
+    _detector = cv2.FaceDetectorYN.create(detection_model, "", (320, 320), 0.8, 0.3, 5000)
+    _recognizer = cv2.FaceRecognizerSF.create(recognition_model, "")
+
+
+def _embed_image(image_bytes: bytes) -> dict:
+    """
+    워커 프로세스에서 실행됩니다. 이미지를 디코딩해 가장 큰 얼굴의 정규화된 임베딩을 반환합니다.
+    """
+    import cv2
+
+    image = cv2.imdecode(np.frombuffer(image_bytes, dtype=np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        return {"error": "invalid_image"}
+    height, width = image.shape[:2]
+    scale = MAX_IMAGE_SIDE / max(height, width)
+    if scale < 1:
+        image = cv2.resize(image, (int(width * scale), int(height * scale)), interpolation=cv2.INTER_AREA)
+        height, width = image.shape[:2]
+
+    _detector.setInputSize((width, height))
+    _, faces = _detector.detect(image)
+    if faces is None or len(faces) == 0:
+        return {"error": "no_face", "faces": 0}
+    # faces[i] = [x, y, w, h, 랜드마크 10개, score]
+    face = max(faces, key=lambda f: f[2] * f[3])
+    aligned = _recognizer.alignCrop(image, face)
+    feature = _recognizer.feature(aligned).astype(np.float32).ravel()
+    feature /= np.linalg.norm(feature) + 1e-12
+    return {"faces": len(faces), "embedding": feature, "score": float(face[-1])}
+
+
+class VerificationResult(BaseModel):
+    result: bool
+    similarity: Optional[float] = None
+    faces: int = 0
+    reason: Optional[str] = Field(default=None, description="실패 사유 (invalid_image, no_face, multiple_faces(기준 사진 등록 시), no_reference, pending_review, mismatch)")
+    enrolled: bool = Field(default=False, description="기준 사진이 없어 이번 사진을 확인 대기 기준으로 저장했는지 여부")
+
+
+class ReferenceCache:
+    """
+    user id -> 기준 임베딩 LRU/TTL 캐시. 이벤트 루프 한 곳에서만 사용하므로 락이 필요 없습니다.
+    """
+
+    def __init__(self, maxsize: int = 4096, ttl: float = 600.0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._items: "OrderedDict[str, tuple[float, np.ndarray]]" = OrderedDict()
+
+    def get(self, user_id: str) -> Optional[np.ndarray]:
+        item = self._items.get(user_id)
+        if item is None:
+            return None
+        expires_at, embedding = item
+        if expires_at < time.monotonic():
+            del self._items[user_id]
+            return None
+        self._items.move_to_end(user_id)
+        return embedding
+
+    def put(self, user_id: str, embedding: np.ndarray) -> None:
+        self._items[user_id] = (time.monotonic() + self.ttl, embedding)
+        self._items.move_to_end(user_id)
+        while len(self._items) > self.maxsize:
+            self._items.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        self._items.pop(user_id, None)
+
+
+class FaceVerifier:
+    """
+    얼굴 임베딩 프로세스 풀과 기준 임베딩 캐시를 묶은 객체. 풀은 처음 사용할 때 만듭니다.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = FACE_VERIFY_WORKERS,
+        threshold: float = FACE_MATCH_THRESHOLD,
+        enroll_on_first_verify: bool = FACE_ENROLL_ON_FIRST_VERIFY,
+        max_pending: Optional[int] = None,
+        cache: Optional[ReferenceCache] = None,
+    ):
+        self.max_workers = max_workers
+        self.threshold = threshold
+        self.enroll_on_first_verify = enroll_on_first_verify
+        # 워커당 4개까지만 풀에 넣고 나머지 요청은 await 상태로 기다립니다.
+        self.max_pending = max_pending or max_workers * 4
+        self.cache = cache or ReferenceCache()
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    def _ensure_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            check_model_files()
+            # uvicorn 의 이벤트 루프/스레드 상태를 물려받지 않도록 spawn 으로 워커를 만듭니다.
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=mp.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(FACE_DETECTION_MODEL, FACE_RECOGNITION_MODEL),
+            )
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        return self._pool
+
+    async def embed(self, image_bytes: bytes) -> dict:
+        pool = self._ensure_pool()
+        async with self._semaphore:
+            try:
+                return await asyncio.get_running_loop().run_in_executor(pool, _embed_image, image_bytes)
+            except BrokenProcessPool:
+                # 워커가 죽으면 풀은 다시 쓸 수 없으므로 버리고, 새 풀에서 한 번만 다시 시도합니다.
+                if self._pool is pool:
+                    self.shutdown()
+                return await asyncio.get_running_loop().run_in_executor(self._ensure_pool(), _embed_image, image_bytes)
+
+    async def reference_for(self, user_id: str) -> Optional[Tuple[np.ndarray, bool]]:
+        """(기준 임베딩, 승인 여부). 캐시에는 승인된 기준만 둡니다."""
+        embedding = self.cache.get(user_id)
+        if embedding is not None:
+            return embedding, True
+        reference = await FaceReference.find_one({"user_id": user_id})
+        if reference is None:
+            return None
+        embedding = np.asarray(reference.embedding, dtype=np.float32)
+        if reference.is_approved:
+            self.cache.put(user_id, embedding)
+        return embedding, reference.is_approved
+
+    async def approve(self, user_id: str) -> bool:
+        """확인 대기 중인 기준 사진을 승인합니다. 기준 사진이 없으면 False."""
+        reference = await FaceReference.find_one({"user_id": user_id})
+        if reference is None:
+            return False
+        reference.approved = True
+        reference.updated_at = datetime.now()
+        await reference.save()
+        self.cache.put(user_id, np.asarray(reference.embedding, dtype=np.float32))
+        return True
+
+    async def enroll(self, user_id: str, image_bytes: bytes) -> VerificationResult:
+        """기준 사진으로 FaceReference 를 만들거나 교체합니다."""
+        embedded = await self.embed(image_bytes)
+        if "error" in embedded:
+            return VerificationResult(result=False, faces=embedded.get("faces", 0), reason=embedded["error"])
+        if embedded["faces"] > 1:
+            return VerificationResult(result=False, faces=embedded["faces"], reason="multiple_faces")
+        await self._save_reference(user_id, embedded["embedding"], source="admin", approved=True)
+        return VerificationResult(result=True, faces=1)
+
+    async def _save_reference(self, user_id: str, embedding: np.ndarray, source: str, approved: bool) -> None:
+        reference = await FaceReference.find_one({"user_id": user_id})
+        if reference is None:
+            reference = FaceReference(user_id=user_id, embedding=embedding.tolist(),
+                                      model=os.path.basename(FACE_RECOGNITION_MODEL), source=source, approved=approved)
+            await reference.create()
+        else:
+            reference.embedding = embedding.tolist()
+            reference.model = os.path.basename(FACE_RECOGNITION_MODEL)
+            reference.source = source
+            reference.approved = approved
+            reference.updated_at = datetime.now()
+            await reference.save()
+        if approved:
+            self.cache.put(user_id, embedding)
+        else:
+            self.cache.invalidate(user_id)
+
+    async def verify(self, user_id: str, image_bytes: bytes) -> VerificationResult:
+        # 기준 임베딩 조회(DB)와 업로드 이미지 임베딩(프로세스 풀)을 동시에 진행합니다.
+        reference, embedded = await asyncio.gather(self.reference_for(user_id), self.embed(image_bytes))
+        if "error" in embedded:
+            return VerificationResult(result=False, faces=embedded.get("faces", 0), reason=embedded["error"])
+        # 사전 점검 사진에는 얼굴 옆에 든 신분증 사진도 얼굴로 잡히므로 얼굴 수로 거절하지 않고,
+        # _embed_image 가 고른 가장 큰 얼굴(응시자 본인)만 비교합니다.
+        if reference is None:
+            if not self.enroll_on_first_verify:
+                return VerificationResult(result=False, faces=embedded["faces"], reason="no_reference")
+            # 누구의 얼굴이든 기준이 될 수 있으므로 통과시키지 않고 감독관 승인을 기다립니다.
+            await self._save_reference(user_id, embedded["embedding"], source="first_verify", approved=False)
+            print(f"face reference saved for review on first verification: user_id={user_id}")
+            return VerificationResult(result=False, faces=embedded["faces"], reason="pending_review", enrolled=True)
+        embedding, approved = reference
+        similarity = float(np.dot(embedding, embedded["embedding"]))
+        if not approved:
+            return VerificationResult(result=False, similarity=similarity, faces=embedded["faces"], reason="pending_review")
+        matched = similarity >= self.threshold
+        return VerificationResult(result=matched, similarity=similarity, faces=embedded["faces"],
+                                  reason=None if matched else "mismatch")
+
+    def shutdown(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+face_verifier = FaceVerifier()
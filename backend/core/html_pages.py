@@ -0,0 +1,179 @@
+"""
+pdf2htmlEX 결과 HTML 을 페이지 단위로 나눕니다.
+
+pdf2htmlEX 는 대부분의 html 파일을 다음과 같은 형태로 생성 합니다.
+    이전 html 내용...
+    <div id="page-container">
+      <div id="pf1" class="pf w0 h0" data-page-no="1">pdf 내용...</div>
+      <div id="pf2" class="pf w0 h0" data-page-no="2">pdf 내용...</div>
+                          ...
+    </div>
+    <div class="loading-indicator"></div>
+    이후 html 내용...
+
+문서를 앞에서부터 한 번만 훑으면서 div 태그의 열림/닫힘으로 깊이를 세고, id="pf.." 페이지 div 와
+id="page-container" 의 위치(시작/끝 오프셋)만 기록합니다. 페이지 HTML 이나 외곽 HTML 이 실제로 필요할 때만
+원본 문자열에서 잘라내므로 분할 자체는 복사 없이 끝납니다.
+(예전에는 lazy DOTALL 정규식 + lookahead 로 페이지마다 문서 끝까지 되짚어 가며 찾았습니다)
+"""
+import re
+from dataclasses import dataclass, field
+from typing import Iterator, List, Optional, Tuple
+
+# 주석, script/style 본문 안의 "<div" 는 태그가 아니므로 통째로 건너뜁니다.
+_TOKEN_PATTERN = re.compile(
+    r"<!--.*?-->|<(script|style)\b[^>]*>.*?</\1\s*>|<(/?)div\b([^>]*)>",
+    re.IGNORECASE | re.DOTALL,
+)
+_ID_PATTERN = re.compile(r"(?<![-\w])id\s*=\s*[\"']([^\"']*)[\"']", re.IGNORECASE)
+_PAGE_NO_PATTERN = re.compile(r"\bdata-page-no\s*=\s*[\"']([^\"']*)[\"']", re.IGNORECASE)
+_PAGE_ID_PATTERN = re.compile(r"pf[0-9a-zA-Z]+")
+
+PAGE_CONTAINER_ID = "page-container"
+
+
+@dataclass(frozen=True)
+class PageFragment:
+    element_id: str  # "pf1", "pfa" ... (pdf2htmlEX 는 16진수를 씁니다)
+    page_no: str  # data-page-no (10진수). 없으면 1부터 센 순번
+    start: int
+    end: int
+
+
+@dataclass
+class SplitExamHtml:
+    source: str
+    pages: List[PageFragment] = field(default_factory=list)
+    # page-container 안쪽 내용의 (시작, 끝) 오프셋
+    container_span: Optional[Tuple[int, int]] = None
+
+    def page_html(self, page: PageFragment) -> str:
+        return self.source[page.start:page.end]
+
+    def iter_pages(self) -> Iterator[Tuple[PageFragment, str]]:
+        for page in self.pages:
+            yield page, self.page_html(page)
+
+    def outer_html(self) -> str:
+        """page-container 를 비워 둔 외곽 HTML. page-container 를 찾지 못하면 원본 그대로입니다."""
+        if self.container_span is None:
+            return self.source
+        start, end = self.container_span
+        return self.source[:start] + self.source[end:]
+
+
+def split_exam_html(html: str) -> SplitExamHtml:
+    """
+    html 을 한 번 훑어 페이지 div 와 page-container 의 위치를 찾습니다. 페이지 안에 중첩된 div 는 페이지의 일부로 봅니다.
+    """
+    result = SplitExamHtml(source=html)
+    # 열린 div 마다 (종류, 여는 태그 시작, 여는 태그 끝, id, page_no)
+    stack: List[Tuple[Optional[str], int, int, str, str]] = []
+    in_page = False
+    for match in _TOKEN_PATTERN.finditer(html):
+        closing, attrs = match.group(2), match.group(3)
+        if closing is None:
+            # 주석 또는 script/style
+            continue
+        if closing:
+            if not stack:
+                continue
+            kind, open_start, open_end, element_id, page_no = stack.pop()
+            if kind == "page":
+                in_page = False
+                result.pages.append(PageFragment(element_id, page_no, open_start, match.end()))
+            elif kind == "container":
+                result.container_span = (open_end, match.start())
+            continue
+
+        kind = None
+        element_id = ""
+        page_no = ""
+        if not in_page:
+            id_match = _ID_PATTERN.search(attrs)
+            element_id = id_match.group(1) if id_match else ""
+            if _PAGE_ID_PATTERN.fullmatch(element_id):
+                kind = "page"
+                in_page = True
+                no_match = _PAGE_NO_PATTERN.search(attrs)
+                page_no = no_match.group(1) if no_match else str(len(result.pages) + 1)
+            elif element_id == PAGE_CONTAINER_ID:
+                kind = "container"
+        stack.append((kind, match.start(), match.end(), element_id, page_no))
+    return result
+
+
+# pdf2htmlEX 가 문서마다 새로 번호를 매기는 클래스 (폰트, 글자 크기/색, 변환 행렬, 좌표, 크기 ...).
+# 같은 이름이라도 변환 실행마다 뜻이 다르므로 조각을 이어 붙일 때 조각별로 이름을 바꿔야 합니다.
+_GENERATED_CLASS = r"(?:ff|fs|fc|sc|ls|ws|m|x|y|h|w|v|_)[0-9a-f]+"
+_GENERATED_CLASS_PATTERN = re.compile(_GENERATED_CLASS)
+_CSS_CLASS_PATTERN = re.compile(r"\.(" + _GENERATED_CLASS + r")(?![\w-])")
+_CSS_FONT_FAMILY_PATTERN = re.compile(r"(font-family\s*:\s*)(ff[0-9a-f]+)(?![\w-])", re.IGNORECASE)
+_CLASS_ATTR_PATTERN = re.compile(r"(\bclass\s*=\s*)([\"'])([^\"']*)\2", re.IGNORECASE)
+_STYLE_BLOCK_PATTERN = re.compile(r"<style\b[^>]*>.*?</style\s*>", re.IGNORECASE | re.DOTALL)
+_HEAD_END_PATTERN = re.compile(r"</head\s*>", re.IGNORECASE)
+_OPEN_TAG_ID_PATTERN = re.compile(r"((?<![-\w])id\s*=\s*[\"'])[^\"']*([\"'])", re.IGNORECASE)
+_OPEN_TAG_PAGE_NO_PATTERN = re.compile(r"(\bdata-page-no\s*=\s*[\"'])[^\"']*([\"'])", re.IGNORECASE)
+
+
+def _rename_generated_css(css: str, suffix: str) -> str:
+    css = _CSS_CLASS_PATTERN.sub(lambda m: f".{m.group(1)}{suffix}", css)
+    return _CSS_FONT_FAMILY_PATTERN.sub(lambda m: f"{m.group(1)}{m.group(2)}{suffix}", css)
+
+
+def _rename_generated_classes(html: str, suffix: str) -> str:
+    def rename(m: "re.Match[str]") -> str:
+        names = [
+            f"{name}{suffix}" if _GENERATED_CLASS_PATTERN.fullmatch(name) else name
+            for name in m.group(3).split()
+        ]
+        return f"{m.group(1)}{m.group(2)}{' '.join(names)}{m.group(2)}"
+    return _CLASS_ATTR_PATTERN.sub(rename, html)
+
+
+def _renumber_page(page_html: str, page_no: int) -> str:
+    """페이지 div 여는 태그의 id/data-page-no 를 원본 PDF 의 페이지 번호로 맞춥니다."""
+    tag_end = page_html.find(">") + 1
+    open_tag = _OPEN_TAG_ID_PATTERN.sub(lambda m: f"{m.group(1)}pf{page_no:x}{m.group(2)}", page_html[:tag_end], count=1)
+    open_tag = _OPEN_TAG_PAGE_NO_PATTERN.sub(lambda m: f"{m.group(1)}{page_no}{m.group(2)}", open_tag, count=1)
+    return open_tag + page_html[tag_end:]
+
+
+def stitch_html_chunks(chunks: List[Tuple[int, str]]) -> str:
+    """
+    --first-page/--last-page 로 나눠 변환한 pdf2htmlEX 결과들을 한 문서로 합칩니다.
+    chunks 는 (조각의 첫 페이지 번호, html) 를 페이지 순서대로 담습니다.
+
+    첫 조각을 외곽 HTML 로 쓰고, page-container 에 모든 조각의 페이지를 차례로 넣습니다.
+    두 번째 조각부터는 <style> 블록과 페이지 안의 생성 클래스 이름 뒤에 "_c<순번>" 을 붙여 첫 조각의 CSS 와
+    겹치지 않게 하고, 그 <style> 블록을 </head> 앞에 덧붙입니다. 페이지 id/data-page-no 는 원본 PDF 의
+    페이지 번호(pf 는 16진수)로 다시 씁니다. CSS 가 HTML 에 들어 있는(--embed c) 결과만 합칠 수 있습니다.
+    """
+    if not chunks:
+        raise ValueError("no html chunks to stitch")
+    base_html = chunks[0][1]
+    base = split_exam_html(base_html)
+    head_end = _HEAD_END_PATTERN.search(base_html)
+    if base.container_span is None or head_end is None or head_end.start() > base.container_span[0]:
+        raise ValueError("pdf2htmlEX output has no <head> or page-container")
+
+    extra_styles: List[str] = []
+    pages: List[str] = []
+    for index, (first_page, html) in enumerate(chunks):
+        split = base if index == 0 else split_exam_html(html)
+        suffix = f"_c{index}"
+        if index > 0:
+            extra_styles.extend(_rename_generated_css(style, suffix) for style in _STYLE_BLOCK_PATTERN.findall(html))
+        for offset, (_, page_html) in enumerate(split.iter_pages()):
+            if index > 0:
+                page_html = _rename_generated_classes(page_html, suffix)
+            pages.append(_renumber_page(page_html, first_page + offset))
+
+    start, end = base.container_span
+    return "".join([
+        base_html[:head_end.start()],
+        "\n".join(extra_styles),
+        base_html[head_end.start():start],
+        "\n".join(pages),
+        base_html[end:],
+    ])
@@ -0,0 +1,94 @@
+"""
+업로드 파일(시험지 PDF, 응시자 CSV)을 정해진 크기의 청크로 읽어 디스크 임시 파일에 옮기면서 sha256 을 계산합니다.
+
+await upload.read() 로 파일 전체를 메모리에 올리지 않으므로 여러 관리자가 큰 스캔본을 동시에 올려도
+API 프로세스 메모리는 요청당 청크 하나만큼만 늘어납니다. 파일 하나와 요청 전체의 크기 제한을 넘으면 413 을 돌려줍니다.
+
+- EXAM_UPLOAD_MAX_PDF_BYTES     : 시험지 PDF 한 개의 최대 크기 (기본 100 MiB)
+- EXAM_UPLOAD_MAX_CSV_BYTES     : 응시자 CSV 의 최대 크기 (기본 5 MiB)
+- EXAM_UPLOAD_MAX_REQUEST_BYTES : 한 요청에 올리는 파일 전체의 최대 크기 (기본 500 MiB)
+"""
+import asyncio
+import hashlib
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
+from dotenv import load_dotenv
+from fastapi import HTTPException, UploadFile
+
+load_dotenv()
+EXAM_UPLOAD_MAX_PDF_BYTES: int = int(os.getenv("EXAM_UPLOAD_MAX_PDF_BYTES", str(100 * 1024 ** 2)))
+EXAM_UPLOAD_MAX_CSV_BYTES: int = int(os.getenv("EXAM_UPLOAD_MAX_CSV_BYTES", str(5 * 1024 ** 2)))
+EXAM_UPLOAD_MAX_REQUEST_BYTES: int = int(os.getenv("EXAM_UPLOAD_MAX_REQUEST_BYTES", str(500 * 1024 ** 2)))
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+@dataclass
+class SpooledUpload:
+    path: str
+    size: int
+    sha256: str
+    filename: Optional[str] = None
+
+    def read_text(self, encoding: str = "utf-8") -> str:
+        with open(self.path, "r", encoding=encoding, errors="ignore") as f:
+            return f.read()
+
+    def remove(self) -> None:
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+class UploadBudget:
+    """한 요청에서 지금까지 받은 업로드 바이트 수를 세고 요청 전체 제한을 넘으면 413 을 냅니다."""
+
+    def __init__(self, max_bytes: int = EXAM_UPLOAD_MAX_REQUEST_BYTES):
+        self.max_bytes = max_bytes
+        self.used = 0
+
+    def consume(self, size: int) -> None:
+        self.used += size
+        if self.used > self.max_bytes:
+            raise HTTPException(status_code=413, detail=f"Uploaded files exceed {self.max_bytes} bytes in total")
+
+
+async def spool_upload(
+    upload: UploadFile,
+    max_bytes: int,
+    budget: Optional[UploadBudget] = None,
+    suffix: str = "",
+    dir: Optional[str] = None,
+) -> SpooledUpload:
+    """
+    upload 를 UPLOAD_CHUNK_SIZE 씩 읽어 임시 파일(dir 을 주면 그 안)에 쓰고 그 경로와 크기, sha256 을 돌려줍니다.
+    제한을 넘으면 지금까지 쓴 임시 파일을 지우고 413 을 올립니다. 다 쓴 뒤에는 호출한 쪽이 remove() 해야 합니다.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    fd, path = tempfile.mkstemp(prefix="upload_", suffix=suffix, dir=dir)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            while True:
+                chunk = await upload.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                size += len(chunk)
+                if size > max_bytes:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"{upload.filename or 'upload'} exceeds {max_bytes} bytes",
+                    )
+                if budget is not None:
+                    budget.consume(len(chunk))
+                digest.update(chunk)
+                await asyncio.to_thread(f.write, chunk)
+    except BaseException:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        raise
+    return SpooledUpload(path=path, size=size, sha256=digest.hexdigest(), filename=upload.filename)
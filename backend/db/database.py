@@ -9,7 +9,7 @@ from pymongo import AsyncMongoClient
 from beanie import init_beanie
 from typing import TypeVar
 from backend.db import User, Examinee, Verifications, Logs, ExamSession
-from backend.db import Exam, LoginRequest, EventLog
+from backend.db import Exam, LoginRequest, EventLog, FaceReference, ExamCreationJob
 load_dotenv()
 
 uri = os.getenv("MONGO_DB_URL")
@@ -19,19 +19,33 @@ client = AsyncMongoClient(uri)
 T = TypeVar("T")
 
 
+async def init_database(mongo_client: AsyncMongoClient = client):
+    """
+    Beanie 를 초기화합니다. API 의 lifespan 과 message_queue_server 의 워커가 함께 사용합니다.
+    """
+    await init_beanie(
+        database=mongo_client.get_database(db_name),  # 사용할 데이터베이스
+        document_models=[
+            ExamSession, LoginRequest, User, Examinee, Verifications,
+            Logs, EventLog, Exam, FaceReference, ExamCreationJob
+        ]  # 맵핑할 Document 클래스 목록
+    )
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 애플리케이션 시작 시 실행될 코드
     print("애플리케이션 시작...")
 
+    # 얼굴 인식 모델 파일이 없어도 서버는 띄웁니다. (신원 확인 API 만 503)
+    from backend.core.face_verification import check_model_files
+    try:
+        check_model_files()
+    except RuntimeError as e:
+        print(f"신원 확인을 사용할 수 없습니다: {e}")
+
     # init_beanie를 사용하여 데이터베이스 연결 및 초기화
-    await init_beanie(
-        database=client.get_database(db_name),  # 사용할 데이터베이스
-        document_models=[
-            ExamSession, LoginRequest, User, Examinee, Verifications,
-            Logs, EventLog, Exam
-        ]  # 맵핑할 Document 클래스 목록
-    )
+    await init_database()
 
     print("Beanie 초기화 완료.")
 
@@ -39,6 +53,11 @@ async def lifespan(app: FastAPI):
 
     # 애플리케이션 종료 시 실행될 코드
     print("애플리케이션 종료...")
+    # 시험지 변환 프로세스 풀 정리 (backend.core 가 backend.db 를 import 하므로 여기서 불러옵니다)
+    from backend.core.exam_conversion import shutdown_conversion_pool
+    from backend.core.face_verification import face_verifier
+    shutdown_conversion_pool()
+    face_verifier.shutdown()
     await client.close()
 
 async def add_admin_by_manual():
@@ -47,7 +66,7 @@ async def add_admin_by_manual():
         database=client.get_database(db_name),  # 사용할 데이터베이스
         document_models=[
             ExamSession, LoginRequest, User, Examinee, Verifications,
-            Logs, EventLog, Exam
+            Logs, EventLog, Exam, FaceReference, ExamCreationJob
         ]  # 맵핑할 Document 클래스 목록
     )
     user = User(email="44ii@gmail.com", name="관리자", role="admin", pwd="pwd_" + token_urlsafe(28))
@@ -61,7 +80,7 @@ async def find_product():
         database=client.get_database(db_name),  # 사용할 데이터베이스
         document_models=[
             ExamSession, LoginRequest, User, Examinee, Verifications,
-            Logs, EventLog, Exam
+            Logs, EventLog, Exam, FaceReference, ExamCreationJob
         ]  # 맵핑할 Document 클래스 목록
     )
 
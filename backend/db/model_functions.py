@@ -115,4 +115,6 @@ verifications_crud = MongoCRUD(models.Verifications)
 logs_crud = MongoCRUD(models.Logs)
 event_log_crud = MongoCRUD(models.EventLog)
 exam_answers_crud = MongoCRUD(models.AllExamAnswers)
-exam_crud = MongoCRUD(models.Exam)
\ No newline at end of file
+exam_crud = MongoCRUD(models.Exam)
+face_reference_crud = MongoCRUD(models.FaceReference)
+exam_creation_job_crud = MongoCRUD(models.ExamCreationJob)
\ No newline at end of file
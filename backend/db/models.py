@@ -79,6 +79,77 @@ class Verifications(Document):
         ]
 
 
+class FaceReference(Document):
+    """
+    신원 확인에 사용할 응시자의 기준 얼굴 임베딩.
+    """
+    user_id: str = Field(description="응시자의 User id", min_length=3)
+    embedding: list[float] = Field(description="정규화된 얼굴 임베딩 벡터")
+    model: str = Field(description="임베딩을 만든 얼굴 인식 모델 파일 이름")
+    source: str = Field(default="admin", description="기준 사진 출처 (admin: 관리자 등록, first_verify: 첫 신원 확인 사진)")
+    approved: Optional[bool] = Field(default=None, description="감독관/관리자가 확인했는지 여부. 없으면 관리자 등록만 확인된 것으로 봅니다.")
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+    @property
+    def is_approved(self) -> bool:
+        return self.approved if self.approved is not None else self.source != "first_verify"
+
+    class Settings:
+        name = "face_references"
+        validate_on_save = True
+        indexes : list = [
+            "user_id"
+        ]
+
+
+class ExamCreationFile(BaseModel):
+    """
+    시험 생성 작업을 위해 공유 디렉터리(EXAM_JOB_SPOOL_DIR)에 옮겨 둔 업로드 파일.
+    """
+    path: str
+    size: int
+    sha256: str
+    filename: Optional[str] = None
+
+
+class ExamCreationRequest(BaseModel):
+    """
+    create_exams 가 검증을 마친 입력 값. 워커는 이 값만으로 시험을 만듭니다.
+    """
+    title: str
+    exam_start_datetime: datetime
+    exam_end_datetime: datetime
+    proctors: list[dict] = Field(description="감독관 {name, email} 목록")
+    examinee_infos: ExamCreationFile = Field(description="응시자 CSV")
+    exam_papers: list[ExamCreationFile] = Field(description="교시별 시험지 PDF", min_length=1)
+    exam_duration_time: int
+    break_time: int
+
+
+class ExamCreationJob(Document):
+    """
+    비동기 시험 생성 작업. create_exams 가 만들고 message_queue_server 의 워커가 진행 상황을 갱신합니다.
+    """
+    job_id: str = Field(description="작업 고유 ID")
+    status: Literal['queued', 'running', 'succeeded', 'failed'] = 'queued'
+    stage: str = Field(default="queued", description="현재 단계 (queued, users, converting, building, saving, done)")
+    progress: float = Field(default=0.0, ge=0, le=1, description="0 ~ 1 사이의 진행률")
+    message: Optional[str] = None
+    exam_id: Optional[str] = Field(default=None, description="성공하면 만들어진 Exam 의 id")
+    error: Optional[str] = None
+    request: ExamCreationRequest
+    created_at: datetime = Field(default_factory=datetime.now)
+    updated_at: datetime = Field(default_factory=datetime.now)
+
+    class Settings:
+        name = "exam_creation_jobs"
+        validate_on_save = True
+        indexes : list = [
+            "job_id"
+        ]
+
+
 class LogContent(BaseModel):
     content: str
     user_ids: list[str]
@@ -163,7 +234,8 @@ class ExamQuestion(BaseModel):
     selection: list[ExamQuestionSelection] = Field(description="pdf 를 html 로 바꾼 뒤, 그 위에 버튼을 정해진 위치에 맵핑합니다. ")
 
 class ExamHTML(BaseModel):
-    html: str = Field(description="id='page-container' 내부에 있는 id='pf[0-9]+' 값을 가진 div 태그입니다.")
+    html: str = Field(default="", description="id='page-container' 내부에 있는 id='pf[0-9]+' 값을 가진 div 태그입니다. html_ref 가 있으면 비어 있습니다.")
+    html_ref: Optional[str] = Field(default=None, description="blob_store 에 저장된 페이지 HTML 의 sha256. 페이지 조회 API 로 받아 갑니다.")
     questions: list[ExamQuestion]
     page_index: int = Field(gt=0)
 
@@ -173,7 +245,8 @@ class ExamContent(BaseModel):
     """
     exam_content_id: str
     schedule_id: str
-    outer_html: str = Field(description="id='page-container' 를 가진 div 태그 그 자체와 id='page-container' 바깥에 있는 모든 html 태그를 의미 합니다.")
+    outer_html: str = Field(default="", description="id='page-container' 를 가진 div 태그 그 자체와 id='page-container' 바깥에 있는 모든 html 태그를 의미 합니다. outer_html_ref 가 있으면 비어 있습니다.")
+    outer_html_ref: Optional[str] = Field(default=None, description="blob_store 에 저장된 outer_html 의 sha256")
     htmls: list[ExamHTML] = Field(description="id='pf[0-9a-zA-Z]+' 를 가진 모든 div 태그를 의미 합니다.")
     html_width: float = Field(description="기본 가로 길이인 1095.25", default=1095.25)
     html_height: float = Field(description="기본 세로 높이인 1548.95 * 시험 페이지 수")
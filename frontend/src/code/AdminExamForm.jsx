@@ -2,6 +2,21 @@ import React, { useState, useEffect } from 'react';
 import { useParams, useNavigate } from 'react-router-dom';
 import axios from 'axios';
 import "../css/AdminExamForm.css"
+
+const JOB_POLL_INTERVAL_MS = 2000;
+
+// create_exams 는 202 와 작업 상태를 돌려주므로, 작업이 끝날 때까지 상태를 폴링합니다.
+const waitForCreationJob = async (jobId, onProgress) => {
+    for (;;) {
+        const res = await axios.get(`/exams/admin/create_jobs/${jobId}`, { withCredentials: true });
+        const job = res.data;
+        onProgress(job);
+        if (job.status === 'succeeded') return job;
+        if (job.status === 'failed') throw new Error(job.error || 'Exam creation failed.');
+        await new Promise(resolve => setTimeout(resolve, JOB_POLL_INTERVAL_MS));
+    }
+};
+
 const AdminExamForm = () => {
     const { examId } = useParams();
     const navigate = useNavigate();
@@ -11,9 +26,11 @@ const AdminExamForm = () => {
     const [examInfo, setExamInfo] = useState({ name: '', startTime: '', endTime: '', duration: '', breakTime: '' });
     const [proctors, setProctors] = useState([{ id: 1, name: '', email: '' }]);
     const [examineesFile, setExamineesFile] = useState(null);
+    const [referenceFaces, setReferenceFaces] = useState([]);
     const [examPeriods, setExamPeriods] = useState([{ id: 1, startTime: '', endTime: '', file: null, existingFile: null }]);
     const [error, setError] = useState('');
     const [isLoading, setIsLoading] = useState(false);
+    const [jobProgress, setJobProgress] = useState(null);
 
     useEffect(() => {
         if (isEditMode) {
@@ -64,6 +81,7 @@ const AdminExamForm = () => {
     const addProctor = () => setProctors([...proctors, { id: Date.now(), name: '', email: '' }]);
     const removeProctor = (index) => setProctors(proctors.filter((_, i) => i !== index));
     const handleExamineesFileChange = (e) => setExamineesFile(e.target.files[0]);
+    const handleReferenceFacesChange = (e) => setReferenceFaces(Array.from(e.target.files));
     const handlePeriodChange = (index, e) => {
         const updated = [...examPeriods];
         updated[index][e.target.name] = e.target.value;
@@ -102,15 +120,30 @@ const AdminExamForm = () => {
             const url = isEditMode ? `/exams/admin/update_exam/${examId}` : '/exams/admin/create_exams';
             const method = isEditMode ? 'put' : 'post';
             
-            await axios[method](url, formData, config);
-            
-            alert(`Exam successfully ${isEditMode ? 'updated' : 'created'}!`);
+            const res = await axios[method](url, formData, config);
+            if (!isEditMode) {
+                await waitForCreationJob(res.data.job_id, setJobProgress);
+            }
+
+            // 응시자가 만들어진 뒤에 기준 얼굴 사진을 등록합니다. (파일 이름 = 응시자 email)
+            let faceMessage = '';
+            if (referenceFaces.length) {
+                const faceForm = new FormData();
+                referenceFaces.forEach(file => faceForm.append('images', file));
+                const faceRes = await axios.post('/pre-checks/reference-faces', faceForm, config);
+                const failed = faceRes.data.results.filter(r => !r.result).map(r => `${r.filename} (${r.reason})`);
+                faceMessage = `\nReference faces: ${faceRes.data.enrolled}/${referenceFaces.length} registered.`
+                    + (failed.length ? `\nFailed: ${failed.join(', ')}` : '');
+            }
+
+            alert(`Exam successfully ${isEditMode ? 'updated' : 'created'}!${faceMessage}`);
             navigate('/admin/dashboard');
         } catch (err) {
             console.error('Failed to save exam:', err);
-            setError(err.response?.data?.message || 'An error occurred while saving the exam.');
+            setError(err.response?.data?.message || err.message || 'An error occurred while saving the exam.');
         } finally {
             setIsLoading(false);
+            setJobProgress(null);
         }
     };
 
@@ -165,6 +198,11 @@ const AdminExamForm = () => {
                         <input type="file" accept=".csv" onChange={handleExamineesFileChange} required={!isEditMode} />
                         {isEditMode && <small>Upload a new file only to replace the existing one.</small>}
                     </div>
+                    <div className="form-group">
+                        <label>Reference Face Photos (optional)</label>
+                        <input type="file" accept="image/*" multiple onChange={handleReferenceFacesChange} />
+                        <small>Name each photo after the examinee's email, e.g. kim@example.com.jpg. Examinees without a photo are enrolled from their first identity check.</small>
+                    </div>
                 </fieldset>
 
                 <fieldset>
@@ -184,7 +222,7 @@ const AdminExamForm = () => {
 
                 <div className="form-actions">
                     <button type="button" className="btn btn-secondary" onClick={() => navigate('/admin/dashboard')}>Cancel</button>
-                    <button type="submit" className="btn btn-primary" disabled={isLoading}>{isLoading ? 'Saving...' : 'Save Exam'}</button>
+                    <button type="submit" className="btn btn-primary" disabled={isLoading}>{isLoading ? (jobProgress ? `Saving... ${Math.round(jobProgress.progress * 100)}%` : 'Saving...') : 'Save Exam'}</button>
                 </div>
             </form>
         </div>
@@ -4,6 +4,7 @@ import axios from 'axios';
 import useExamStore, {useExamAnswerStore} from './store/examStore.js';
 import '../css/ExamPage.css';
 import websocketManager, { SERVER_URLS } from './WebsocketUtils';
+import { fetchOuterHtml, mountLazyPages } from './examPaperLoader.js';
 
 
 
@@ -116,6 +117,7 @@ const AnswerIndexSpace = () => {
 
 // Render real exam paper using Shadow DOM and clickable overlays
 const ExamPaper = () => {
+    const { examId } = useParams();
     const getExamContentForCurrent = useExamStore(state => state.getExamContentForCurrent);
     const exam_meta = useExamStore(state => state.exam_meta);
     const answerStore = useExamAnswerStore();
@@ -123,6 +125,7 @@ const ExamPaper = () => {
     const wrapperRef = useRef(null);
     const hostRef = useRef(null);
     const shadowRef = useRef(null);
+    const recomputeOverlaysRef = useRef(() => {});
     const [content, setContent] = useState(null);
     const [overlays, setOverlays] = useState([]);
 
@@ -137,22 +140,37 @@ const ExamPaper = () => {
         }
     }, [getExamContentForCurrent, exam_meta]);
 
-    // Inject outer_html and pages into Shadow DOM
+    // Inject outer_html into Shadow DOM, then load pages lazily as they scroll into view
     useEffect(() => {
         if (!content || !hostRef.current) return;
         if (!shadowRef.current) {
             shadowRef.current = hostRef.current.attachShadow({ mode: 'open' });
         }
         const shadow = shadowRef.current;
-        shadow.innerHTML = content.outer_html || '';
-        const pageContainer = shadow.getElementById('page-container');
-        if (pageContainer) {
-            pageContainer.style.overflow = 'visible';
-            const totalPages = (content.htmls || []).length || 1;
-            pageContainer.style.height = `${Math.ceil(1548.3 * totalPages)}px`;
-            pageContainer.innerHTML = (content.htmls || []).map(h => h.html).join('');
-        }
-    }, [content]);
+        let cancelled = false;
+        let unmountPages = null;
+        (async () => {
+            try {
+                const outerHtml = await fetchOuterHtml(examId, content);
+                if (cancelled) return;
+                shadow.innerHTML = outerHtml;
+                const pageContainer = shadow.getElementById('page-container');
+                if (pageContainer) {
+                    pageContainer.style.overflow = 'visible';
+                    const totalPages = (content.htmls || []).length || 1;
+                    pageContainer.style.height = `${Math.ceil(1548.3 * totalPages)}px`;
+                    unmountPages = mountLazyPages(pageContainer, examId, content, () => recomputeOverlaysRef.current());
+                }
+                recomputeOverlaysRef.current();
+            } catch (e) {
+                console.error('Failed to load exam paper:', e);
+            }
+        })();
+        return () => {
+            cancelled = true;
+            if (unmountPages) unmountPages();
+        };
+    }, [content, examId]);
 
     const recomputeOverlays = useCallback(() => {
         if (!content || !shadowRef.current || !wrapperRef.current) return;
@@ -192,6 +210,7 @@ const ExamPaper = () => {
     }, [content]);
 
     useEffect(() => { recomputeOverlays(); }, [recomputeOverlays]);
+    useEffect(() => { recomputeOverlaysRef.current = recomputeOverlays; }, [recomputeOverlays]);
     useEffect(() => {
         const onResize = () => recomputeOverlays();
         const onScroll = () => recomputeOverlays();
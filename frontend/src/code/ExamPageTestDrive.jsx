@@ -6,16 +6,19 @@
 
 import React, { useCallback, useEffect, useMemo, useRef, useState } from 'react';
 import axios from 'axios';
+import { fetchOuterHtml, mountLazyPages } from './examPaperLoader.js';
 
 /**
  * 데이터 모델 참고(요약)
  * ExamSession.contents[0] => {
- *   outer_html: string, // id="page-container" 포함한 외곽 HTML
+ *   outer_html: string, // id="page-container" 포함한 외곽 HTML (outer_html_ref 가 있으면 비어 있음)
+ *   outer_html_ref: string, // /exams/{exam_id}/contents/{exam_content_id}/outer 로 받아 옴
  *   html_width : float, // 기본 가로 길이인 1095.25
  *   html_height: float, // 기본 세로 높이인 1548.95 * 시험 페이지 수
  *   htmls: [{
  *     page_index: number, // 1-based
- *     html: string,       // id='pf{page_index}' 페이지 div HTML
+ *     html: string,       // id='pf{page_index}' 페이지 div HTML (html_ref 가 있으면 비어 있음)
+ *     html_ref: string,   // /exams/{exam_id}/contents/{exam_content_id}/pages/{page_index} 로 받아 옴
  *     questions: [{
  *       question_id: string,
  *       question_index: number,
@@ -37,6 +40,8 @@ function ExamPageTestDrive() {
   const shadowRef = useRef(null);  // shadowRoot 보관
   const [session, setSession] = useState(null); // ExamSession 전체 응답
   const content = useMemo(() => (session?.contents?.[0] ?? null), [session]);
+  const examId = session?.id ?? session?._id ?? null;
+  const recomputeOverlaysRef = useRef(() => {});
 
   // 질문별 선택 상태 저장: { [question_id]: selection_index } (단일 선택 기준)
   const [answers, setAnswers] = useState({});
@@ -55,18 +60,33 @@ function ExamPageTestDrive() {
     }
     const shadow = shadowRef.current;
 
-    // 2) outer_html 주입
-    //    안전을 위해 기존 내용 정리 후 최신 내용으로 교체
-    shadow.innerHTML = content.outer_html || '';
+    let cancelled = false;
+    let unmountPages = null;
+    (async () => {
+      try {
+        // 2) outer_html 주입
+        //    안전을 위해 기존 내용 정리 후 최신 내용으로 교체
+        const outerHtml = await fetchOuterHtml(examId, content);
+        if (cancelled) return;
+        shadow.innerHTML = outerHtml;
 
-    // 3) page-container 안에 각 페이지 HTML 삽입
-    const pageContainer = shadow.getElementById('page-container');
-    if (pageContainer) {
-      pageContainer.style.overflow = "visible";
-      pageContainer.style.height = `${Math.ceil(1548.300000 * content.htmls.length) }px`;
-      pageContainer.innerHTML = (content.htmls || []).map(h => h.html).join('');
-    }
-  }, [content]);
+        // 3) page-container 안에 페이지 자리를 만들고, 화면에 가까워진 페이지부터 받아서 삽입
+        const pageContainer = shadow.getElementById('page-container');
+        if (pageContainer) {
+          pageContainer.style.overflow = "visible";
+          pageContainer.style.height = `${Math.ceil(1548.300000 * content.htmls.length) }px`;
+          unmountPages = mountLazyPages(pageContainer, examId, content, () => recomputeOverlaysRef.current());
+        }
+        recomputeOverlaysRef.current();
+      } catch (e) {
+        console.error('Failed to load exam paper:', e);
+      }
+    })();
+    return () => {
+      cancelled = true;
+      if (unmountPages) unmountPages();
+    };
+  }, [content, examId]);
   const diff = 1.333321996963399;
   // 오버레이 포지션 정보
   const [overlays, setOverlays] = useState([]);
@@ -116,6 +136,7 @@ function ExamPageTestDrive() {
   // 사이즈/스크롤 변화에 따른 오버레이 재계산
   useEffect(() => {
     recomputeOverlays();
+    recomputeOverlaysRef.current = recomputeOverlays;
   }, [recomputeOverlays]);
 
   useEffect(() => {
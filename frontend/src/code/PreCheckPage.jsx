@@ -137,6 +137,12 @@ const PreCheckPage = () => {
                     }
                 } catch (err) {
                     console.error('Identity verification failed:', err);
+                    // 기준 사진이 감독관 확인 대기 중이면 실패 횟수에 넣지 않습니다.
+                    if (err.response?.data?.detail?.reason === 'pending_review') {
+                        setError('Your photo is waiting for a proctor to confirm it. Please try again after it is approved.');
+                        setIdentityStatus('retrying');
+                        return;
+                    }
                     const newAttempts = verificationAttempts + 1;
                     setVerificationAttempts(newAttempts);
 
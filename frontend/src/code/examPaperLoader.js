@@ -0,0 +1,69 @@
+import axios from 'axios';
+
+// 페이지를 받기 전 자리를 잡아 두는 높이 (pdf2htmlEX --zoom 1.3 기준 한 페이지)
+const PAGE_PLACEHOLDER_HEIGHT = 1548.3;
+// 화면에 들어오기 한 페이지쯤 전에 미리 받아 둡니다.
+const PREFETCH_MARGIN = `${PAGE_PLACEHOLDER_HEIGHT}px 0px`;
+
+const contentPath = (examId, content) => `/exams/${examId}/contents/${content.exam_content_id}`;
+
+/**
+ * ExamContent 의 외곽 HTML 을 가져옵니다.
+ * outer_html_ref 가 있으면 API 에서 받아 오고, 예전 문서처럼 outer_html 이 들어 있으면 그대로 씁니다.
+ */
+export async function fetchOuterHtml(examId, content) {
+  if (!content.outer_html_ref) return content.outer_html || '';
+  const res = await axios.get(`${contentPath(examId, content)}/outer`, { responseType: 'text' });
+  return res.data;
+}
+
+/**
+ * page-container 안에 페이지 자리(id="pf{page_index}")를 만들고, 화면에 가까워진 페이지만 받아 와 바꿔 끼웁니다.
+ * html 이 문서에 들어 있는 예전 페이지는 바로 넣습니다. 반환 값은 관찰을 멈추는 정리 함수입니다.
+ *
+ * @param {HTMLElement} pageContainer shadow root 안의 #page-container
+ * @param {string} examId
+ * @param {object} content ExamContent
+ * @param {(page: object) => void} [onPageLoaded] 페이지를 넣은 뒤 호출 (오버레이 재계산용)
+ */
+export function mountLazyPages(pageContainer, examId, content, onPageLoaded) {
+  const pages = content.htmls || [];
+  pageContainer.innerHTML = pages.map(h => (
+    h.html_ref
+      ? `<div id="pf${h.page_index}" class="pf" data-lazy-page="${h.page_index}" style="height:${PAGE_PLACEHOLDER_HEIGHT}px"></div>`
+      : h.html
+  )).join('');
+
+  const byIndex = new Map(pages.map(h => [String(h.page_index), h]));
+  let disposed = false;
+
+  const load = async (placeholder) => {
+    const page = byIndex.get(placeholder.dataset.lazyPage);
+    if (!page) return;
+    try {
+      const res = await axios.get(`${contentPath(examId, content)}/pages/${page.page_index}`, { responseType: 'text' });
+      if (disposed || !placeholder.isConnected) return;
+      placeholder.outerHTML = res.data;
+      if (onPageLoaded) onPageLoaded(page);
+    } catch (e) {
+      console.error(`Failed to load exam page ${page.page_index}:`, e);
+      // 다시 화면에 들어오면 재시도합니다.
+      if (!disposed) observer.observe(placeholder);
+    }
+  };
+
+  const observer = new IntersectionObserver((entries) => {
+    for (const entry of entries) {
+      if (!entry.isIntersecting) continue;
+      observer.unobserve(entry.target);
+      load(entry.target);
+    }
+  }, { rootMargin: PREFETCH_MARGIN });
+
+  pageContainer.querySelectorAll('[data-lazy-page]').forEach(el => observer.observe(el));
+
+  return () => {
+    disposed = true;
+    observer.disconnect();
+  };
+}
@@ -1,5 +1,63 @@
 """
-# 요청 :
-dramatiq 와 redis 를 사용하는 메시지 큐 서버를 구현해주세요.
+dramatiq 와 redis 를 사용하는 메시지 큐 워커.
 
-"""
\ No newline at end of file
+backend 의 create_exams 가 EXAM_JOB_QUEUE 큐에 넣은 시험 생성 작업(actor: create_exam)을 처리합니다.
+작업 내용은 backend/core/exam_jobs.py 의 run_exam_creation_job 이며, 여기서는 워커 프로세스마다
+이벤트 루프 하나와 Beanie 초기화를 한 번만 해 두고 각 메시지를 그 루프에서 실행합니다.
+
+실행 (저장소 루트에서):
+    dramatiq message_queue_server.actors --processes 2 --threads 2
+EXAM_JOB_SPOOL_DIR, MONGO_DB_*, REDIS_* 는 backend 와 같은 값을 써야 합니다.
+"""
+import asyncio
+import os
+import sys
+import threading
+
+path: str = __file__
+path = path.replace("\\", "/")
+path = "/".join(path.split("/")[:-2])
+sys.path.append(path)
+
+import dramatiq
+from dramatiq.middleware.time_limit import TimeLimitExceeded
+from backend.db import init_database
+from backend.core.exam_conversion import terminate_conversion_pool
+from backend.core.exam_jobs import EXAM_JOB_ACTOR, EXAM_JOB_QUEUE, get_broker, mark_job_failed, run_exam_creation_job
+
+# 변환은 프로세스 풀에서 돌지만 PDF 가 크면 수 분이 걸리므로 넉넉하게 둡니다.
+EXAM_JOB_TIME_LIMIT_MS: int = int(os.getenv("EXAM_JOB_TIME_LIMIT_MS", str(60 * 60 * 1000)))
+
+dramatiq.set_broker(get_broker())
+
+_loop = asyncio.new_event_loop()
+threading.Thread(target=_loop.run_forever, name="exam-jobs-loop", daemon=True).start()
+_database_ready = asyncio.run_coroutine_threadsafe(init_database(), _loop)
+
+
+@dramatiq.actor(
+    actor_name=EXAM_JOB_ACTOR,
+    queue_name=EXAM_JOB_QUEUE,
+    max_retries=0,
+    time_limit=EXAM_JOB_TIME_LIMIT_MS,
+)
+def create_exam(job_id: str):
+    """
+    시험 생성 작업 하나를 처리합니다. 진행 상황과 실패는 ExamCreationJob 문서에 남으므로 재시도하지 않습니다.
+    """
+    _database_ready.result()
+    future = asyncio.run_coroutine_threadsafe(run_exam_creation_job(job_id), _loop)
+    try:
+        future.result()
+    except BaseException as e:
+        # 시간 제한(TimeLimitExceeded)은 기다리는 이 스레드에만 걸리고 루프의 코루틴은 계속 돌므로,
+        # 코루틴을 취소하고 작업을 failed 로 남긴 뒤 예외를 다시 올립니다.
+        future.cancel()
+        error = "Exam creation timed out" if isinstance(e, TimeLimitExceeded) else f"Exam creation worker error: {e!r}"
+        try:
+            asyncio.run_coroutine_threadsafe(mark_job_failed(job_id, error), _loop).result(timeout=30)
+        except Exception as mark_error:
+            print(f"failed to mark exam creation job {job_id} as failed: {mark_error}")
+        # 코루틴을 취소해도 변환 프로세스 풀의 작업과 pdf2htmlEX 는 계속 돌므로 풀째 끝냅니다.
+        terminate_conversion_pool()
+        raise